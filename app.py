@@ -1,14 +1,35 @@
+import importlib
+import os
+from typing import Callable, Optional
+
 import streamlit as st
 from dotenv import load_dotenv
 
+from utils.helpers.anonymization import start_model_warmup
 from utils.helpers.logger import logger
 from utils.helpers.settings import load_settings_from_cookies, settings_sidebar
+from utils.helpers.telemetry import get_telemetry_manager
 from utils.session import configure_page, initialize_session_state
-from utils.stages.analyze import analyze_stage
-from utils.stages.anonymize import anonymize_stage
-from utils.stages.edit_anonymized import edit_anonymized_stage
-from utils.stages.rechnung_anonymize import rechnung_anonymize_stage
-from utils.stages.result import result_stage
+
+# Stages are imported on first use, a page load only imports the stage it renders
+STAGES = {
+    "analyze": ("utils.stages.analyze", "analyze_stage"),
+    "anonymize": ("utils.stages.anonymize", "anonymize_stage"),
+    "edit_anonymized": ("utils.stages.edit_anonymized", "edit_anonymized_stage"),
+    "result": ("utils.stages.result", "result_stage"),
+    "rechnung_anonymize": (
+        "utils.stages.rechnung_anonymize",
+        "rechnung_anonymize_stage",
+    ),
+}
+
+
+def get_stage_function(stage: str) -> Optional[Callable[[], None]]:
+    """Import the module of a stage and return its stage function."""
+    if stage not in STAGES:
+        return None
+    module_name, function_name = STAGES[stage]
+    return getattr(importlib.import_module(module_name), function_name)
 
 
 def init_app():
@@ -20,6 +41,13 @@ def init_app():
         configure_page()
         st.session_state.initialized = True
 
+    # Local anonymization needs the NER model, load it before the first request
+    if os.getenv("DEPLOYMENT_ENV", "local") in ("local", "development"):
+        start_model_warmup()
+
+    # Metrics export is set up in the background, once per process
+    get_telemetry_manager()
+
 
 def main() -> None:
     """Main function to control the app stages"""
@@ -28,16 +56,8 @@ def main() -> None:
     st.image("data/logo.png")
     settings_sidebar()
 
-    stage_functions = {
-        "analyze": analyze_stage,
-        "anonymize": anonymize_stage,
-        "edit_anonymized": edit_anonymized_stage,
-        "result": result_stage,
-        "rechnung_anonymize": rechnung_anonymize_stage,
-    }
-
     current_stage = st.session_state.stage
-    if stage_function := stage_functions.get(current_stage):
+    if stage_function := get_stage_function(current_stage):
         stage_function()
     else:
         logger.warning(f"Unknown stage: {current_stage}")
@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "../data/ner_benchmark_corpus.txt"
+)
+
+
+def read_corpus(path):
+    """Read the documents of a corpus file, separated by blank lines."""
+    with open(path, encoding="utf-8") as f:
+        return [
+            document.strip() for document in f.read().split("\n\n") if document.strip()
+        ]
+
+
+def run_backend(corpus, repeat):
+    """Load the model of NER_BACKEND and tag the corpus, print the results as JSON."""
+    import psutil
+
+    from utils.helpers.anonymization import get_model, split_sentences, tag_sentences
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    get_model()
+    load_seconds = time.perf_counter() - start
+    rss_model = process.memory_info().rss - rss_before
+
+    documents = read_corpus(corpus)
+    spans = [split_sentences(document) for document in documents]
+    sentences = [
+        [document[start:end] for start, end in document_spans]
+        for document, document_spans in zip(documents, spans)
+    ]
+
+    # The first pass warms up the model
+    tag_sentences(sentences[0])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        tagged = [tag_sentences(document_sentences) for document_sentences in sentences]
+    seconds = (time.perf_counter() - start) / repeat
+
+    entities = [
+        [index, offset + entity["start"], offset + entity["end"], entity["entity_type"]]
+        for index, (document_spans, document_tagged) in enumerate(zip(spans, tagged))
+        for (offset, _), sentence_entities in zip(document_spans, document_tagged)
+        for entity in sentence_entities
+    ]
+    print(
+        json.dumps(
+            {
+                "load_seconds": load_seconds,
+                "rss_model_mb": rss_model / 2**20,
+                "rss_peak_mb": process.memory_info().rss / 2**20,
+                "seconds": seconds,
+                "chars": sum(len(document) for document in documents),
+                "entities": entities,
+            }
+        )
+    )
+
+
+def agreement(reference, candidate):
+    """Entity-level precision, recall and F1 of candidate against reference."""
+    reference = {tuple(entity) for entity in reference}
+    candidate = {tuple(entity) for entity in candidate}
+    matched = len(reference & candidate)
+    precision = matched / len(candidate) if candidate else 1.0
+    recall = matched / len(reference) if reference else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare latency, memory and entity agreement of the NER backends against fp32."
+    )
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--backends", nargs="+", default=["fp32", "int8"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_backend(args.corpus, args.repeat)
+        return
+
+    print(
+        f"{'backend':<8}{'load s':>8}{'model MB':>10}{'peak MB':>9}{'ms/1k chars':>13}"
+        f"{'entities':>10}{'precision':>11}{'recall':>8}{'F1':>7}"
+    )
+    reference = None
+    for backend in args.backends:
+        # Every backend runs in a fresh process so that memory is measured in isolation
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"]
+            + ["--corpus", args.corpus, "--repeat", str(args.repeat)],
+            env=dict(os.environ, NER_BACKEND=backend, NER_SERVICE_ENABLED="false"),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            print(f"{backend:<8}  failed:\n{result.stderr[-2000:]}")
+            continue
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        if reference is None:
+            reference = stats["entities"]
+        precision, recall, f1 = agreement(reference, stats["entities"])
+        print(
+            f"{backend:<8}{stats['load_seconds']:>8.1f}{stats['rss_model_mb']:>10.0f}"
+            f"{stats['rss_peak_mb']:>9.0f}{1000 * stats['seconds'] / stats['chars'] * 1000:>13.1f}"
+            f"{len(stats['entities']):>10}{precision:>11.1%}{recall:>8.1%}{f1:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.helpers import anonymization  # noqa: E402
+from utils.helpers.ner_service import NerInferenceService  # noqa: E402
+
+SENTENCES = [
+    "Patient Hans Müller wurde am 12.03.2024 in der Klinik Berlin aufgenommen.",
+    "Die Operation erfolgte durch Dr. med. Schneider in Vollnarkose.",
+    "Frau Weber aus Hamburg wurde über Risiken und Alternativen aufgeklärt.",
+    "Postoperativ komplikationsloser Verlauf, Entlassung nach Hause.",
+    "Nachkontrolle bei Dr. Fischer in München in zwei Wochen.",
+]
+
+
+def run(sessions, sentences_per_session, tag):
+    """Tag the sentences of concurrent sessions, return the elapsed seconds."""
+    rng = random.Random(0)
+    documents = [
+        [rng.choice(SENTENCES) for _ in range(sentences_per_session)]
+        for _ in range(sessions)
+    ]
+    threads = [threading.Thread(target=tag, args=(document,)) for document in documents]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare NER throughput of concurrent sessions with and without the batching service."
+    )
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--sentences", type=int, default=10, help="Per session.")
+    parser.add_argument("--window-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    # Load the model once so that no configuration pays for it
+    anonymization.tag_sentences(SENTENCES)
+    service = NerInferenceService(anonymization.tag_sentences, window_ms=args.window_ms)
+
+    print(
+        f"{'sessions':>8}{'direct s/s':>12}{'service s/s':>13}{'batch size':>12}{'p95 ms':>9}"
+    )
+    for sessions in args.sessions:
+        total = sessions * args.sentences
+        direct = run(sessions, args.sentences, anonymization.tag_sentences)
+        before = service.get_stats()
+        batched = run(sessions, args.sentences, service.tag)
+        stats = service.get_stats()
+        batches = stats["batches"] - before["batches"]
+        print(
+            f"{sessions:>8}{total / direct:>12.1f}{total / batched:>13.1f}"
+            f"{(stats['sentences'] - before['sentences']) / batches:>12.1f}"
+            f"{stats.get('latency_p95_ms', 0.0):>9.0f}"
+        )
+    service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmark_ner_backends import DEFAULT_CORPUS, read_corpus  # noqa: E402
+
+from utils.helpers.anonymization import (  # noqa: E402
+    NER_MODEL_TIERS,
+    PRESIDIO_EQUIVALENCES,
+)
+
+DEFAULT_GOLD = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "../data/ner_benchmark_gold.json"
+)
+
+RECALL_TYPES = ("PERSON", "LOCATION")
+
+
+def recall(documents, gold, entities, entity_type):
+    """Share of the gold entities of a type found with exactly the same text."""
+    found = {
+        (index, documents[index][start:end])
+        for index, start, end, label in entities
+        if PRESIDIO_EQUIVALENCES.get(label) == entity_type
+    }
+    expected = [
+        (index, text)
+        for index, document_gold in enumerate(gold)
+        for text in document_gold.get(entity_type, [])
+    ]
+    if not expected:
+        return 1.0
+    return sum(1 for item in expected if item in found) / len(expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Profile the NER model tiers: latency, memory and recall on PERSON/LOCATION."
+    )
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--gold", default=DEFAULT_GOLD)
+    parser.add_argument("--tiers", nargs="+", default=list(NER_MODEL_TIERS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the profiles as JSON to this file.")
+    args = parser.parse_args()
+
+    documents = read_corpus(args.corpus)
+    with open(args.gold, encoding="utf-8") as f:
+        gold = json.load(f)
+
+    print(
+        f"{'tier':<10}{'model':<26}{'backend':<9}{'ms/1k chars':>13}{'peak MB':>9}"
+        + "".join(f"{f'{entity_type} recall':>17}" for entity_type in RECALL_TYPES)
+    )
+    profiles = {}
+    for tier in args.tiers:
+        # Every tier runs in a fresh process so that memory is measured in isolation
+        result = subprocess.run(
+            [
+                sys.executable,
+                os.path.join(os.path.dirname(__file__), "benchmark_ner_backends.py"),
+                "--child",
+            ]
+            + ["--corpus", args.corpus, "--repeat", str(args.repeat)],
+            env=dict(
+                os.environ,
+                NER_MODEL_TIER=tier,
+                NER_BACKEND="",
+                NER_SERVICE_ENABLED="false",
+            ),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            print(f"{tier:<10}  failed:\n{result.stderr[-2000:]}")
+            continue
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        profile = {
+            "ms_per_1k_chars": 1000 * stats["seconds"] / stats["chars"] * 1000,
+            "peak_rss_mb": stats["rss_peak_mb"],
+        }
+        for entity_type in RECALL_TYPES:
+            profile[f"{entity_type.lower()}_recall"] = recall(
+                documents, gold, stats["entities"], entity_type
+            )
+        profiles[tier] = profile
+
+        config = NER_MODEL_TIERS[tier]
+        print(
+            f"{tier:<10}{config['model']:<26}{config['backend']:<9}"
+            f"{profile['ms_per_1k_chars']:>13.1f}{profile['peak_rss_mb']:>9.0f}"
+            + "".join(
+                f"{profile[f'{entity_type.lower()}_recall']:>17.1%}"
+                for entity_type in RECALL_TYPES
+            )
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
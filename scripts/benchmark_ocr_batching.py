@@ -0,0 +1,134 @@
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.helpers import ocr, ocr_batch  # noqa: E402
+from utils.helpers.ocr_engine import get_ocr_engine_pool  # noqa: E402
+
+VOCABULARY = (
+    "Patient Patientin Geburtsdatum Anschrift Straße Hausnummer Postleitzahl "
+    "Versicherung Versichertennummer Diagnose Befund Therapie Narkose Aufnahme "
+    "Entlassung Station Klinik Chefarzt Oberarzt Rechnung Betrag Datum Müller "
+    "Schmidt Schneider Fischer Weber Meyer Wagner Becker Schulz Hoffmann Berlin "
+    "München Hamburg Köln 12.03.1961 01.07.2024 80331 10115 Nr. Str. Dr. med."
+).split()
+
+
+def generate_page(boxes, rng, size=(1654, 2339), font_size=28, scan=False):
+    """Draw a page at 200 DPI with one line of text per selection box."""
+    page = Image.new("RGB", size, (210, 210, 210) if scan else "white")
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(size=font_size)
+    selections = []
+    row_height = (size[1] - 200) // boxes
+    for i in range(boxes):
+        top = 100 + i * row_height
+        left = rng.randint(80, 400)
+        text = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(2, 6)))
+        draw.text((left, top + 10), text, fill="black", font=font)
+        right = min(size[0] - 20, left + int(draw.textlength(text, font=font)) + 40)
+        selections.append(
+            {
+                "left": (left - 20) / size[0],
+                "top": top / size[1],
+                "width": (right - left + 20) / size[0],
+                "height": (font_size + 30) / size[1],
+            }
+        )
+    if scan:
+        # Grey background, sensor noise and a slightly skewed feed like a fax
+        page = page.rotate(1.5, fillcolor=(210, 210, 210))
+        noise = np.random.default_rng(rng.randrange(2**32)).normal(
+            0, 18, (*size[::-1], 1)
+        )
+        pixels = np.clip(np.asarray(page, dtype=np.float32) + noise, 0, 255)
+        page = Image.fromarray(pixels.astype(np.uint8))
+    return page, selections
+
+
+def run(crops_per_call, mode, preprocess=False):
+    """Recognize the crop groups with the given batch mode, return texts and seconds."""
+    ocr.OCR_BATCH_MODE = mode
+    ocr_batch.OCR_PREPROCESS = preprocess
+    start = time.perf_counter()
+    texts = [
+        ocr_batch.words_to_text(words)
+        for crops in crops_per_call
+        for words in ocr.ocr_crops(crops)
+    ]
+    return texts, time.perf_counter() - start
+
+
+def similarity(a, b):
+    return difflib.SequenceMatcher(
+        None, " ".join(a.split()), " ".join(b.split())
+    ).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare per-box OCR calls against page and document batched OCR, "
+        "optionally with crop preprocessing."
+    )
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--boxes", type=int, default=8, help="Selections per page.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--scan", action="store_true", help="Simulate noisy, skewed scans."
+    )
+    parser.add_argument(
+        "--preprocess",
+        action="store_true",
+        help="Also run every mode with crop preprocessing.",
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = [generate_page(args.boxes, rng, scan=args.scan) for _ in range(args.pages)]
+    crops_per_page = [
+        [ocr.crop_selection(page, selection) for selection in selections]
+        for page, selections in pages
+    ]
+    all_crops = [crop for crops in crops_per_page for crop in crops]
+
+    # Load the engine once so that neither mode pays for it
+    pool = get_ocr_engine_pool()
+    pool.image_to_data(all_crops[0])
+
+    print(
+        f"{args.pages} pages x {args.boxes} boxes, backend {pool.backend}\n"
+        f"{'mode':<14}{'calls':>8}{'total s':>10}{'ms/box':>10}{'speedup':>10}{'agreement':>11}"
+    )
+    reference, baseline = None, None
+    runs = [
+        ("off", crops_per_page),
+        ("page", crops_per_page),
+        ("document", [all_crops]),
+    ]
+    for mode, groups in runs + (
+        [(f"{mode}+pre", groups) for mode, groups in runs] if args.preprocess else []
+    ):
+        calls_before = pool.get_stats()["calls"]
+        texts, seconds = run(
+            groups, mode.removesuffix("+pre"), preprocess=mode.endswith("+pre")
+        )
+        calls = pool.get_stats()["calls"] - calls_before
+        if reference is None:
+            reference, baseline = texts, seconds
+        agreement = sum(map(similarity, reference, texts)) / len(texts)
+        print(
+            f"{mode:<14}{calls:>8}{seconds:>10.2f}{1000 * seconds / len(all_crops):>10.1f}"
+            f"{baseline / seconds:>9.1f}x{agreement:>10.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
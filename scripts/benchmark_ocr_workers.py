@@ -0,0 +1,88 @@
+import argparse
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmark_ocr_batching import generate_page  # noqa: E402
+
+
+def run_configuration(pages, boxes, seed):
+    """Extract a synthetic scanned PDF with the OCR settings of the environment."""
+    from utils.helpers.ocr import clear_region_cache, extract_pdf_regions
+    from utils.helpers.pdf_render import clear_render_cache
+
+    rng = random.Random(seed)
+    images, selections = zip(*(generate_page(boxes, rng) for _ in range(pages)))
+    buffer = io.BytesIO()
+    images[0].save(
+        buffer, "PDF", save_all=True, append_images=list(images[1:]), resolution=200
+    )
+    file_content = buffer.getvalue()
+
+    # Warm-up loads the engines and starts the worker processes
+    extract_pdf_regions(file_content, list(range(pages)), list(selections))
+    clear_region_cache()
+    clear_render_cache()
+
+    start = time.perf_counter()
+    extract_pdf_regions(file_content, list(range(pages)), list(selections))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure OCR pages/second for thread and process workers by worker count."
+    )
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--boxes", type=int, default=6, help="Selections per page.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--modes", nargs="+", default=["thread", "process"])
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        seconds = run_configuration(args.pages, args.boxes, args.seed)
+        print(json.dumps({"seconds": seconds}))
+        return
+
+    from utils.helpers.ocr_scheduler import OCR_THREADS_PER_ENGINE, available_cpus
+
+    cpus = available_cpus()
+    workers = args.workers or sorted({1, 2, 4, cpus, 2 * cpus})
+    print(
+        f"{args.pages} pages x {args.boxes} boxes, {cpus} CPUs available, "
+        f"{OCR_THREADS_PER_ENGINE} threads per engine\n"
+        f"{'mode':<10}{'workers':>8}{'seconds':>10}{'pages/s':>10}"
+    )
+    for mode in args.modes:
+        for count in workers:
+            env = dict(
+                os.environ,
+                OCR_WORKER_MODE=mode,
+                OCR_ENGINE_POOL_SIZE=str(count),
+                OCR_PIPELINE_WORKERS=str(count),
+            )
+            result = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child"]
+                + ["--pages", str(args.pages), "--boxes", str(args.boxes)]
+                + ["--seed", str(args.seed)],
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                print(f"{mode:<10}{count:>8}  failed:\n{result.stderr[-2000:]}")
+                continue
+            seconds = json.loads(result.stdout.strip().splitlines()[-1])["seconds"]
+            print(f"{mode:<10}{count:>8}{seconds:>10.2f}{args.pages / seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.helpers.anonymization import (  # noqa: E402
+    DATE_PATTERNS,
+    GENDER_WORDS,
+    ID_NUMBER_PATTERN,
+)
+from utils.helpers.pii_rules import RuleEngine  # noqa: E402
+
+WORDS = (
+    "der die das und mit wurde Patient Patientin Operation Narkose Aufklärung "
+    "Befund Therapie komplikationslos Entlassung Station Klinik Kontrolle "
+    "Frau Herr Mann Dame Person, Herrn."
+).split()
+
+SYLLABLES = "ber mann hof stein feld berg haus wald bach dorf au lin ner ger"
+
+
+def generate_terms(count, rng):
+    """Generate distinct synthetic names and streets for the deny-lists."""
+    syllables = SYLLABLES.split()
+    terms = set()
+    while len(terms) < count:
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3)))
+        terms.add(name.capitalize() + rng.choice(["", "straße", " GmbH"]))
+    return sorted(terms)
+
+
+def generate_text(length, terms, rng):
+    """Generate report-like text with dates, IDs, gender words and deny-listed terms."""
+    parts, size = [], 0
+    while size < length:
+        roll = rng.random()
+        if roll < 0.03:
+            part = f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(1950, 2024)}"
+        elif roll < 0.05:
+            part = str(rng.randint(10000, 999999999))
+        elif roll < 0.08:
+            part = rng.choice(terms)
+        else:
+            part = rng.choice(WORDS)
+        parts.append(part)
+        size += len(part) + 1
+    return " ".join(parts)[:length]
+
+
+def legacy_find(text, deny_lists):
+    """The previous approach: one scan per pattern, list lookups, one regex per term."""
+    entities = []
+    for pattern in DATE_PATTERNS:
+        entities += [
+            (m.start(), m.end(), "DATE_TIME") for m in re.finditer(pattern, text)
+        ]
+    index = 0
+    for word in text.split():
+        start = text.index(word, index)
+        index = start + len(word)
+        if word.lower().strip(",.!?;:") in GENDER_WORDS:
+            entities.append((start, index, "GENDER_WORD"))
+    entities += [
+        (m.start(), m.end(), "ID_NUMBER") for m in re.finditer(ID_NUMBER_PATTERN, text)
+    ]
+    for entity_type, terms in deny_lists.items():
+        for term in terms:
+            entities += [
+                (m.start(), m.end(), entity_type)
+                for m in re.finditer(
+                    rf"(?<!\w){re.escape(term)}(?!\w)", text, re.IGNORECASE
+                )
+            ]
+    return entities
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the throughput of the single-pass PII rule engine."
+    )
+    parser.add_argument("--chars", type=int, default=100_000)
+    parser.add_argument("--terms", type=int, nargs="+", default=[0, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(
+        f"{args.chars} characters\n"
+        f"{'terms':>6}{'compile ms':>12}{'engine ms':>11}{'MB/s':>7}{'legacy ms':>11}"
+        f"{'speedup':>9}{'matches':>9}{'agreement':>11}"
+    )
+    for count in args.terms:
+        rng = random.Random(args.seed)
+        terms = generate_terms(count, rng) if count else []
+        text = generate_text(args.chars, terms or WORDS, rng)
+        deny_lists = {"PERSON": terms} if terms else {}
+
+        start = time.perf_counter()
+        engine = RuleEngine(
+            patterns=[("DATE_TIME", pattern) for pattern in DATE_PATTERNS]
+            + [("ID_NUMBER", ID_NUMBER_PATTERN)],
+            words=[("GENDER_WORD", GENDER_WORDS)],
+            deny_lists=deny_lists,
+        )
+        compile_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            matches = engine.find(text)
+        engine_seconds = (time.perf_counter() - start) / args.repeat
+
+        # The legacy deny-list scan is slow, time it once
+        start = time.perf_counter()
+        legacy = set(legacy_find(text, deny_lists))
+        legacy_seconds = time.perf_counter() - start
+
+        found = {(m["start"], m["end"], m["entity_type"]) for m in matches}
+        agreement = len(found & legacy) / len(legacy) if legacy else 1.0
+        print(
+            f"{count:>6}{1000 * compile_seconds:>12.1f}{1000 * engine_seconds:>11.1f}"
+            f"{len(text) / engine_seconds / 1e6:>7.1f}{1000 * legacy_seconds:>11.1f}"
+            f"{legacy_seconds / engine_seconds:>8.1f}x{len(matches):>9}{agreement:>11.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+from Levenshtein import distance as levenshtein_distance
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.helpers.alignment import align_zitate  # noqa: E402
+
+VOCABULARY = (
+    "Patient Patientin Narkose Intubation Hautschnitt Bauchwand Hernie Netz Naht "
+    "Faszie Peritoneum Bruchsack Reposition Blutstillung Drainage Wundverschluss "
+    "Lagerung Desinfektion Abdeckung Trokar Laparoskopie Kamera Pneumoperitoneum "
+    "links rechts median subkutan präperitoneal fortlaufend resorbierbar mit und "
+    "der die das eine einer nach unter über bei Z.n. Befund Diagnose Therapie"
+).split()
+
+
+def legacy_align_zitate(text, zitate, distance_threshold=10):
+    """Previous sliding window implementation of find_zitat_in_text."""
+    spans = []
+    for zitat, zitat_label in zitate:
+        zitat_len = len(zitat)
+        best_match_indices = None
+        best_distance = float("inf")
+
+        for i in range(len(text) - zitat_len + 1):
+            current_distance = levenshtein_distance(zitat, text[i : i + zitat_len])
+            if (
+                current_distance < best_distance
+                and current_distance <= distance_threshold
+            ):
+                best_distance = current_distance
+                best_match_indices = (i, i + zitat_len)
+
+        if best_match_indices:
+            start_idx, end_idx = best_match_indices
+            while end_idx < len(text) and text[end_idx] != " ":
+                end_idx += 1
+            spans.append((start_idx, end_idx, zitat_label))
+    return spans
+
+
+def generate_report(num_chars, rng):
+    words = []
+    length = 0
+    while length < num_chars:
+        word = rng.choice(VOCABULARY)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:num_chars]
+
+
+def generate_zitate(text, num_zitate, rng, max_edits=4):
+    zitate = []
+    for i in range(num_zitate):
+        zitat_len = rng.randint(60, 200)
+        start = rng.randint(0, len(text) - zitat_len)
+        zitat = list(text[start : start + zitat_len])
+        for _ in range(rng.randint(0, max_edits)):
+            zitat[rng.randrange(len(zitat))] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        zitate.append(("".join(zitat), f"{i + 1:04d}"))
+    return zitate
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the seed-anchored zitat aligner against the sliding window implementation."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[5_000, 20_000, 50_000, 100_000, 200_000],
+        help="Report sizes in characters.",
+    )
+    parser.add_argument("--zitate", type=int, default=20, help="Zitate per report.")
+    parser.add_argument(
+        "--skip-legacy-above",
+        type=int,
+        default=None,
+        help="Skip the slow sliding window implementation for larger reports.",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    print(
+        f"{'chars':>8} {'zitate':>7} {'legacy [s]':>11} {'seeded [s]':>11} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        text = generate_report(size, rng)
+        zitate = generate_zitate(text, args.zitate, rng)
+
+        start = time.perf_counter()
+        spans = align_zitate(text, zitate)
+        seeded_time = time.perf_counter() - start
+
+        if args.skip_legacy_above is not None and size > args.skip_legacy_above:
+            print(f"{size:>8} {len(zitate):>7} {'-':>11} {seeded_time:>11.4f} {'-':>8}")
+            continue
+
+        start = time.perf_counter()
+        legacy_spans = legacy_align_zitate(text, zitate)
+        legacy_time = time.perf_counter() - start
+
+        if spans != legacy_spans:
+            raise AssertionError(f"Results differ for report of {size} characters")
+
+        print(
+            f"{size:>8} {len(zitate):>7} {legacy_time:>11.4f} {seeded_time:>11.4f} "
+            f"{legacy_time / seeded_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Entry points that are imported on a page load
+MODULES = [
+    "app",
+    "utils.stages.analyze",
+    "utils.stages.anonymize",
+    "utils.stages.edit_anonymized",
+    "utils.stages.rechnung_anonymize",
+    "utils.stages.result",
+]
+
+# Packages that must only be imported when the feature using them runs
+HEAVY_MODULES = [
+    "flair",
+    "torch",
+    "transformers",
+    "xmlschema",
+    "reportlab",
+    "fitz",
+    "pymupdf",
+    "pdf2image",
+    "schemas.padnext_v2_py",
+]
+
+
+def measure_imports(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        Dict[str, Tuple[int, int]]: (self, cumulative) import time in microseconds per
+            imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def heavy_imports(timings: Dict[str, Tuple[int, int]]) -> List[str]:
+    """Return the top-level heavy packages found in the imported modules."""
+    return sorted(
+        heavy
+        for heavy in HEAVY_MODULES
+        if any(name == heavy or name.startswith(f"{heavy}.") for name in timings)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report per-module import times and fail if a page load imports heavy dependencies."
+    )
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Fail if importing a module takes longer than this.",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Slowest imports to show per module."
+    )
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        timings = measure_imports(module)
+        total_ms = timings[module][1] / 1000
+
+        print(f"\n{module}: {total_ms:.0f} ms, {len(timings)} modules")
+        slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_us, cumulative_us) in slowest[: args.top]:
+            print(
+                f"  {self_us / 1000:>8.1f} ms self {cumulative_us / 1000:>8.1f} ms  {name}"
+            )
+
+        heavy = heavy_imports(timings)
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)}")
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            failures.append(
+                f"{module} takes {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)"
+            )
+
+    if failures:
+        print("\nImport budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+    print("\nImport budget OK.")
+
+
+if __name__ == "__main__":
+    main()
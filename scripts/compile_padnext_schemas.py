@@ -0,0 +1,17 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.helpers.xsd_cache import build_schema_cache  # noqa: E402
+
+SCHEMA_DIR = "schemas/padnext_v2"
+XSD_PATHS = [
+    f"{SCHEMA_DIR}/padx_auf_v2.12.xsd",
+    f"{SCHEMA_DIR}/padx_adl_v2.12.xsd",
+]
+
+
+if __name__ == "__main__":
+    build_schema_cache(XSD_PATHS)
+    print("PADnext schemas compiled.")
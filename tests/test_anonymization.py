@@ -0,0 +1,75 @@
+import unittest
+from unittest import mock
+
+from utils.helpers import anonymization
+from utils.helpers.pii_rules import RuleEngine
+
+
+def _flair_entity(text: str, word: str, entity_type: str, score: float = 0.99):
+    start = text.index(word)
+    return {
+        "original_word": word,
+        "entity_type": entity_type,
+        "start": start,
+        "end": start + len(word),
+        "score": score,
+    }
+
+
+class AnonymizeOverlappingEntitiesTest(unittest.TestCase):
+    def anonymize(self, text, deny_lists, flair_entities):
+        rule_engine = RuleEngine(
+            patterns=[
+                ("DATE_TIME", pattern) for pattern in anonymization.DATE_PATTERNS
+            ],
+            words=[],
+            deny_lists=deny_lists,
+        )
+        with mock.patch.object(
+            anonymization, "get_rule_engine", return_value=rule_engine
+        ), mock.patch.object(
+            anonymization, "_detect_flair_entities", return_value=flair_entities
+        ):
+            return anonymization.anonymize_text_german(
+                text, use_spacy=False, tier="fast"
+            )
+
+    def test_flair_name_inside_deny_list_term(self):
+        text = "Termin bei Dr. Müller am 12.03.2024."
+        result = self.anonymize(
+            text,
+            {"PERSON": ["Dr. Müller"]},
+            [_flair_entity(text, "Müller", "PER")],
+        )
+
+        self.assertEqual(
+            result["anonymized_text"], "Termin bei <PERSON> am <DATE_TIME>."
+        )
+        self.assertEqual(
+            [
+                (entity["original_word"], entity["entity_type"])
+                for entity in result["detected_entities"]
+            ],
+            [("Dr. Müller", "PERSON"), ("12.03.2024", "DATE_TIME")],
+        )
+
+    def test_partially_overlapping_entities_are_merged(self):
+        text = "Praxis Dr. Hoffmann Bahnhofstraße 5"
+        result = self.anonymize(
+            text,
+            {"ORGANIZATION": ["Praxis Dr. Hoffmann"]},
+            [_flair_entity(text, "Hoffmann Bahnhofstraße", "LOC")],
+        )
+
+        self.assertEqual(result["anonymized_text"], "<ORGANIZATION> 5")
+        self.assertEqual(
+            [
+                (entity["original_word"], entity["entity_type"])
+                for entity in result["detected_entities"]
+            ],
+            [("Praxis Dr. Hoffmann Bahnhofstraße", "ORGANIZATION")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from Levenshtein import distance as levenshtein_distance
+
+# Seeds shorter than this match too often to be useful as anchors
+MIN_SEED_LENGTH = 4
+
+
+def _seed_pieces(
+    zitat: str, distance_threshold: int
+) -> Optional[List[Tuple[int, str]]]:
+    """
+    Split a zitat into distance_threshold + 1 disjoint pieces.
+
+    A window within distance_threshold edits of the zitat can destroy at most
+    distance_threshold pieces, so at least one piece occurs unchanged in it.
+
+    Args:
+        zitat (str): The zitat to split.
+        distance_threshold (int): Maximum Levenshtein distance of a match.
+
+    Returns:
+        Optional[List[Tuple[int, str]]]: (offset, piece) pairs, or None if the pieces
+            would be shorter than MIN_SEED_LENGTH.
+    """
+    num_pieces = distance_threshold + 1
+    piece_length = len(zitat) // num_pieces
+    if piece_length < MIN_SEED_LENGTH:
+        return None
+    return [
+        (i * piece_length, zitat[i * piece_length : (i + 1) * piece_length])
+        for i in range(num_pieces)
+    ]
+
+
+def _best_window(
+    text: str, zitat: str, starts: Iterable[int], distance_threshold: int
+) -> Optional[Tuple[int, int]]:
+    """
+    Find the window of len(zitat) characters closest to the zitat.
+
+    Windows are checked in ascending start order, the earliest window with the
+    smallest distance wins (same tie-breaking as a full sliding window).
+
+    Args:
+        text (str): The text to search in.
+        zitat (str): The zitat to find.
+        starts (Iterable[int]): Ascending window start positions to verify.
+        distance_threshold (int): Maximum Levenshtein distance of a match.
+
+    Returns:
+        Optional[Tuple[int, int]]: (start, end) of the best window, or None if no
+            window is within the threshold.
+    """
+    zitat_len = len(zitat)
+    best_indices = None
+    best_distance = distance_threshold + 1
+
+    for start in starts:
+        current_distance = levenshtein_distance(
+            zitat, text[start : start + zitat_len], score_cutoff=best_distance - 1
+        )
+        if current_distance < best_distance:
+            best_distance = current_distance
+            best_indices = (start, start + zitat_len)
+            if best_distance == 0:
+                break
+
+    return best_indices
+
+
+def _find_seed_anchors(
+    text: str, seeds: Dict[int, List[Tuple[int, str]]]
+) -> Dict[int, Set[int]]:
+    """
+    Scan the text once and collect anchor positions for all zitate.
+
+    Args:
+        text (str): The text to search in.
+        seeds (Dict[int, List[Tuple[int, str]]]): Seed pieces per zitat index.
+
+    Returns:
+        Dict[int, Set[int]]: Per zitat index, the text positions where the zitat
+            would start if one of its pieces matched exactly.
+    """
+    anchors: Dict[int, Set[int]] = defaultdict(set)
+    if not seeds:
+        return anchors
+
+    # All seeds are looked up by a prefix of the same length, so one table serves all zitate
+    prefix_length = min(len(piece) for pieces in seeds.values() for _, piece in pieces)
+    seed_table: Dict[str, List[Tuple[int, int, str]]] = defaultdict(list)
+    for zitat_index, pieces in seeds.items():
+        for offset, piece in pieces:
+            seed_table[piece[:prefix_length]].append((zitat_index, offset, piece))
+
+    for position in range(len(text) - prefix_length + 1):
+        entries = seed_table.get(text[position : position + prefix_length])
+        if not entries:
+            continue
+        for zitat_index, offset, piece in entries:
+            if text.startswith(piece, position):
+                anchors[zitat_index].add(position - offset)
+
+    return anchors
+
+
+def align_zitate(
+    text: str,
+    zitate: List[Tuple[str, str]],
+    distance_threshold: int = 10,
+) -> List[Tuple[int, int, str]]:
+    """
+    Locate zitate in a text by approximate matching.
+
+    Every zitat is matched against windows of its own length with a maximum
+    Levenshtein distance of distance_threshold. Instead of verifying every window
+    of the text, exact seed pieces of all zitate are located in a single pass and
+    only windows around these anchors are verified. The result is identical to a
+    full sliding window search.
+
+    Args:
+        text (str): The (cleaned) text to search in.
+        zitate (List[Tuple[str, str]]): List of (zitat, label) tuples.
+        distance_threshold (int): Maximum Levenshtein distance to consider a match.
+
+    Returns:
+        List[Tuple[int, int, str]]: (start, end, label) spans of the found zitate, in
+            the order of the input. The end is extended to the next blank space if the
+            match ends in the middle of a word.
+    """
+    seeds = {}
+    for zitat_index, (zitat, _) in enumerate(zitate):
+        pieces = _seed_pieces(zitat, distance_threshold)
+        if pieces is not None:
+            seeds[zitat_index] = pieces
+
+    anchors = _find_seed_anchors(text, seeds)
+
+    spans = []
+    for zitat_index, (zitat, zitat_label) in enumerate(zitate):
+        max_start = len(text) - len(zitat)
+        if max_start < 0:
+            continue
+
+        if zitat_index in seeds:
+            # A matching window starts at most distance_threshold characters away from an anchor
+            starts = sorted(
+                {
+                    start
+                    for anchor in anchors.get(zitat_index, ())
+                    for start in range(
+                        max(0, anchor - distance_threshold),
+                        min(max_start, anchor + distance_threshold) + 1,
+                    )
+                }
+            )
+        else:
+            # Too short to seed, fall back to verifying every window
+            starts = range(max_start + 1)
+
+        best_indices = _best_window(text, zitat, starts, distance_threshold)
+        if best_indices is None:
+            continue
+
+        start_idx, end_idx = best_indices
+
+        # Extend the match to the next blank space if it ends in the middle of a word
+        while end_idx < len(text) and text[end_idx] != " ":
+            end_idx += 1
+
+        spans.append((start_idx, end_idx, zitat_label))
+
+    return spans
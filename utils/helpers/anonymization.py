@@ -1,11 +1,19 @@
+import copy
+import hashlib
 import os
 import re
-from typing import Any, Dict, List
-
-from flair.data import Sentence
-from flair.models import SequenceTagger
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from utils.helpers.logger import logger
+from utils.helpers.ner_service import NER_SERVICE_ENABLED, get_ner_service
+from utils.helpers.pii_rules import RuleEngine, load_deny_lists
+
+# flair pulls in torch and transformers, it is imported on first use of the model
+if TYPE_CHECKING:
+    from flair.models import SequenceTagger
 
 ENTITIES = [
     "LOCATION",
@@ -20,6 +28,9 @@ PRESIDIO_EQUIVALENCES = {
     "PER": "PERSON",
     "LOC": "LOCATION",
     "ORG": "ORGANIZATION",
+    "PERSON": "PERSON",
+    "LOCATION": "LOCATION",
+    "ORGANIZATION": "ORGANIZATION",
     "DATE_TIME": "DATE_TIME",
     "GENDER_WORD": "GENDER_WORD",
     "ID_NUMBER": "ID_NUMBER",
@@ -31,11 +42,69 @@ CHECK_LABEL_GROUPS = [
     ({"ORGANIZATION"}, {"ORG"}),
 ]
 
-MODEL_LANGUAGES = {
-    "de": "flair/ner-german-large",
-}
 MODELS_DIR = os.path.join(os.path.dirname(__file__), "../../models")
-MODEL_FILE = os.path.join(MODELS_DIR, "flair-ner-german-large.pt")
+
+# NER model tiers from the fastest to the most accurate: the Flair model, the file
+# it is cached in under MODELS_DIR and the backend it runs on
+NER_MODEL_TIERS = {
+    # Flair embeddings with an LSTM-CRF, small and fast on CPU
+    "fast": {
+        "model": "flair/ner-german",
+        "file": "flair-ner-german.pt",
+        "backend": "fp32",
+    },
+    # XLM-RoBERTa large with int8 linear layers
+    "balanced": {
+        "model": "flair/ner-german-large",
+        "file": "flair-ner-german-large.pt",
+        "backend": "int8",
+    },
+    "accurate": {
+        "model": "flair/ner-german-large",
+        "file": "flair-ner-german-large.pt",
+        "backend": "fp32",
+    },
+}
+
+# Tier of the deployment, used for documents that do not ask for another one
+NER_MODEL_TIER = os.getenv("NER_MODEL_TIER", "accurate").lower()
+
+# Longer documents are tagged with NER_LONG_DOCUMENT_TIER if it is faster, to bound the
+# latency. Off if empty: the faster tier is one more model in memory and less accurate.
+NER_LONG_DOCUMENT_CHARS = int(os.getenv("NER_LONG_DOCUMENT_CHARS", "20000"))
+NER_LONG_DOCUMENT_TIER = os.getenv("NER_LONG_DOCUMENT_TIER", "").lower()
+
+# Inference backend: "fp32" runs the PyTorch model as saved, "int8" quantizes its
+# linear layers dynamically, which is faster and smaller on CPU. Overrides the
+# backend of every tier if set.
+NER_BACKEND = os.getenv("NER_BACKEND", "").lower()
+NER_BACKENDS = ("fp32", "int8")
+
+# Process-wide model holder shared by all sessions, one model per tier
+_models: Dict[str, "SequenceTagger"] = {}
+_model_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+
+# Sentences tagged per forward pass of the NER model
+NER_BATCH_SIZE = int(os.getenv("NER_BATCH_SIZE", "16"))
+
+# Longer sentences, e.g. OCR text without punctuation, are split at line breaks or spaces
+NER_MAX_SENTENCE_CHARS = int(os.getenv("NER_MAX_SENTENCE_CHARS", "1000"))
+
+_ner_stats_lock = threading.Lock()
+_ner_stats = {"sentences": 0, "tokens": 0, "seconds": 0.0}
+
+# Sentences whose NER results are kept for reuse, shared by all sessions. Reports
+# repeat template sentences (headers, consent paragraphs, standard procedures).
+NER_CACHE_SIZE = int(os.getenv("NER_CACHE_SIZE", "20000"))
+
+NerCacheKey = Tuple[str, bytes]
+
+_ner_cache_lock = threading.Lock()
+_ner_cache: "OrderedDict[NerCacheKey, List[Dict[str, Any]]]" = OrderedDict()
+_ner_cache_hits = 0
+_ner_cache_misses = 0
 
 DEFAULT_EXPLANATION = "Identified as {} by Flair's Named Entity Recognition"
 
@@ -90,97 +159,490 @@ GENDER_WORDS = [
     "persons",
 ]
 
+# Continuous numbers of length 5 or more, e.g. insurance or case numbers
+ID_NUMBER_PATTERN = r"\b\d{5,}\b"
+
+# Directory with operator-supplied deny-lists: one <ENTITY_TYPE>.txt per type (e.g.
+# PERSON.txt for doctors, ORGANIZATION.txt for practices, LOCATION.txt for streets)
+ANONYMIZATION_DENY_LIST_DIR = os.getenv("ANONYMIZATION_DENY_LIST_DIR", "")
+
+_rule_engine: Optional[RuleEngine] = None
+_rule_engine_lock = threading.Lock()
+
+
+def _resolve_tier(tier: Optional[str]) -> str:
+    tier = (tier or NER_MODEL_TIER).lower()
+    if tier not in NER_MODEL_TIERS:
+        raise ValueError(f"Unknown NER model tier: {tier}")
+    return tier
+
+
+def model_file(tier: Optional[str] = None) -> str:
+    """Return the local file of the model of a tier."""
+    return os.path.join(MODELS_DIR, NER_MODEL_TIERS[_resolve_tier(tier)]["file"])
 
-def download_model_if_needed():
-    """Download the Hugging Face NER model if it does not exist locally."""
-    if not os.path.exists(MODEL_FILE):
+
+def select_model_tier(text: str) -> str:
+    """
+    Choose the model tier for a document by its length.
+
+    If NER_LONG_DOCUMENT_TIER is set and faster than the tier of the
+    deployment, long documents use it. All others use the tier of the
+    deployment.
+
+    Args:
+        text (str): The text of the document.
+
+    Returns:
+        str: The model tier.
+    """
+    if len(text) <= NER_LONG_DOCUMENT_CHARS:
+        return _resolve_tier(None)
+    return automatic_model_tiers()[-1]
+
+
+def automatic_model_tiers() -> List[str]:
+    """
+    Return the tiers select_model_tier chooses from.
+
+    Returns:
+        List[str]: The tier of the deployment, followed by NER_LONG_DOCUMENT_TIER if it is
+            set and faster.
+    """
+    tier = _resolve_tier(None)
+    if not NER_LONG_DOCUMENT_TIER:
+        return [tier]
+    tiers = list(NER_MODEL_TIERS)
+    long_tier = _resolve_tier(NER_LONG_DOCUMENT_TIER)
+    if tiers.index(long_tier) < tiers.index(tier):
+        return [tier, long_tier]
+    return [tier]
+
+
+def download_model_if_needed(tier: Optional[str] = None):
+    """Download the Hugging Face NER model of a tier if it does not exist locally."""
+    from flair.models import SequenceTagger
+
+    path = model_file(tier)
+    if not os.path.exists(path):
         logger.info("Downloading Hugging Face model...")
         os.makedirs(MODELS_DIR, exist_ok=True)
-        model = SequenceTagger.load(MODEL_LANGUAGES["de"])  # Download the model
-        model.save(MODEL_FILE)  # Save it locally
+        # Download the model
+        model = SequenceTagger.load(NER_MODEL_TIERS[_resolve_tier(tier)]["model"])
+        model.save(path)  # Save it locally
     else:
         logger.info("Model already exists locally.")
 
 
-def load_model():
-    """Load the Hugging Face NER model from the local file."""
-    logger.info("Loading the local Hugging Face model...")
-    if os.path.exists(MODEL_FILE):
-        logger.info("Loading the local Hugging Face model...")
-        model = SequenceTagger.load(MODEL_FILE)  # Load the model from local file
-    else:
+def quantize_model(model: "SequenceTagger") -> "SequenceTagger":
+    """
+    Quantize the linear layers of a model to int8 weights, in place.
+
+    Activations are quantized on the fly during inference, no calibration data
+    is needed. The transformer's linear layers dominate the CPU time of the
+    model.
+
+    Args:
+        model (SequenceTagger): The fp32 model.
+
+    Returns:
+        SequenceTagger: The quantized model.
+    """
+    import torch
+
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+def load_model(
+    tier: Optional[str] = None, backend: Optional[str] = None
+) -> "SequenceTagger":
+    """
+    Load the Hugging Face NER model of a tier from its local file.
+
+    Args:
+        tier (Optional[str]): The model tier, NER_MODEL_TIER if not provided.
+        backend (Optional[str]): The inference backend, one of NER_BACKENDS. NER_BACKEND or
+            the backend of the tier if not provided.
+
+    Returns:
+        SequenceTagger: The model, ready for inference.
+
+    Raises:
+        ValueError: If the tier or backend is unknown.
+    """
+    from flair.models import SequenceTagger
+
+    tier = _resolve_tier(tier)
+    backend = backend or model_backend(tier)
+    if backend not in NER_BACKENDS:
+        raise ValueError(f"Unknown NER backend: {backend}")
+
+    path = model_file(tier)
+    if not os.path.exists(path):
         logger.info("Model not found locally, downloading...")
-        download_model_if_needed()
-        model = load_model()
+        download_model_if_needed(tier)
+
+    logger.info(f"Loading the local Hugging Face model of the {tier} tier...")
+    model = SequenceTagger.load(path)  # Load the model from local file
+    model.eval()
+    if backend == "int8":
+        logger.info("Quantizing the NER model to int8...")
+        model = quantize_model(model)
     return model
 
 
-def _anonymize_continuous_numbers(
-    text: str, detected_entities: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
+def model_backend(tier: Optional[str] = None) -> str:
+    """Return the inference backend the model of a tier runs on."""
+    return NER_BACKEND or NER_MODEL_TIERS[_resolve_tier(tier)]["backend"]
+
+
+def model_version(tier: Optional[str] = None) -> str:
+    """Return an identifier of the model and backend of a tier, results differ between them."""
+    tier = _resolve_tier(tier)
+    return f"{NER_MODEL_TIERS[tier]['file']}:{model_backend(tier)}"
+
+
+def _model_from_loaded_tier(tier: str) -> Optional["SequenceTagger"]:
+    """
+    Build the model of a tier from a loaded tier with the same model file.
+
+    A tier with the same file and backend shares its model. An int8 tier is
+    quantized from a copy of the loaded fp32 model instead of reading the
+    file again.
+    """
+    for loaded_tier, model in _models.items():
+        if NER_MODEL_TIERS[loaded_tier]["file"] != NER_MODEL_TIERS[tier]["file"]:
+            continue
+        if model_backend(loaded_tier) == model_backend(tier):
+            return model
+        if model_backend(loaded_tier) == "fp32" and model_backend(tier) == "int8":
+            logger.info(
+                f"Quantizing the NER model of the {loaded_tier} tier to int8 "
+                f"for the {tier} tier..."
+            )
+            return quantize_model(copy.deepcopy(model))
+    return None
+
+
+def get_model(tier: Optional[str] = None) -> "SequenceTagger":
+    """
+    Return the process-wide NER model of a tier, loading it on first use.
+
+    Concurrent callers wait for the same load instead of loading the model twice.
+    Tiers with the same model file are built from the model already loaded,
+    see _model_from_loaded_tier.
+
+    Args:
+        tier (Optional[str]): The model tier, NER_MODEL_TIER if not provided.
+
+    Returns:
+        SequenceTagger: The loaded Flair NER model.
+
+    Raises:
+        ValueError: If the tier is unknown.
+    """
+    tier = _resolve_tier(tier)
+    model = _models.get(tier)
+    if model is None:
+        with _model_lock:
+            model = _models.get(tier)
+            if model is None:
+                model = _model_from_loaded_tier(tier) or load_model(tier)
+                _models[tier] = model
+    return model
+
+
+def is_model_ready(tier: Optional[str] = None) -> bool:
+    """Return True if the NER model of a tier is loaded and can be used without waiting."""
+    return _resolve_tier(tier) in _models
+
+
+def _warm_up_model() -> None:
+    """Load the NER models and log instead of raising if one fails."""
+    for tier in automatic_model_tiers():
+        try:
+            get_model(tier)
+            logger.info(f"NER model warm-up of the {tier} tier completed.")
+        except Exception as e:
+            logger.error(f"NER model warm-up of the {tier} tier failed: {e}")
+
+
+def start_model_warmup() -> None:
     """
-    Anonymize continuous numbers of length 5 or more (e.g., IDs) in the text.
+    Start loading the NER models of the automatic tiers in a background thread.
+
+    Loads every tier select_model_tier may choose, so that a long document
+    does not load a model while its request waits. Safe to call on every
+    rerun, the thread is only started once per process.
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if all(map(is_model_ready, automatic_model_tiers())) or (
+            _warmup_thread is not None and _warmup_thread.is_alive()
+        ):
+            return
+        logger.info("Starting NER model warm-up in the background...")
+        _warmup_thread = threading.Thread(
+            target=_warm_up_model, name="ner-model-warmup", daemon=True
+        )
+        _warmup_thread.start()
+
+
+def get_rule_engine() -> RuleEngine:
+    """
+    Return the process-wide rule engine, compiling it on first use.
+
+    Returns:
+        RuleEngine: The engine for dates, IDs, gender words and the deny-lists.
+    """
+    global _rule_engine
+    if _rule_engine is None:
+        with _rule_engine_lock:
+            if _rule_engine is None:
+                _rule_engine = RuleEngine(
+                    patterns=[("DATE_TIME", pattern) for pattern in DATE_PATTERNS]
+                    + [("ID_NUMBER", ID_NUMBER_PATTERN)],
+                    words=[("GENDER_WORD", GENDER_WORDS)],
+                    deny_lists=load_deny_lists(ANONYMIZATION_DENY_LIST_DIR),
+                )
+    return _rule_engine
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """
+    Split text into sentences and keep their position in the text.
+
+    Sentences longer than NER_MAX_SENTENCE_CHARS are split further at the last
+    line break or space that fits.
 
     Args:
-        text (str): The input text to process.
-        detected_entities (List[Dict[str, Any]]): The list to store detected entities.
+        text (str): The text to split.
 
     Returns:
-        List[Dict[str, Any]]: Updated list of detected entities.
+        List[Tuple[int, int]]: The (start, end) character offsets of the non-empty sentences.
     """
-    # Regex to match continuous digits with length of 5 or more
-    number_pattern = re.compile(r"\b\d{5,}\b")
+    from segtok.segmenter import split_multi
+
+    spans = []
+    cursor = 0
+    for sentence in split_multi(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        start = text.find(sentence, cursor)
+        if start < 0:
+            continue
+        end = start + len(sentence)
+        cursor = end
+
+        while end - start > NER_MAX_SENTENCE_CHARS:
+            window = text[start : start + NER_MAX_SENTENCE_CHARS]
+            cut = max(window.rfind("\n"), window.rfind(" "))
+            cut = start + (cut if cut > 0 else NER_MAX_SENTENCE_CHARS)
+            spans.append((start, cut))
+            start = cut
+            while start < end and text[start].isspace():
+                start += 1
+        if start < end:
+            spans.append((start, end))
+    return spans
+
+
+def tag_sentences(
+    sentences: List[str], tier: Optional[str] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Run the NER model over sentences in mini-batches.
+
+    Flair sorts the sentences by length before batching, so each forward pass
+    pads to a similar length.
+
+    Args:
+        sentences (List[str]): The sentences to tag.
+        tier (Optional[str]): The model tier, NER_MODEL_TIER if not provided.
+
+    Returns:
+        List[List[Dict[str, Any]]]: Per sentence the detected entities with 'original_word',
+            'entity_type', 'score' and 'start'/'end' offsets within the sentence.
+    """
+    from flair.data import Sentence
+
+    if not sentences:
+        return []
+
+    tagger = get_model(tier)
+    flair_sentences = [Sentence(sentence) for sentence in sentences]
+    start = time.perf_counter()
+    tagger.predict(flair_sentences, mini_batch_size=NER_BATCH_SIZE)
+    seconds = time.perf_counter() - start
+
+    tokens = sum(len(sentence) for sentence in flair_sentences)
+    with _ner_stats_lock:
+        _ner_stats["sentences"] += len(flair_sentences)
+        _ner_stats["tokens"] += tokens
+        _ner_stats["seconds"] += seconds
+    logger.info(
+        f"Tagged {len(flair_sentences)} sentences, {tokens} tokens in {seconds:.2f} s "
+        f"({tokens / seconds if seconds else 0.0:.0f} tokens/s)"
+    )
 
-    # Find all matches in the text
-    for match in number_pattern.finditer(text):
-        # Add the detected number to the list of detected entities
-        detected_entities.append(
+    return [
+        [
             {
-                "original_word": match.group(0),
-                "entity_type": "ID_NUMBER",
-                "start": match.start(),
-                "end": match.end(),
-                "score": 1.0,  # High confidence as it's an exact match for the pattern
+                "original_word": entity.text,
+                "entity_type": entity.get_label("ner").value,
+                "start": entity.start_position,
+                "end": entity.end_position,
+                "score": entity.score,
             }
-        )
+            for entity in sentence.get_spans("ner")
+        ]
+        for sentence in flair_sentences
+    ]
+
+
+def get_ner_stats() -> Dict[str, float]:
+    """
+    Return the throughput of the NER model since the process started.
+
+    Returns:
+        Dict[str, float]: Tagged 'sentences' and 'tokens', the time spent in 'seconds' and
+            'tokens_per_second'.
+    """
+    with _ner_stats_lock:
+        stats = dict(_ner_stats)
+    stats["tokens_per_second"] = (
+        stats["tokens"] / stats["seconds"] if stats["seconds"] else 0.0
+    )
+    return stats
+
+
+def _normalize_sentence(sentence: str) -> Tuple[str, List[int]]:
+    """
+    Collapse whitespace runs of a sentence to single spaces.
+
+    Returns:
+        Tuple[str, List[int]]: The normalized sentence and, per character of it, the
+            offset of that character in the original sentence.
+    """
+    characters: List[str] = []
+    positions: List[int] = []
+    for match in re.finditer(r"\S+", sentence):
+        if characters:
+            characters.append(" ")
+            positions.append(match.start() - 1)
+        characters.extend(match.group())
+        positions.extend(range(match.start(), match.end()))
+    return "".join(characters), positions
+
+
+def _tag_memoized(sentences: List[str], tier: str) -> List[List[Dict[str, Any]]]:
+    """
+    Tag sentences, taking repeated ones from the NER cache.
+
+    Only sentences not seen before with the same model reach the model, each
+    of them once even if it repeats within the document.
+    """
+    global _ner_cache_hits, _ner_cache_misses
+    version = model_version(tier)
+    keys = [
+        (version, hashlib.blake2b(sentence.encode(), digest_size=16).digest())
+        for sentence in sentences
+    ]
+
+    results: List[Optional[List[Dict[str, Any]]]] = [None] * len(sentences)
+    novel: Dict[NerCacheKey, str] = {}
+    with _ner_cache_lock:
+        for index, key in enumerate(keys):
+            if key in _ner_cache:
+                _ner_cache.move_to_end(key)
+                results[index] = _ner_cache[key]
+            else:
+                novel.setdefault(key, sentences[index])
+        _ner_cache_hits += len(sentences) - len(novel)
+        _ner_cache_misses += len(novel)
+
+    if novel:
+        if NER_SERVICE_ENABLED:
+            # Shares forward passes with the anonymizations of other sessions
+            tagged = get_ner_service().tag(list(novel.values()), tier)
+        else:
+            tagged = tag_sentences(list(novel.values()), tier)
+        tagged_by_key = dict(zip(novel, tagged))
+        with _ner_cache_lock:
+            for key, entities in tagged_by_key.items():
+                _ner_cache[key] = entities
+                _ner_cache.move_to_end(key)
+            while len(_ner_cache) > NER_CACHE_SIZE:
+                _ner_cache.popitem(last=False)
+        for index, key in enumerate(keys):
+            if results[index] is None:
+                results[index] = tagged_by_key[key]
+
+    logger.info(
+        f"NER cache: {len(sentences) - len(novel)}/{len(sentences)} sentences reused"
+    )
+    return results
+
 
-    # Return updated detected_entities
-    return detected_entities
-
-
-def _anonymize_gender_words(text: str, detected_entities: List[Dict[str, Any]]) -> str:
-    words = []
-    index = 0  # To track the position of the next word
-    # Split the text while keeping track of the index of each word
-    for word in text.split():
-        start_idx = text.index(
-            word, index
-        )  # Find the word starting at the current index
-        words.append((word, start_idx))
-        index = start_idx + len(word)  # Move index to the end of the word
-
-    # Iterate over the words and check if they are gender-related words
-    for word, start_idx in words:
-        # Normalize the word to lowercase for matching and strip punctuation
-        normalized_word = word.lower().strip(",.!?;:")
-        if normalized_word in GENDER_WORDS:
-            # Add the detected gender word to the list of detected entities
-            detected_entities.append(
+def get_ner_cache_stats() -> Dict[str, float]:
+    """
+    Return how many sentences were taken from the NER cache.
+
+    Returns:
+        Dict[str, float]: Cache 'hits', 'misses' (sentences tagged by the model), the
+            'hit_rate' and the number of cached sentences.
+    """
+    with _ner_cache_lock:
+        hits, misses, size = _ner_cache_hits, _ner_cache_misses, len(_ner_cache)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+        "size": size,
+    }
+
+
+def clear_ner_cache() -> None:
+    """Remove all cached NER results, e.g. after the model files were replaced."""
+    with _ner_cache_lock:
+        _ner_cache.clear()
+
+
+def _detect_flair_entities(text: str, tier: str) -> List[Dict[str, Any]]:
+    """Tag the text sentence by sentence and return entities with offsets in the text."""
+    spans = split_sentences(text)
+    normalized = [_normalize_sentence(text[start:end]) for start, end in spans]
+    tagged = _tag_memoized([sentence for sentence, _ in normalized], tier)
+
+    entities = []
+    for (offset, _), (_, positions), sentence_entities in zip(
+        spans, normalized, tagged
+    ):
+        for entity in sentence_entities:
+            start = offset + positions[entity["start"]]
+            end = offset + positions[entity["end"] - 1] + 1
+            entities.append(
                 {
-                    "original_word": word,
-                    "entity_type": "GENDER_WORD",
-                    "start": start_idx,
-                    "end": start_idx + len(word),
-                    "score": 1.0,  # High confidence for exact match
+                    **entity,
+                    "original_word": text[start:end],
+                    "start": start,
+                    "end": end,
                 }
             )
-
-    # Return updated detected_entities, no need to modify the text here
-    return detected_entities
+    return entities
 
 
 def anonymize_text_german(
-    text: str, use_spacy: bool = True, use_flair: bool = True, threshold: float = 0.7
+    text: str,
+    use_spacy: bool = True,
+    use_flair: bool = True,
+    threshold: float = 0.7,
+    tier: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Anonymize German text using NER models (Flair, SpaCy, or both).
@@ -190,43 +652,59 @@ def anonymize_text_german(
         use_spacy (bool): Use SpaCy for NER (default: True).
         use_flair (bool): Use Flair for NER (default: True).
         threshold (float): Confidence threshold for entity detection (default: 0.8).
+        tier (Optional[str]): The NER model tier. Chosen by select_model_tier if not provided.
 
     Returns:
         Dict[str, Any]: Dictionary containing anonymized text and detected entities.
     """
-    detected_entities = []
-
-    # Identify dates using regular expressions
-    for pattern in DATE_PATTERNS:
-        for match in re.finditer(pattern, text):
-            detected_entities.append(
-                {
-                    "original_word": match.group(0),
-                    "entity_type": "DATE_TIME",
-                    "start": match.start(),
-                    "end": match.end(),
-                    "score": 1.0,  # Assign a high confidence for regex matches
-                }
-            )
-
-    # Apply gender-word anonymization
-    detected_entities = _anonymize_gender_words(
-        text, detected_entities=detected_entities
-    )
-
-    # Apply continuous number anonymization
-    detected_entities = _anonymize_continuous_numbers(
-        text, detected_entities=detected_entities
-    )
+    # Dates, IDs, gender words and deny-listed terms in a single pass
+    detected_entities = get_rule_engine().find(text)
 
     if use_flair and not use_spacy:
-        return _anonymize_flair_only(text, threshold, detected_entities)
+        tier = tier or select_model_tier(text)
+        return _anonymize_flair_only(text, threshold, detected_entities, tier)
     else:
         raise NotImplementedError("SpaCy NER is not implemented.")
 
 
+def _merge_overlapping_entities(
+    text: str, entities: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Merge entities covering the same text, e.g. a deny-list term and a name Flair found in it.
+
+    Of overlapping entities the one starting first, among those the longest,
+    then the most confident one, is kept and extended to the end of the others,
+    so no part of them is left in the text.
+
+    Args:
+        text (str): The text the entities were detected in.
+        entities (List[Dict[str, Any]]): Entities with 'start', 'end' and 'score'.
+
+    Returns:
+        List[Dict[str, Any]]: The non-overlapping entities, sorted by start position.
+    """
+    merged = []
+    for entity in sorted(
+        entities, key=lambda e: (e["start"], e["start"] - e["end"], -e["score"])
+    ):
+        if not merged or entity["start"] >= merged[-1]["end"]:
+            merged.append(entity)
+        elif entity["end"] > merged[-1]["end"]:
+            previous = merged[-1]
+            merged[-1] = {
+                **previous,
+                "end": entity["end"],
+                "original_word": text[previous["start"] : entity["end"]],
+            }
+    return merged
+
+
 def _anonymize_flair_only(
-    text: str, threshold: float, detected_entities: List[Dict[str, Any]]
+    text: str,
+    threshold: float,
+    detected_entities: List[Dict[str, Any]],
+    tier: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Anonymize text using only Flair NER model.
@@ -235,56 +713,41 @@ def _anonymize_flair_only(
         text (str): Text to anonymize.
         threshold (float): Confidence threshold for entity detection.
         detected_entities (List[Dict[str, Any]]): List of already detected entities.
+        tier (Optional[str]): The NER model tier, NER_MODEL_TIER if not provided.
 
     Returns:
         Dict[str, Any]: Dictionary containing anonymized text and detected entities.
     """
-    logger.info("Anonymizing text using Flair NER model")
-    # tagger = SequenceTagger.load("flair/ner-german-large")
-    tagger = load_model()
-    sentence = Sentence(text)
-    tagger.predict(sentence)
+    tier = _resolve_tier(tier)
+    logger.info(f"Anonymizing text using Flair NER model ({tier} tier)")
 
     # Add NER detected entities from Flair
-    flair_entities = [
-        {
-            "original_word": entity.text,
-            "entity_type": entity.get_label("ner").value,
-            "start": entity.start_position,
-            "end": entity.end_position,
-            "score": entity.score,
-        }
-        for entity in sentence.get_spans("ner")
-    ]
-
-    detected_entities.extend(flair_entities)
+    detected_entities.extend(_detect_flair_entities(text, tier))
 
-    # Sort entities by start position in descending order
-    detected_entities.sort(key=lambda x: x["start"], reverse=True)
+    # Filter detected entities by score threshold and ENTITIES, one per stretch of text
+    detected_entities = _merge_overlapping_entities(
+        text,
+        [
+            {
+                **entity,
+                "entity_type": PRESIDIO_EQUIVALENCES.get(
+                    entity["entity_type"], entity["entity_type"]
+                ),
+            }
+            for entity in detected_entities
+            if entity["score"] > threshold
+            and PRESIDIO_EQUIVALENCES.get(entity["entity_type"]) in ENTITIES
+        ],
+    )
 
     # Replace entities with placeholders in reverse order
     anonymized_text = text
-    for entity in detected_entities:
-        presidio_entity_type = PRESIDIO_EQUIVALENCES.get(entity["entity_type"])
-        if presidio_entity_type in ENTITIES and entity["score"] > threshold:
-            anonymized_text = (
-                anonymized_text[: entity["start"]]
-                + f"<{presidio_entity_type}>"
-                + anonymized_text[entity["end"] :]
-            )
-
-    # Filter detected entities by score threshold and ENTITIES
-    detected_entities = [
-        {
-            **entity,
-            "entity_type": PRESIDIO_EQUIVALENCES.get(
-                entity["entity_type"], entity["entity_type"]
-            ),
-        }
-        for entity in detected_entities
-        if entity["score"] > threshold
-        and PRESIDIO_EQUIVALENCES.get(entity["entity_type"]) in ENTITIES
-    ]
+    for entity in reversed(detected_entities):
+        anonymized_text = (
+            anonymized_text[: entity["start"]]
+            + f"<{entity['entity_type']}>"
+            + anonymized_text[entity["end"] :]
+        )
 
     logger.info(f"Anonymization complete. Detected {len(detected_entities)} entities.")
     return {
@@ -293,17 +756,21 @@ def _anonymize_flair_only(
     }
 
 
-def anonymize_text(text: str) -> Dict[str, Any]:
+def anonymize_text(text: str, tier: Optional[str] = None) -> Dict[str, Any]:
     """
     Anonymize the extracted text locally using Flair NER.
 
     Args:
         text (str): Text to anonymize.
+        tier (Optional[str]): The NER model tier. Chosen by the length of the text if not
+            provided, see select_model_tier.
 
     Returns:
         Dict[str, Any]: Dictionary containing anonymized text and detected entities.
     """
     logger.info("Starting text anonymization ...")
-    anonymize_result = anonymize_text_german(text, use_spacy=False, use_flair=True)
+    anonymize_result = anonymize_text_german(
+        text, use_spacy=False, use_flair=True, tier=tier
+    )
     logger.info("Text anonymization completed")
     return anonymize_result
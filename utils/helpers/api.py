@@ -1,23 +1,22 @@
 import http.client
 import json
 import os
-import pickle
 import time
 from io import BytesIO
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import pandas as pd
-import requests
 import streamlit as st
 from jinja2 import Environment, FileSystemLoader
 from PIL import Image
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
+from utils.helpers.cache import content_hash, get_response_cache
+from utils.helpers.http_client import api_request
 from utils.helpers.logger import logger
 from utils.helpers.transform import df_to_items, format_ziffer_to_4digits
 
 DEPLOYMENT_ENV = os.getenv("DEPLOYMENT_ENV", "local")
-USE_CACHE = os.getenv("USE_CACHE", "true").lower() == "true"
 
 
 def check_if_default_credentials() -> None:
@@ -35,6 +34,16 @@ def check_if_default_credentials() -> None:
         )
 
 
+def _cache_scope() -> Tuple[str, str]:
+    """
+    Identify the backend and account a cached response belongs to.
+
+    Returns:
+        Tuple[str, str]: The API URL and a hash of the API key, part of every response cache key.
+    """
+    return st.session_state.api_url, content_hash(st.session_state.api_key)
+
+
 def get_workflows() -> List[str]:
     """
     Retrieve the list of available workflows from the API for the user.
@@ -47,7 +56,7 @@ def get_workflows() -> List[str]:
     headers = {"x-api-key": st.session_state.api_key}
 
     try:
-        response = requests.get(url, headers=headers)
+        response = api_request("GET", url, "workflows", headers=headers)
         logger.info(
             f"Done retrieving workflows. Response status: {response.status_code}"
         )
@@ -84,7 +93,7 @@ def get_workflows() -> List[str]:
 def analyze_api_call(text: str) -> Optional[Dict]:
     """
     Analyze the given text using the API and return the prediction.
-    If a cached response exists in the data folder and the environment is 'development', return that instead.
+    If a cached response for the same content exists in the response cache, return that instead.
 
     Args:
         text (str): The text to be analyzed.
@@ -102,20 +111,23 @@ def analyze_api_call(text: str) -> Optional[Dict]:
             "No category selected. Please select a category before analyzing text."
         )
 
-    data_folder = os.path.join(os.path.dirname(__file__), "data")
-    os.makedirs(data_folder, exist_ok=True)
-    safe_filename = os.path.join(data_folder, f"{hash(text[100:120])}_response.pkl")
+    cache = get_response_cache()
+    cache_key = content_hash(
+        "predict",
+        *_cache_scope(),
+        text,
+        st.session_state.category,
+        st.session_state.arzt_hash,
+        st.session_state.kassenname_hash,
+    )
 
-    if USE_CACHE and os.path.exists(safe_filename):
-        logger.info(f"Using cached response from {safe_filename}")
-        try:
-            with open(safe_filename, "rb") as file:
-                cached_response = pickle.load(file)
-            response = cached_response["response"]
-            st.session_state.analyze_api_response = response
+    if cache is not None:
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            logger.info(f"Using cached analyze response ({cache.stats()})")
+            st.session_state.analyze_api_response = None
+            st.session_state.analyze_request_id = cached_response["request_id"]
             return cached_response["prediction"]
-        except Exception as e:
-            logger.error(f"Error loading cached response: {e}")
 
     url = f"{st.session_state.api_url}/process_document"
     payload = {
@@ -133,7 +145,14 @@ def analyze_api_call(text: str) -> Optional[Dict]:
     headers = {"x-api-key": st.session_state.api_key}
 
     try:
-        response = requests.post(url, headers=headers, data=payload)
+        response = api_request(
+            "POST",
+            url,
+            "process_document",
+            compress=True,
+            headers=headers,
+            data=payload,
+        )
         logger.info(f"Done analyzing text. Response status: {response.status_code}")
     except Exception as e:
         logger.error(f"Error calling API for text analysis: {e}")
@@ -174,20 +193,25 @@ def analyze_api_call(text: str) -> Optional[Dict]:
         return None
 
     st.session_state.analyze_api_response = response
+    st.session_state.analyze_request_id = response.headers.get("X-Request-ID", None)
 
     try:
         prediction = response.json()["result"]["prediction"]
     except KeyError:
         prediction = response.json()["prediction"]
 
-    if USE_CACHE:
-        cached_response = {"response": response, "prediction": prediction}
+    if cache is not None:
         try:
-            with open(safe_filename, "wb") as file:
-                pickle.dump(cached_response, file)
-            logger.info(f"Response saved to {safe_filename}")
+            cache.set(
+                cache_key,
+                {
+                    "prediction": prediction,
+                    "request_id": st.session_state.analyze_request_id,
+                },
+            )
+            logger.info("Analyze response saved to cache")
         except Exception as e:
-            logger.error(f"Error saving response to file: {e}")
+            logger.error(f"Error saving analyze response to cache: {e}")
 
     return prediction
 
@@ -195,7 +219,7 @@ def analyze_api_call(text: str) -> Optional[Dict]:
 def ocr_pdf_to_text_api(file: Union[Image.Image, UploadedFile]) -> Optional[str]:
     """
     Perform OCR on the given file using the API and return the extracted text.
-    If a cached response exists in the data folder and the environment is 'development', return that instead.
+    If a cached response for the same content exists in the response cache, return that instead.
 
     Args:
         file (Union[Image.Image, UploadedFile]): The file to be processed.
@@ -213,21 +237,6 @@ def ocr_pdf_to_text_api(file: Union[Image.Image, UploadedFile]) -> Optional[str]
             "No category selected. Please select a category before analyzing text."
         )
 
-    data_folder = os.path.join(os.path.dirname(__file__), "data")
-    os.makedirs(data_folder, exist_ok=True)
-    safe_filename = os.path.join(
-        data_folder, f"{hash(file.name + st.session_state.category)}_ocr_response.pkl"
-    )
-
-    if USE_CACHE and os.path.exists(safe_filename):
-        logger.info(f"Using cached OCR response from {safe_filename}")
-        try:
-            with open(safe_filename, "rb") as file:
-                cached_response = pickle.load(file)
-            return cached_response["ocr_text"]
-        except Exception as e:
-            logger.error(f"Error loading cached OCR response: {e}")
-
     url = f"{st.session_state.api_url}/process_document"
     payload = {
         "ocr_processor": "google_document_ai",
@@ -248,10 +257,24 @@ def ocr_pdf_to_text_api(file: Union[Image.Image, UploadedFile]) -> Optional[str]
         file_name = file.name
         mime_type = file.type or "application/octet-stream"
 
+    # Key on the file content, not its name, and the backend it was sent to
+    cache = get_response_cache()
+    cache_key = content_hash(
+        "ocr", *_cache_scope(), file_bytes, st.session_state.category
+    )
+
+    if cache is not None:
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            logger.info(f"Using cached OCR response ({cache.stats()})")
+            return cached_response["ocr_text"]
+
     files = {"file": (file_name, file_bytes, mime_type)}
 
     try:
-        response = requests.post(url, headers=headers, data=payload, files=files)
+        response = api_request(
+            "POST", url, "ocr", headers=headers, data=payload, files=files
+        )
     except Exception as e:
         logger.error(f"Error calling API for OCR: {e}")
         st.error(
@@ -300,14 +323,12 @@ def ocr_pdf_to_text_api(file: Union[Image.Image, UploadedFile]) -> Optional[str]
     except KeyError:
         ocr_text = response.json()["ocr"]["ocr_text"]
 
-    if USE_CACHE:
-        cached_response = {"ocr_text": ocr_text}
+    if cache is not None:
         try:
-            with open(safe_filename, "wb") as file:
-                pickle.dump(cached_response, file)
-            logger.info(f"OCR response saved to {safe_filename}")
+            cache.set(cache_key, {"ocr_text": ocr_text})
+            logger.info("OCR response saved to cache")
         except Exception as e:
-            logger.error(f"Error saving OCR response to file: {e}")
+            logger.error(f"Error saving OCR response to cache: {e}")
 
     return ocr_text
 
@@ -318,8 +339,7 @@ def send_feedback_api(response_object: Dict) -> None:
     Args:
         response_object (Dict): The response object from the API.
     """
-    analyze_api_call_response = st.session_state.analyze_api_response
-    api_request_id = analyze_api_call_response.headers.get("X-Request-ID", None)
+    api_request_id = st.session_state.get("analyze_request_id")
     if api_request_id:
         url = f"{st.session_state.api_url}/feedback/{api_request_id}"
         payload = json.dumps(response_object, indent=4)  # Convert dict to JSON string
@@ -328,7 +348,9 @@ def send_feedback_api(response_object: Dict) -> None:
             "Content-Type": "application/json",  # Specify content type as JSON
         }
         try:
-            response = requests.post(url, headers=headers, data=payload)
+            response = api_request(
+                "POST", url, "feedback", headers=headers, data=payload
+            )
             logger.info(f"Feedback sent. Response status: {response.status_code}")
             if response.status_code != 200:
                 logger.error(f"API Feedback error: {response.text}")
@@ -477,7 +499,7 @@ def test_api() -> bool:
     headers = {"x-api-key": st.session_state.api_key}
 
     try:
-        response = requests.get(url, headers=headers)
+        response = api_request("GET", url, "test", headers=headers)
         if response.status_code == 401:
             logger.error("API authentication failed: Incorrect API key")
             st.error(
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Union
+
+from utils.helpers.logger import logger
+
+USE_CACHE = os.getenv("USE_CACHE", "true").lower() == "true"
+API_CACHE_DIR = os.getenv(
+    "API_CACHE_DIR", os.path.join(os.path.dirname(__file__), "data", "api_cache")
+)
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "500"))
+API_CACHE_MAX_BYTES = int(os.getenv("API_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+API_CACHE_TTL_SECONDS = int(os.getenv("API_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+def content_hash(*parts: Optional[Union[str, bytes]]) -> str:
+    """
+    Build a SHA-256 cache key from the full content of all parts.
+
+    Each part is length-prefixed, so different splits of the same bytes
+    produce different keys. None parts are encoded distinctly from empty strings.
+
+    Args:
+        *parts (Optional[Union[str, bytes]]): Texts, file contents or identifiers.
+
+    Returns:
+        str: The hex digest of the key.
+    """
+    sha256 = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            sha256.update(b"\x00none")
+            continue
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        sha256.update(len(data).to_bytes(8, byteorder="big"))
+        sha256.update(data)
+    return sha256.hexdigest()
+
+
+class ResponseCache:
+    """
+    Bounded on-disk cache for JSON payloads of API responses.
+
+    Entries are stored as one JSON file per key and written atomically, so
+    several worker processes can share the same directory. The file modification
+    time tracks the last access and is used for LRU eviction once the number of
+    entries or their total size exceeds the limits.
+    """
+
+    def __init__(
+        self,
+        directory: str = API_CACHE_DIR,
+        max_entries: int = API_CACHE_MAX_ENTRIES,
+        max_bytes: int = API_CACHE_MAX_BYTES,
+        ttl_seconds: int = API_CACHE_TTL_SECONDS,
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _count(self, stat: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[stat] += amount
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached payload for a key.
+
+        Args:
+            key (str): The cache key, see content_hash.
+
+        Returns:
+            Optional[Dict[str, Any]]: The payload, or None on a miss or an expired entry.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading cache entry {key}: {e}")
+            self._remove(path)
+            self._count("misses")
+            return None
+
+        if entry.get("expires_at") is not None and entry["expires_at"] < time.time():
+            self._remove(path)
+            self._count("expired")
+            self._count("misses")
+            return None
+
+        # Mark the entry as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self._count("hits")
+        return entry["payload"]
+
+    def set(
+        self, key: str, payload: Dict[str, Any], ttl_seconds: Optional[int] = None
+    ) -> None:
+        """
+        Store a JSON-serializable payload under a key.
+
+        Args:
+            key (str): The cache key, see content_hash.
+            payload (Dict[str, Any]): The payload to store.
+            ttl_seconds (Optional[int]): Overrides the default time to live. Values <= 0
+                store the entry without expiry.
+        """
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = time.time()
+        entry = {
+            "created_at": now,
+            "expires_at": now + ttl_seconds if ttl_seconds > 0 else None,
+            "payload": payload,
+        }
+
+        # Write to a temporary file first so readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        self._evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache is within its limits."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        entries.sort()
+        evicted = 0
+        while entries and (
+            len(entries) > self.max_entries or total_bytes > self.max_bytes
+        ):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total_bytes -= size
+            evicted += 1
+
+        if evicted:
+            self._count("evictions", evicted)
+            logger.info(f"Evicted {evicted} entries from the API response cache")
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Return hit/miss counters of this process and the hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide API response cache, or None if caching is disabled."""
+    global _response_cache
+    if not USE_CACHE:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
@@ -1,28 +1,20 @@
 import concurrent.futures
-import hashlib
 import io
 import os
-import threading
-from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Union
 
 import streamlit as st
-from pdf2image import convert_from_bytes
 from PIL import Image, ImageDraw, ImageFont
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 from streamlit_drawable_canvas import st_canvas
 
 from utils.helpers.logger import logger
-
-# Add a thread-safe cache for converted pages
-page_conversion_lock = threading.Lock()
-converted_pages_cache = {}
-
-
-@lru_cache(maxsize=32)
-def _convert_pdf_page(file_content: bytes, page_num: int) -> Image.Image:
-    """Convert a single PDF page to image with caching."""
-    return convert_from_bytes(file_content)[page_num]
+from utils.helpers.pdf_render import (
+    clear_render_cache,
+    compute_file_hash,
+    get_page_count,
+    render_page,
+)
 
 
 def parallel_convert_pages(
@@ -30,16 +22,11 @@ def parallel_convert_pages(
 ) -> Dict[int, Image.Image]:
     """Convert multiple PDF pages in parallel."""
     converted_pages = {}
+    file_hash = compute_file_hash(file_content)
 
     def convert_single_page(page_num: int) -> Tuple[int, Image.Image]:
         try:
-            with page_conversion_lock:
-                if page_num in converted_pages_cache:
-                    return page_num, converted_pages_cache[page_num]
-
-                page_image = _convert_pdf_page(file_content, page_num)
-                converted_pages_cache[page_num] = page_image
-                return page_num, page_image
+            return page_num, render_page(file_content, page_num, file_hash=file_hash)
         except Exception as e:
             logger.error(f"Error converting page {page_num}: {e}")
             return page_num, None
@@ -65,13 +52,9 @@ def load_image(
     """Load image from file content, with error handling."""
     try:
         if file_type == "application/pdf":
-            with page_conversion_lock:
-                if page_number in converted_pages_cache:
-                    return converted_pages_cache[page_number]
-
-                page_image = _convert_pdf_page(file_content, page_number)
-                converted_pages_cache[page_number] = page_image
-                return page_image
+            return render_page(
+                file_content, page_number, file_hash=st.session_state.get("file_hash")
+            )
         elif file_type.startswith("image"):
             return Image.open(io.BytesIO(file_content))
         else:
@@ -201,7 +184,7 @@ def initialize_file_state(uploaded_file: UploadedFile) -> None:
     if "file_content" not in st.session_state or "file_hash" not in st.session_state:
         uploaded_file.seek(0)
         file_content = uploaded_file.read()
-        file_hash = hashlib.md5(file_content).hexdigest()
+        file_hash = compute_file_hash(file_content)
         st.session_state["file_content"] = file_content
         st.session_state["file_hash"] = file_hash
 
@@ -264,12 +247,9 @@ def create_canvas(
 
 def cleanup_session_state() -> None:
     """Clean up file-related session state variables."""
-    # Clear the module-level cache
-    global converted_pages_cache
-    converted_pages_cache.clear()
-
-    # Also clear the LRU cache for _convert_pdf_page
-    _convert_pdf_page.cache_clear()
+    # Drop the rendered pages of the current file from the shared render cache
+    if "file_hash" in st.session_state:
+        clear_render_cache(st.session_state["file_hash"])
 
     keys_to_delete = [
         "file_content",
@@ -318,7 +298,13 @@ def base_display_file_selection_interface(
     control_column = layout_columns[0] if layout_columns else st
 
     try:
-        num_pages = len(convert_from_bytes(st.session_state.file_content))
+        # Read the page count from the PDF structure instead of rendering every page
+        if uploaded_file.type == "application/pdf":
+            num_pages = get_page_count(
+                st.session_state.file_content, st.session_state.file_hash
+            )
+        else:
+            num_pages = 1
         use_page_selector = num_pages > PAGES_PER_VIEW * 3  # More than 18 pages
         use_pagination = num_pages > PAGES_PER_VIEW  # More than 6 pages
 
@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -50,6 +51,7 @@ def read_in_goa(
         [
             "GOÄZiffer",
             "Beschreibung",
+            "Punktzahl",
             "Einfachfaktor",
             "Einfachsatz",
             "Regelhöchstfaktor",
@@ -125,17 +127,169 @@ def get_goa_description(goa_number: str, goa_df: Optional[pd.DataFrame] = None)
         logger.error(f"Invalid GOA number type: {type(goa_number)}")
         raise ValueError("GOA number must be a string")
 
-    if goa_df is None:
-        logger.info("Loading GOA data")
-        goa_df = read_in_goa()
-
     logger.info(f"Looking up description for GOA number: {goa_number}")
-    matching_row = goa_df[goa_df["GOÄZiffer"] == goa_number]
+    if goa_df is None:
+        description = get_goa_catalog().get_description(goa_number)
+    else:
+        matching_row = goa_df[goa_df["GOÄZiffer"] == goa_number]
+        description = (
+            None if matching_row.empty else matching_row.iloc[0]["Beschreibung"]
+        )
 
-    if matching_row.empty:
+    if description is None:
         logger.warning(f"No description found for GOA number: {goa_number}")
         return f"No description found for GOA number: {goa_number}"
 
-    description = matching_row.iloc[0]["Beschreibung"]
     logger.info(f"Description found for GOA number {goa_number}")
     return description
+
+
+# Faktor columns of the GOÄ and the Satz column each one prices
+FAKTOR_COLUMNS = ["Einfachfaktor", "Regelhöchstfaktor", "Höchstfaktor"]
+SATZ_COLUMNS = ["Einfachsatz", "Regelhöchstsatz", "Höchstsatz"]
+
+# Satz used if the Faktor matches none of the Faktor columns (Regelhöchstsatz)
+DEFAULT_SATZ_INDEX = 1
+
+
+class GoaCatalog:
+    """
+    GOÄ catalog with hash indexes on the Ziffern and precomputed Satz/Faktor arrays.
+
+    Built once per process by get_goa_catalog(). Lookups are dictionary accesses
+    instead of boolean masks over the whole catalog, and price_table() prices a
+    complete result table in one call.
+    """
+
+    def __init__(self, goa: pd.DataFrame, num_base_entries: int):
+        """
+        Args:
+            goa (pd.DataFrame): The processed GOÄ data from read_in_goa(), the
+                generated " A" analog entries appended after the catalog entries.
+            num_base_entries (int): Number of entries in the GOÄ file, entries at
+                later positions are generated analog entries.
+        """
+        self.frame = goa.reset_index(drop=True)
+        self.num_base_entries = num_base_entries
+
+        # First occurrence wins, like the former .values[0] lookups
+        self._goa_ziffer_index: Dict[str, int] = {}
+        for position, goa_ziffer in enumerate(self.frame["GOÄZiffer"]):
+            self._goa_ziffer_index.setdefault(goa_ziffer, position)
+        self._ziffer_index: Dict[str, int] = {}
+        for position, ziffer in enumerate(self.frame["ziffer"]):
+            self._ziffer_index.setdefault(ziffer, position)
+
+        self.beschreibung = self.frame["Beschreibung"].to_numpy(dtype=object)
+        self.punktzahl = self.frame["Punktzahl"].to_numpy(dtype=object)
+        self.einfachsatz = self.frame["Einfachsatz"].to_numpy(dtype=float)
+        # Faktoren are compared with one decimal, like the factors entered in the app
+        self.faktoren = np.round(self.frame[FAKTOR_COLUMNS].to_numpy(dtype=float), 1)
+        self.saetze = self.frame[SATZ_COLUMNS].to_numpy(dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, goa_ziffer: str) -> bool:
+        return goa_ziffer in self._goa_ziffer_index
+
+    def position(self, goa_ziffer: str) -> Optional[int]:
+        """Return the row position of a GOÄZiffer, or None if it is unknown."""
+        return self._goa_ziffer_index.get(goa_ziffer)
+
+    def get_description(self, goa_ziffer: str) -> Optional[str]:
+        """Return the Beschreibung of a GOÄZiffer, or None if it is unknown."""
+        position = self.position(goa_ziffer)
+        return None if position is None else self.beschreibung[position]
+
+    def get_item(self, ziffer: str) -> pd.DataFrame:
+        """
+        Return the catalog row of a ziffer as a one-row DataFrame.
+
+        Args:
+            ziffer (str): The value of the "ziffer" column.
+
+        Returns:
+            pd.DataFrame: The matching row, or an empty DataFrame if the ziffer is unknown.
+        """
+        position = self._ziffer_index.get(ziffer)
+        if position is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[position : position + 1]
+
+    def einzelbetrag(self, goa_ziffer: str, faktor: float) -> float:
+        """Return Einfachsatz * faktor for a GOÄZiffer, or 0.0 if it is unknown."""
+        position = self.position(goa_ziffer)
+        if position is None:
+            return 0.0
+        return self.einfachsatz[position] * faktor
+
+    def _resolve(self, ziffer: str) -> Tuple[int, bool]:
+        """
+        Find the catalog entry pricing a ziffer.
+
+        Analog ziffern are priced with the entry of the original ziffer.
+
+        Returns:
+            Tuple[int, bool]: The position (-1 if not found) and whether the ziffer
+                was resolved as analog ziffer.
+        """
+        position = self._goa_ziffer_index.get(ziffer)
+        if position is not None and position < self.num_base_entries:
+            return position, False
+        position = self._goa_ziffer_index.get(ziffer.replace(" A", ""))
+        if position is None or position >= self.num_base_entries:
+            return -1, True
+        return position, True
+
+    def price_table(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Price all rows of a result table in one call.
+
+        The Satz of the Faktor column matching the row's faktor is used as price,
+        the Regelhöchstsatz if no Faktor column matches.
+
+        Args:
+            df (pd.DataFrame): Result table with the columns "ziffer", "faktor" and "anzahl".
+
+        Returns:
+            pd.DataFrame: One row per input row (same index) with the columns "found",
+                "analog_ziffer", "Punktzahl", "preis" and "total".
+        """
+        resolved = [self._resolve(str(ziffer)) for ziffer in df["ziffer"]]
+        positions = np.array([position for position, _ in resolved], dtype=int)
+        found = positions >= 0
+        safe_positions = np.where(found, positions, 0)
+
+        faktor = np.round(df["faktor"].to_numpy(dtype=float), 1)
+        matches = self.faktoren[safe_positions] == faktor[:, None]
+        satz_index = np.where(
+            matches.any(axis=1), matches.argmax(axis=1), DEFAULT_SATZ_INDEX
+        )
+        preis = self.saetze[safe_positions, satz_index]
+
+        return pd.DataFrame(
+            {
+                "found": found,
+                "analog_ziffer": [analog for _, analog in resolved],
+                "Punktzahl": self.punktzahl[safe_positions],
+                "preis": preis,
+                "total": preis * df["anzahl"].to_numpy(dtype=float).astype(int),
+            },
+            index=df.index,
+        )
+
+
+@st.cache_resource
+def get_goa_catalog(path: str = "./data/GOA_Ziffern.csv") -> GoaCatalog:
+    """
+    Return the process-wide GOÄ catalog.
+
+    Args:
+        path (str): The file path to the GOA CSV file. Defaults to "./data/GOA_Ziffern.csv".
+
+    Returns:
+        GoaCatalog: The indexed catalog, including the generated analog entries.
+    """
+    logger.info("Building indexed GOA catalog")
+    return GoaCatalog(read_in_goa(path), len(read_in_goa(path, fully=True)))
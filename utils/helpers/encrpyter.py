@@ -1,6 +1,5 @@
 import hashlib
 import os
-import zipfile
 
 from cryptography import x509
 from cryptography.hazmat.backends import default_backend
@@ -11,27 +10,11 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from utils.helpers.logger import logger
 
 
-def calculate_sha1(filename):
-    sha1 = hashlib.sha1()
-    with open(filename, "rb") as f:
-        while True:
-            data = f.read(65536)  # Read in 64kb chunks
-            if not data:
-                break
-            sha1.update(data)
-    return sha1.hexdigest()
+def calculate_sha1_bytes(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
 
 
-def compress_files(files, output_zip):
-    with zipfile.ZipFile(output_zip, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for file in files:
-            zipf.write(file, os.path.basename(file))
-
-
-def encrypt_file(input_file, output_file, public_key):
-    with open(input_file, "rb") as f:
-        data = f.read()
-
+def encrypt_bytes(data: bytes, public_key) -> bytes:
     # Generate a random AES key
     aes_key = os.urandom(32)
 
@@ -53,12 +36,12 @@ def encrypt_file(input_file, output_file, public_key):
     encryptor = cipher.encryptor()
     encrypted_data = encryptor.update(data) + encryptor.finalize()
 
-    # Write the encrypted data to the output file
-    with open(output_file, "wb") as f:
-        f.write(len(encrypted_key).to_bytes(4, byteorder="big"))
-        f.write(encrypted_key)
-        f.write(iv)
-        f.write(encrypted_data)
+    return (
+        len(encrypted_key).to_bytes(4, byteorder="big")
+        + encrypted_key
+        + iv
+        + encrypted_data
+    )
 
 
 def load_private_key(serial_number: str = None):
@@ -89,33 +72,28 @@ def load_public_key(serial_number: str = None):
         raise
 
 
-def decrypt_file(input_file, output_file, private_key):
-    with open(input_file, "rb") as f:
-        # Read the encrypted key length
-        key_length = int.from_bytes(f.read(4), byteorder="big")
-
-        # Read and decrypt the AES key
-        encrypted_key = f.read(key_length)
-        aes_key = private_key.decrypt(
-            encrypted_key,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None,
-            ),
-        )
+def decrypt_bytes(data: bytes, private_key) -> bytes:
+    # Read the encrypted key length
+    key_length = int.from_bytes(data[:4], byteorder="big")
 
-        # Read the IV
-        iv = f.read(16)
+    # Read and decrypt the AES key
+    encrypted_key = data[4 : 4 + key_length]
+    aes_key = private_key.decrypt(
+        encrypted_key,
+        padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),
+            algorithm=hashes.SHA256(),
+            label=None,
+        ),
+    )
+
+    # Read the IV
+    iv = data[4 + key_length : 4 + key_length + 16]
 
-        # Read the encrypted data
-        encrypted_data = f.read()
+    # Read the encrypted data
+    encrypted_data = data[4 + key_length + 16 :]
 
     # Decrypt the data with AES
     cipher = Cipher(algorithms.AES(aes_key), modes.CFB(iv), backend=default_backend())
     decryptor = cipher.decryptor()
-    decrypted_data = decryptor.update(encrypted_data) + decryptor.finalize()
-
-    # Write the decrypted data to the output file
-    with open(output_file, "wb") as f:
-        f.write(decrypted_data)
+    return decryptor.update(encrypted_data) + decryptor.finalize()
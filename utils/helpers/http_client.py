@@ -0,0 +1,139 @@
+import gzip
+import os
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.helpers.logger import logger
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "5"))
+
+# Read timeouts per endpoint in seconds, analysis and OCR can take minutes
+ENDPOINT_READ_TIMEOUTS: Dict[str, float] = {
+    "workflows": 30,
+    "process_document": 300,
+    "ocr": 300,
+    "feedback": 30,
+    "test": 15,
+    "warmup": 10,
+}
+DEFAULT_READ_TIMEOUT = 60
+
+# Compress request bodies above this size if API_GZIP_REQUESTS is enabled
+API_GZIP_REQUESTS = os.getenv("API_GZIP_REQUESTS", "false").lower() == "true"
+API_GZIP_MIN_BYTES = int(os.getenv("API_GZIP_MIN_BYTES", str(32 * 1024)))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session.
+
+    The session keeps connections to the API alive in a connection pool, so
+    consecutive calls do not repeat the TCP and TLS handshake.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def get_timeout(endpoint: str) -> Tuple[float, float]:
+    """Return the (connect, read) timeout for an endpoint."""
+    return API_CONNECT_TIMEOUT, ENDPOINT_READ_TIMEOUTS.get(
+        endpoint, DEFAULT_READ_TIMEOUT
+    )
+
+
+def _gzip_form_body(
+    data: Dict[str, str], headers: Dict[str, str]
+) -> Tuple[Optional[bytes], Dict[str, str]]:
+    """
+    Encode form data and gzip it if it is large enough.
+
+    Returns:
+        Tuple[Optional[bytes], Dict[str, str]]: The compressed body and updated headers,
+            or (None, headers) if the body should be sent uncompressed.
+    """
+    body = urlencode(data).encode("utf-8")
+    if len(body) < API_GZIP_MIN_BYTES:
+        return None, headers
+    headers = {
+        **headers,
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Content-Encoding": "gzip",
+    }
+    return gzip.compress(body, compresslevel=5), headers
+
+
+def api_request(
+    method: str, url: str, endpoint: str, compress: bool = False, **kwargs
+) -> requests.Response:
+    """
+    Send a request through the pooled session with the endpoint's timeouts.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The request URL.
+        endpoint (str): Endpoint name used to select the timeouts, see ENDPOINT_READ_TIMEOUTS.
+        compress (bool): Gzip form data bodies if API_GZIP_REQUESTS is enabled and the
+            body exceeds API_GZIP_MIN_BYTES.
+        **kwargs: Passed on to requests.Session.request.
+
+    Returns:
+        requests.Response: The response.
+    """
+    kwargs.setdefault("timeout", get_timeout(endpoint))
+
+    if (
+        compress
+        and API_GZIP_REQUESTS
+        and isinstance(kwargs.get("data"), dict)
+        and "files" not in kwargs
+    ):
+        body, headers = _gzip_form_body(kwargs["data"], kwargs.get("headers") or {})
+        if body is not None:
+            kwargs["data"] = body
+            kwargs["headers"] = headers
+
+    return get_session().request(method, url, **kwargs)
+
+
+def warm_up_connection(url: str) -> None:
+    """
+    Open a pooled connection to the API in the background.
+
+    The TLS handshake is done before the first real request, which can then
+    reuse the kept-alive connection.
+
+    Args:
+        url (str): The API base URL.
+    """
+
+    def _warm_up() -> None:
+        try:
+            response = api_request("HEAD", url, "warmup", allow_redirects=False)
+            logger.info(
+                f"API connection warmed up. Response status: {response.status_code}"
+            )
+        except Exception as e:
+            logger.warning(f"API connection warm-up failed: {e}")
+
+    if not url or not url.startswith(("http://", "https://")):
+        return
+
+    threading.Thread(target=_warm_up, name="api-connection-warmup", daemon=True).start()
@@ -1,6 +1,8 @@
 import logging
 import os
 import sys
+import threading
+from collections import deque
 from typing import Optional, Tuple
 
 from dotenv import load_dotenv
@@ -11,10 +13,13 @@ from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.trace import get_current_span
 
-from utils.helpers.otlp_connection import check_otlp_connection
+from utils.helpers.otlp_connection import get_otlp_connection
 
 load_dotenv()
 
+# Records kept in memory while the OTLP exporter is being set up
+OTLP_BUFFER_SIZE = int(os.getenv("OTLP_BUFFER_SIZE", "1000"))
+
 
 class OTELCompatibleLogHandler(LoggingHandler):
     """Logging handler that ensures OpenTelemetry compatibility"""
@@ -37,11 +42,46 @@ class OTELCompatibleLogHandler(LoggingHandler):
             self.handleError(record)
 
 
+class BufferedOTLPHandler(logging.Handler):
+    """
+    Logging handler that buffers records until the OTLP handler is ready.
+
+    Once a target handler is set, the buffered records are forwarded in order
+    and new records go straight to the target. If OTLP is unavailable, the
+    buffer is dropped and records are discarded.
+    """
+
+    def __init__(self, level: int = logging.NOTSET, capacity: int = OTLP_BUFFER_SIZE):
+        super().__init__(level)
+        self._buffer = deque(maxlen=capacity)
+        self._target: Optional[logging.Handler] = None
+        self._disabled = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._target is not None:
+            self._target.handle(record)
+        elif not self._disabled:
+            self._buffer.append(record)
+
+    def set_target(self, target: logging.Handler) -> None:
+        """Forward the buffered records to target and send all further records there."""
+        with self.lock:
+            while self._buffer:
+                target.handle(self._buffer.popleft())
+            self._target = target
+
+    def disable(self) -> None:
+        """Drop the buffered records and discard all further records."""
+        with self.lock:
+            self._disabled = True
+            self._buffer.clear()
+
+
 def initialize_otlp_logging() -> Tuple[Optional[LoggerProvider], bool]:
     """Initialize OTLP logging and return (provider, success)"""
     otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
 
-    success, formatted_endpoint = check_otlp_connection(otlp_endpoint)
+    success, formatted_endpoint = get_otlp_connection(otlp_endpoint)
     if not success:
         logging.warning("OTLP endpoint not accessible, skipping OTLP initialization")
         return None, False
@@ -65,6 +105,23 @@ def initialize_otlp_logging() -> Tuple[Optional[LoggerProvider], bool]:
         return None, False
 
 
+def _attach_otlp_handler(
+    logger: logging.Logger,
+    buffered_handler: BufferedOTLPHandler,
+    level: int,
+    formatter: logging.Formatter,
+) -> None:
+    """Initialize OTLP logging and hand the buffered records over to it."""
+    log_provider, otlp_enabled = initialize_otlp_logging()
+    if otlp_enabled and log_provider is not None:
+        otel_handler = OTELCompatibleLogHandler(level=level)
+        otel_handler.setFormatter(formatter)
+        buffered_handler.set_target(otel_handler)
+    else:
+        buffered_handler.disable()
+        logger.warning("OTLP logging initialization failed")
+
+
 def setup_logger(
     name: str = "qodia_koodierungstool",
     level: int = logging.INFO,
@@ -112,14 +169,16 @@ def setup_logger(
             file_handler.setFormatter(formatter)
             logger.addHandler(file_handler)
 
-        # Initialize OTLP logging
-        log_provider, otlp_enabled = initialize_otlp_logging()
-        if otlp_enabled and log_provider is not None:
-            otel_handler = OTELCompatibleLogHandler(level=level)
-            otel_handler.setFormatter(formatter)
-            logger.addHandler(otel_handler)
-        else:
-            logger.warning("OTLP logging initialization failed")
+        # Initialize OTLP logging in the background, a slow or missing collector
+        # must not delay startup. Records are buffered until it is ready.
+        buffered_handler = BufferedOTLPHandler(level=level)
+        logger.addHandler(buffered_handler)
+        threading.Thread(
+            target=_attach_otlp_handler,
+            args=(logger, buffered_handler, level, formatter),
+            name="otlp-logging-init",
+            daemon=True,
+        ).start()
 
     return logger
 
@@ -0,0 +1,228 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.helpers.logger import logger
+
+# Coalesce the sentences of concurrent anonymizations into shared forward passes
+NER_SERVICE_ENABLED = os.getenv("NER_SERVICE_ENABLED", "true").lower() == "true"
+
+# How long the service waits for more requests after the first one arrived
+NER_BATCH_WINDOW_MS = float(os.getenv("NER_BATCH_WINDOW_MS", "20"))
+
+# Sentences per forward pass at most, further requests wait for the next pass
+NER_MAX_BATCH_SENTENCES = int(os.getenv("NER_MAX_BATCH_SENTENCES", "256"))
+
+# Number of recent batches and requests kept for the percentiles
+METRICS_WINDOW = 1000
+
+Entities = List[List[Dict[str, Any]]]
+Request = Tuple[List[str], Optional[str], "Future[Entities]", float]
+
+
+class NerInferenceService:
+    """
+    Micro-batching front of the NER model, shared by all sessions of the process.
+
+    Callers submit the sentences of a document and block until they are
+    tagged. A single worker thread collects the requests arriving within
+    NER_BATCH_WINDOW_MS of each other, tags all their sentences in one model
+    call and routes the entities back to each caller. The CPU model then runs
+    a few large batches instead of many small ones back to back.
+    """
+
+    def __init__(
+        self,
+        tag: Callable[[List[str], Optional[str]], Entities],
+        window_ms: float = NER_BATCH_WINDOW_MS,
+        max_batch: int = NER_MAX_BATCH_SENTENCES,
+    ):
+        self._tag = tag
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self._requests: "queue.Queue[Optional[Request]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending_sentences = 0
+        self._batches = 0
+        self._requests_served = 0
+        self._sentences = 0
+        self._busy_seconds = 0.0
+        self._batch_sizes = deque(maxlen=METRICS_WINDOW)
+        self._latencies = deque(maxlen=METRICS_WINDOW)
+        self._worker = threading.Thread(
+            target=self._serve, name="ner-service", daemon=True
+        )
+        self._worker.start()
+
+    def tag(self, sentences: List[str], tier: Optional[str] = None) -> Entities:
+        """
+        Tag sentences together with the requests of other sessions.
+
+        Args:
+            sentences (List[str]): The sentences to tag.
+            tier (Optional[str]): The model tier. Only requests of the same tier share a
+                model call.
+
+        Returns:
+            Entities: Per sentence the detected entities, see anonymization.tag_sentences.
+
+        Raises:
+            Exception: The error of the model call that contained the sentences.
+        """
+        if not sentences:
+            return []
+        future: "Future[Entities]" = Future()
+        with self._lock:
+            self._pending_sentences += len(sentences)
+        self._requests.put((sentences, tier, future, time.perf_counter()))
+        return future.result()
+
+    def _collect(self, first: Request) -> Tuple[List[Request], bool]:
+        """Gather the requests arriving within the batch window after the first one."""
+        batch = [first]
+        size = len(first[0])
+        deadline = time.perf_counter() + self.window
+        while size < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+            size += len(request[0])
+        return batch, False
+
+    def _serve(self) -> None:
+        stopped = False
+        while not stopped:
+            first = self._requests.get()
+            if first is None:
+                break
+            batch = [first]
+            try:
+                batch, stopped = self._collect(first)
+                with self._lock:
+                    self._pending_sentences -= sum(len(request[0]) for request in batch)
+
+                # Requests for different model tiers cannot share a forward pass
+                requests_per_tier: Dict[Optional[str], List[Request]] = {}
+                for request in batch:
+                    requests_per_tier.setdefault(request[1], []).append(request)
+                for tier, requests in requests_per_tier.items():
+                    self._run_batch(tier, requests)
+            except Exception as e:
+                # Keep serving, a dead worker would leave every caller waiting forever
+                logger.error(f"NER service failed to serve {len(batch)} requests: {e}")
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _run_batch(self, tier: Optional[str], batch: List[Request]) -> None:
+        sentences = [sentence for request in batch for sentence in request[0]]
+        start = time.perf_counter()
+        try:
+            entities = self._tag(sentences, tier)
+        except Exception as e:
+            logger.error(f"NER batch of {len(sentences)} sentences failed: {e}")
+            for _, _, future, _ in batch:
+                future.set_exception(e)
+            return
+        finished = time.perf_counter()
+
+        offset = 0
+        for request_sentences, _, future, _ in batch:
+            future.set_result(entities[offset : offset + len(request_sentences)])
+            offset += len(request_sentences)
+
+        with self._lock:
+            self._batches += 1
+            self._requests_served += len(batch)
+            self._sentences += len(sentences)
+            self._busy_seconds += finished - start
+            self._batch_sizes.append(len(sentences))
+            self._latencies.extend(finished - request[3] for request in batch)
+        logger.debug(
+            f"NER batch: {len(batch)} requests, {len(sentences)} sentences, "
+            f"{1000 * (finished - start):.0f} ms"
+        )
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Return queue depth, batch sizes and request latency of the service.
+
+        Returns:
+            Dict[str, float]: Served batches, requests and sentences, the sentences waiting in
+                the queue, mean/max sentences per batch, requests per batch, the time spent in
+                the model and the request latency mean/p95/max in milliseconds.
+        """
+        with self._lock:
+            batch_sizes = list(self._batch_sizes)
+            latencies = sorted(self._latencies)
+            stats = {
+                "batches": self._batches,
+                "requests": self._requests_served,
+                "sentences": self._sentences,
+                "queue_depth": self._pending_sentences,
+                "model_seconds": self._busy_seconds,
+                "requests_per_batch": (
+                    self._requests_served / self._batches if self._batches else 0.0
+                ),
+            }
+
+        if batch_sizes:
+            stats["batch_size_mean"] = sum(batch_sizes) / len(batch_sizes)
+            stats["batch_size_max"] = max(batch_sizes)
+        if latencies:
+            stats["latency_mean_ms"] = 1000 * sum(latencies) / len(latencies)
+            stats["latency_p95_ms"] = 1000 * latencies[int(0.95 * (len(latencies) - 1))]
+            stats["latency_max_ms"] = 1000 * latencies[-1]
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop the worker after the requests already queued are served."""
+        self._requests.put(None)
+        self._worker.join()
+
+
+_service: Optional[NerInferenceService] = None
+_service_lock = threading.Lock()
+
+
+def get_ner_service() -> NerInferenceService:
+    """
+    Return the process-wide NER inference service, starting it on first use.
+
+    Returns:
+        NerInferenceService: The shared service.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from utils.helpers.anonymization import tag_sentences
+
+                _service = NerInferenceService(tag_sentences)
+                logger.info(
+                    f"NER service: {NER_BATCH_WINDOW_MS:g} ms batch window, "
+                    f"up to {_service.max_batch} sentences per batch"
+                )
+    return _service
+
+
+def get_ner_service_stats() -> Dict[str, float]:
+    """
+    Return the statistics of the NER inference service without starting it.
+
+    Returns:
+        Dict[str, float]: See NerInferenceService.get_stats, empty if the service is not running.
+    """
+    service = _service
+    return service.get_stats() if service is not None else {}
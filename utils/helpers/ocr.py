@@ -1,12 +1,120 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Optional, Union
+import bisect
+import io
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 
-import pytesseract
-from pdf2image import convert_from_bytes
 from PIL import Image
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
 from utils.helpers.logger import logger
+from utils.helpers.ocr_batch import OCR_BATCH_MODE, recognize_crops, words_to_text
+from utils.helpers.ocr_engine import OCR_ENGINE_POOL_SIZE, get_ocr_engine_pool
+from utils.helpers.ocr_preprocess import OCR_PREPROCESS, get_preprocess_stats
+from utils.helpers.ocr_scheduler import OCR_WORKER_MODE, recognize_crops_in_process
+from utils.helpers.pdf_render import (
+    compute_file_hash,
+    extract_region_words,
+    get_page_count,
+    render_region,
+)
+
+# Read the embedded text layer of PDF regions instead of running OCR on them
+OCR_USE_TEXT_LAYER = os.getenv("OCR_USE_TEXT_LAYER", "true").lower() == "true"
+
+# OCR workers consuming the rendered pages, one per pooled engine by default
+OCR_PIPELINE_WORKERS = int(os.getenv("OCR_PIPELINE_WORKERS", str(OCR_ENGINE_POOL_SIZE)))
+
+# Pages whose crops wait for OCR at most, bounds the memory of the pipeline
+OCR_PIPELINE_QUEUE_SIZE = int(os.getenv("OCR_PIPELINE_QUEUE_SIZE", "2"))
+
+# Maximum number of extracted regions kept for re-extraction (shared by all sessions)
+OCR_REGION_CACHE_SIZE = int(os.getenv("OCR_REGION_CACHE_SIZE", "4096"))
+
+# Source flags of extracted regions
+SOURCE_TEXT_LAYER = "text_layer"
+SOURCE_OCR = "ocr"
+
+_stats_lock = threading.Lock()
+_source_counts: Dict[str, int] = {SOURCE_TEXT_LAYER: 0, SOURCE_OCR: 0}
+_cached_regions = 0
+
+RegionKey = Tuple[str, int, Tuple[float, ...]]
+
+# Extracted text, source and words of a region
+CachedRegion = Tuple[str, str, List[Dict]]
+
+_region_cache_lock = threading.Lock()
+_region_cache: "OrderedDict[RegionKey, CachedRegion]" = OrderedDict()
+
+
+def _record_sources(regions: List[Dict]) -> None:
+    global _cached_regions
+    with _stats_lock:
+        for region in regions:
+            if region.get("cached"):
+                _cached_regions += 1
+            else:
+                _source_counts[region["source"]] += 1
+
+
+def get_region_source_stats() -> Dict[str, float]:
+    """
+    Return how many regions were read from the text layer and how many were OCR'd.
+
+    Returns:
+        Dict[str, float]: Counts per source, the text layer hit rate and the number
+            of regions reused from the region cache.
+    """
+    with _stats_lock:
+        stats = dict(_source_counts)
+        cached = _cached_regions
+    total = sum(stats.values())
+    stats["text_layer_hit_rate"] = stats[SOURCE_TEXT_LAYER] / total if total else 0.0
+    stats["cached"] = cached
+    return stats
+
+
+def _region_key(file_hash: str, page_index: int, selection: dict) -> RegionKey:
+    rect = tuple(round(selection[key], 6) for key in ("left", "top", "width", "height"))
+    return (file_hash, page_index, rect)
+
+
+def _get_cached_region(key: RegionKey) -> Optional[CachedRegion]:
+    with _region_cache_lock:
+        if key in _region_cache:
+            _region_cache.move_to_end(key)
+            return _region_cache[key]
+    return None
+
+
+def _cache_region(key: RegionKey, text: str, source: str, words: List[Dict]) -> None:
+    # Empty results are not cached, they may stem from a failed OCR call
+    if not text.strip():
+        return
+    with _region_cache_lock:
+        _region_cache[key] = (text, source, words)
+        _region_cache.move_to_end(key)
+        while len(_region_cache) > OCR_REGION_CACHE_SIZE:
+            _region_cache.popitem(last=False)
+
+
+def clear_region_cache(file_hash: Optional[str] = None) -> None:
+    """
+    Remove extracted regions from the cache.
+
+    Args:
+        file_hash (Optional[str]): Only remove regions of this file. Clears everything if None.
+    """
+    with _region_cache_lock:
+        if file_hash is None:
+            _region_cache.clear()
+            return
+        for key in [key for key in _region_cache if key[0] == file_hash]:
+            del _region_cache[key]
 
 
 def perform_ocr_on_file(
@@ -25,28 +133,58 @@ def perform_ocr_on_file(
     Returns:
         str: The extracted text from the file, with text from each selection separated by newlines.
 
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    return perform_ocr_with_layout(uploaded_file, selections)[0]
+
+
+def perform_ocr_with_layout(
+    uploaded_file: Union[Image.Image, UploadedFile],
+    selections: Optional[List[List[dict]]] = None,
+) -> Tuple[str, List[Dict]]:
+    """
+    Perform OCR on a PDF or image file and keep the position of every word.
+
+    The text is the same as returned by perform_ocr_on_file. The words locate
+    each character range of the text on its page, e.g. to redact detected
+    entities in the original file without running OCR again.
+
+    Args:
+        uploaded_file (Union[Image.Image, streamlit.runtime.uploaded_file_manager.UploadedFile]): The file to perform OCR on.
+        selections (Optional[List[List[dict]]]): List of pages, where each page contains a list of
+            selection dictionaries with normalized coordinates.
+
+    Returns:
+        Tuple[str, List[Dict]]: The extracted text and its words, each with 'text', 'page',
+            'bbox' (normalized (x0, y0, x1, y1) relative to the page), 'conf' and the
+            'start' and 'end' offsets of the word in the text.
+
     Raises:
         ValueError: If the file type is not supported.
     """
     logger.info(f"Starting OCR on file of type: {type(uploaded_file)}")
 
     if isinstance(uploaded_file, Image.Image):
-        return perform_ocr_on_image(
+        regions = _ocr_image_regions(
             uploaded_file, selections[0] if selections else None
         )
+        return _assemble_layout(regions)
 
     if not hasattr(uploaded_file, "type"):
         raise ValueError("Unsupported file type")
 
     if uploaded_file.type == "application/pdf":
-        return _process_pdf(uploaded_file, selections)
+        return _assemble_layout(_process_pdf(uploaded_file, selections))
     elif uploaded_file.type.startswith("image"):
-        return _process_image(uploaded_file, selections)
+        return _assemble_layout(_process_image(uploaded_file, selections))
     else:
         raise ValueError(f"Unsupported file type: {uploaded_file.type}")
 
 
-def _process_pdf(pdf_file: UploadedFile, selections: Optional[List[List[dict]]]) -> str:
+def _process_pdf(
+    pdf_file: UploadedFile, selections: Optional[List[List[dict]]]
+) -> List[Dict]:
     """
     Process a PDF file for OCR.
 
@@ -56,47 +194,295 @@ def _process_pdf(pdf_file: UploadedFile, selections: Optional[List[List[dict]]])
             selection dictionaries with normalized coordinates.
 
     Returns:
-        str: The extracted text from the PDF, with text from each selection and page
-            separated by newlines.
+        List[Dict]: The extracted regions in page and selection order, see extract_pdf_regions.
     """
     logger.info("Processing PDF file")
     pdf_file.seek(0)
-    pages = convert_from_bytes(pdf_file.read())
-
-    total_pages = len(pages)  # Get the total number of pages
-    results = [""] * total_pages  # Initialize results with the total number of pages
-
-    with ThreadPoolExecutor() as executor:
-        futures = {
-            # Only process pages if selections for that page are present
-            executor.submit(
-                perform_ocr_on_image,
-                page,
-                selections[i]
-                if selections and len(selections) > i and selections[i]
-                else None,
-            ): i
-            for i, page in enumerate(pages)
-            if selections and len(selections) > i and selections[i]
-        }
+    file_content = pdf_file.read()
+    file_hash = compute_file_hash(file_content)
+
+    total_pages = get_page_count(file_content, file_hash)
+    # Only process pages if selections for that page are present
+    pages = [
+        i
+        for i in range(total_pages)
+        if selections and len(selections) > i and selections[i]
+    ]
+    document_regions = extract_pdf_regions(file_content, pages, selections, file_hash)
+
+    cached_regions = sum(1 for region in document_regions if region["cached"])
+    text_layer_regions = sum(
+        1
+        for region in document_regions
+        if region["source"] == SOURCE_TEXT_LAYER and not region["cached"]
+    )
+    logger.info(
+        f"Reused {cached_regions}/{len(document_regions)} regions from cache, "
+        f"text layer used for {text_layer_regions}, "
+        f"OCR for {len(document_regions) - cached_regions - text_layer_regions}"
+    )
+    logger.info(f"OCR engine pool: {get_ocr_engine_pool().get_stats()}")
+    if OCR_PREPROCESS:
+        logger.info(f"OCR preprocessing: {get_preprocess_stats()}")
+    return document_regions
+
+
+def _assemble_layout(regions: List[Dict]) -> Tuple[str, List[Dict]]:
+    """
+    Join the regions into the document text and place their words in it.
+
+    Regions are separated by newlines, empty regions are skipped. The words
+    of a region are joined the same way as by words_to_text.
+    """
+    texts, layout = [], []
+    offset = 0
+    for region in regions:
+        if not region["text"].strip():
+            continue
+        if texts:
+            offset += 1  # Newline between regions
+        lines: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        for word in region["words"]:
+            lines.setdefault(word["line"], []).append(word)
+        for line_index, line in enumerate(lines.values()):
+            if line_index:
+                offset += 1  # Newline between lines
+            for word_index, word in enumerate(line):
+                if word_index:
+                    offset += 1  # Space between words
+                layout.append(
+                    {
+                        "text": word["text"],
+                        "page": region["page"],
+                        "bbox": word["bbox"],
+                        "conf": word["conf"],
+                        "start": offset,
+                        "end": offset + len(word["text"]),
+                    }
+                )
+                offset += len(word["text"])
+        texts.append(region["text"])
+    return "\n".join(texts), layout
+
+
+def find_entity_boxes(
+    words: List[Dict], entities: List[Dict]
+) -> Dict[int, List[Tuple[float, float, float, float]]]:
+    """
+    Locate detected entities on the pages through the words they overlap.
+
+    Args:
+        words (List[Dict]): Words with 'page', 'bbox', 'start' and 'end' as returned by
+            perform_ocr_with_layout.
+        entities (List[Dict]): Entities with 'start' and 'end' offsets in the same text.
+
+    Returns:
+        Dict[int, List[Tuple[float, float, float, float]]]: Per page index the normalized
+            boxes of all words that are part of an entity.
+    """
+    spans = sorted((entity["start"], entity["end"]) for entity in entities)
+    boxes: Dict[int, List[Tuple[float, float, float, float]]] = {}
+    for word in words:
+        index = bisect.bisect_left(spans, (word["end"],)) - 1
+        # Spans may nest, look back over all spans starting before the word ends
+        while index >= 0:
+            start, end = spans[index]
+            if end > word["start"]:
+                boxes.setdefault(word["page"], []).append(word["bbox"])
+                break
+            index -= 1
+    return boxes
+
+
+def extract_pdf_regions(
+    file_content: bytes,
+    pages: List[int],
+    selections: List[List[dict]],
+    file_hash: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Extract the text of the selections of the given PDF pages.
+
+    Regions extracted before with the same rectangle are taken from the
+    region cache, so adding or moving a selection only extracts that one.
+    Other regions are read from the embedded text layer if they have one,
+    only scanned or image-only regions are OCR'd. A producer renders only the
+    selections that need OCR, page by page; OCR workers consume the crops
+    from a bounded queue. Rendering overlaps OCR and memory stays flat
+    regardless of the page count.
 
-        for future in as_completed(futures):
-            page_index = futures[future]  # Get the page index for this future
+    Args:
+        file_content (bytes): The raw PDF bytes.
+        pages (List[int]): The 0-based indices of the pages to extract, in order.
+        selections (List[List[dict]]): Selections with normalized coordinates per page.
+        file_hash (Optional[str]): Precomputed hash of the file. Computed if not provided.
+
+    Returns:
+        List[Dict]: One entry per selection, in page and selection order, with the keys
+            'page', 'selection', 'text', 'words' (each with 'text', 'bbox' normalized to the
+            page, 'conf' and 'line'), 'source' (SOURCE_TEXT_LAYER or SOURCE_OCR) and 'cached'.
+    """
+    file_hash = file_hash or compute_file_hash(file_content)
+    workers = max(1, OCR_PIPELINE_WORKERS)
+    jobs: "queue.Queue[Optional[Tuple[List[Dict], List[Image.Image]]]]" = queue.Queue(
+        maxsize=max(1, OCR_PIPELINE_QUEUE_SIZE)
+    )
+    regions_per_page: Dict[int, List[Dict]] = {}
+
+    def produce() -> None:
+        batch: Tuple[List[Dict], List[Image.Image]] = ([], [])
+        try:
+            for page_index in pages:
+                try:
+                    regions = _prepare_regions(
+                        file_content, file_hash, page_index, selections[page_index]
+                    )
+                    regions_per_page[page_index] = regions
+                    pending, crops = _crop_pending_regions(file_content, regions)
+                except Exception as e:
+                    logger.error(f"Error processing page {page_index}: {str(e)}")
+                    continue
+
+                if OCR_BATCH_MODE == "document":
+                    # Crops are small, collect them for a single OCR pass
+                    batch[0].extend(pending)
+                    batch[1].extend(crops)
+                elif crops:
+                    jobs.put((pending, crops))
+            if batch[1]:
+                jobs.put(batch)
+        finally:
+            for _ in range(workers):
+                jobs.put(None)
+
+    def consume() -> None:
+        while (job := jobs.get()) is not None:
+            pending, crops = job
             try:
-                results[
-                    page_index
-                ] = future.result()  # Assign result to the correct page index
+                for region, crop, words in zip(pending, crops, ocr_crops(crops)):
+                    _set_region_words(
+                        region, _crop_words_to_page(words, region["selection"], crop)
+                    )
             except Exception as e:
-                logger.error(f"Error processing page {page_index}: {str(e)}")
-                results[page_index] = ""  # Leave the page blank in case of an error
+                logger.error(f"Error processing selections: {str(e)}")
+
+    with ThreadPoolExecutor(
+        max_workers=workers + 1, thread_name_prefix="ocr-pipeline"
+    ) as executor:
+        futures = [executor.submit(produce)]
+        futures += [executor.submit(consume) for _ in range(workers)]
+        for future in futures:
+            future.result()
+
+    document_regions = [
+        region
+        for page_index in pages
+        for region in regions_per_page.get(page_index, [])
+    ]
+    for region in document_regions:
+        if not region["cached"]:
+            key = _region_key(file_hash, region["page"], region["selection"])
+            _cache_region(key, region["text"], region["source"], region["words"])
+    _record_sources(document_regions)
+    return document_regions
+
+
+def _prepare_regions(
+    file_content: bytes, file_hash: str, page_index: int, selections: List[dict]
+) -> List[Dict]:
+    """
+    Take the selections from the region cache or read their text layer.
 
-    # Concatenate only non-empty results
-    return "\n".join(filter(None, results))
+    Regions without either get empty text and need OCR.
+    """
+    regions = []
+    for selection in selections:
+        cached = _get_cached_region(_region_key(file_hash, page_index, selection))
+        if cached is not None:
+            text, source, words = cached
+            regions.append(
+                {
+                    "page": page_index,
+                    "selection": selection,
+                    "text": text,
+                    "words": words,
+                    "source": source,
+                    "cached": True,
+                }
+            )
+            continue
+
+        words = None
+        if OCR_USE_TEXT_LAYER:
+            try:
+                words = extract_region_words(file_content, page_index, selection)
+            except Exception as e:
+                logger.error(f"Error reading text layer: {str(e)}")
+
+        region = {
+            "page": page_index,
+            "selection": selection,
+            "source": SOURCE_TEXT_LAYER if words is not None else SOURCE_OCR,
+            "cached": False,
+        }
+        _set_region_words(region, words or [])
+        regions.append(region)
+    return regions
+
+
+def _set_region_words(region: Dict, words: List[Dict]) -> None:
+    region["words"] = words
+    region["text"] = words_to_text(words)
+
+
+def _crop_words_to_page(
+    words: List[Dict], selection: dict, crop: Image.Image
+) -> List[Dict]:
+    """Convert word boxes in crop pixels to boxes normalized to the page."""
+    # Crops are clamped to the page, like the selection rectangle here
+    left = min(max(selection["left"], 0.0), 1.0)
+    top = min(max(selection["top"], 0.0), 1.0)
+    right = min(max(selection["left"] + selection["width"], 0.0), 1.0)
+    bottom = min(max(selection["top"] + selection["height"], 0.0), 1.0)
+    scale_x = (right - left) / crop.width
+    scale_y = (bottom - top) / crop.height
+    return [
+        {
+            "text": word["text"],
+            "bbox": (
+                left + word["left"] * scale_x,
+                top + word["top"] * scale_y,
+                left + (word["left"] + word["width"]) * scale_x,
+                top + (word["top"] + word["height"]) * scale_y,
+            ),
+            "conf": word["conf"],
+            "line": word["line"],
+        }
+        for word in words
+    ]
+
+
+def _crop_pending_regions(
+    file_content: bytes, regions: List[Dict]
+) -> Tuple[List[Dict], List[Image.Image]]:
+    """Render the regions that need OCR, clipped to their selection at OCR resolution."""
+    pending, crops = [], []
+    for region in regions:
+        if region["source"] != SOURCE_OCR or region["cached"]:
+            continue
+        try:
+            crops.append(
+                render_region(file_content, region["page"], region["selection"])
+            )
+            pending.append(region)
+        except Exception as e:
+            logger.error(f"Error processing selection: {str(e)}")
+    return pending, crops
 
 
 def _process_image(
     image_file: UploadedFile, selections: Optional[List[List[dict]]]
-) -> str:
+) -> List[Dict]:
     """
     Process an image file for OCR.
 
@@ -106,51 +492,101 @@ def _process_image(
             contains a list of selection dictionaries with normalized coordinates.
 
     Returns:
-        str: The extracted text from the image selections, separated by newlines.
+        List[Dict]: The extracted regions in selection order, see _ocr_image_regions.
     """
     logger.info("Processing image file")
-    image = Image.open(image_file)
+    image_file.seek(0)
+    file_content = image_file.read()
+    image = Image.open(io.BytesIO(file_content))
 
     # Only perform OCR if selections are provided
     if selections and selections[0]:
-        return perform_ocr_on_image(image, selections[0])
-    return ""  # Skip if no selections
+        return _ocr_image_regions(
+            image, selections[0], file_hash=compute_file_hash(file_content)
+        )
+    return []  # Skip if no selections
 
 
-def perform_ocr_on_image(image: Image.Image, selections: Optional[List[dict]]) -> str:
+def _ocr_image_regions(
+    image: Image.Image,
+    selections: Optional[List[dict]],
+    file_hash: Optional[str] = None,
+) -> List[Dict]:
     """
-    Perform OCR on an image, limiting it to the selected regions if provided.
-
-    Args:
-        image (Image.Image): The image to perform OCR on.
-        selections (Optional[List[dict]]): List of selections for a single page, where each selection
-            is a dictionary containing normalized coordinates ('left', 'top', 'width', 'height')
-            ranging from 0.0 to 1.0.
+    OCR the selections of an image.
 
     Returns:
-        str: The extracted text from the image selections, separated by newlines.
+        List[Dict]: One region per selection with the keys of extract_pdf_regions, page 0.
     """
     logger.info(f"Performing OCR on image of size: {image.size}")
 
     if not selections:
         # Skip OCR if no selections
-        return ""
+        return []
 
-    results = []
+    regions = []
+    pending, crops = [], []
     for selection in selections:
+        region = {"page": 0, "selection": selection, "source": SOURCE_OCR}
+        regions.append(region)
+        if file_hash:
+            cached = _get_cached_region(_region_key(file_hash, 0, selection))
+            if cached is not None:
+                region["text"], region["source"], region["words"] = cached
+                region["cached"] = True
+                continue
+        region["cached"] = False
+        _set_region_words(region, [])
         try:
-            result = process_selection(image, selection)
-            if result.strip():  # Only add non-empty results
-                results.append(result)
+            crops.append(crop_selection(image, selection))
+            pending.append(region)
         except Exception as e:
             logger.error(f"Error processing selection: {str(e)}")
 
-    return "\n".join(results)
+    for region, crop, words in zip(pending, crops, ocr_crops(crops)):
+        _set_region_words(region, _crop_words_to_page(words, region["selection"], crop))
+        if file_hash:
+            _cache_region(
+                _region_key(file_hash, 0, region["selection"]),
+                region["text"],
+                SOURCE_OCR,
+                region["words"],
+            )
+
+    return regions
+
+
+def ocr_crops(crops: List[Image.Image]) -> List[List[Dict]]:
+    """
+    Recognize the words of selection crops.
+
+    Unless OCR_BATCH_MODE is "off", all crops are packed into one composite
+    image that is recognized in a single call, and the recognized words are
+    split back per crop. With OCR_WORKER_MODE "process" the crops are
+    recognized in a worker process.
+
+    Args:
+        crops (List[Image.Image]): The crops in reading order.
+
+    Returns:
+        List[List[Dict]]: The words of each crop, in the order of crops, with boxes in
+            pixels of the crop (see recognize_crops).
+    """
+    if not crops:
+        return []
+
+    batch = OCR_BATCH_MODE != "off"
+    if OCR_WORKER_MODE == "process":
+        try:
+            return recognize_crops_in_process(crops, batch)
+        except Exception as e:
+            logger.error(f"OCR worker process failed, recognizing in-process: {str(e)}")
+    return recognize_crops(crops, batch)
 
 
-def process_selection(image: Image.Image, selection: dict) -> str:
+def crop_selection(image: Image.Image, selection: dict) -> Image.Image:
     """
-    Process a single selection for OCR.
+    Crop a single selection from an image.
 
     Args:
         image (Image.Image): The image to process.
@@ -161,7 +597,7 @@ def process_selection(image: Image.Image, selection: dict) -> str:
             - height (float): Height (0.0 to 1.0)
 
     Returns:
-        str: The extracted text from the selection.
+        Image.Image: The selected part of the image.
 
     Raises:
         ValueError: If the selection coordinates are invalid or out of bounds.
@@ -181,5 +617,4 @@ def process_selection(image: Image.Image, selection: dict) -> str:
     if left >= right or top >= bottom:
         raise ValueError("Invalid selection coordinates")
 
-    cropped_image = image.crop((left, top, right, bottom))
-    return pytesseract.image_to_string(cropped_image, lang="deu")
+    return image.crop((left, top, right, bottom))
@@ -0,0 +1,218 @@
+import math
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from utils.helpers.logger import logger
+from utils.helpers.ocr_engine import OcrEnginePool, get_ocr_engine_pool
+from utils.helpers.ocr_preprocess import OCR_PREPROCESS, preprocess_crop
+
+# "page" packs the crops of a page into one OCR call, "document" the crops of
+# all pages, "off" recognizes every crop on its own. Off by default until the
+# composite layout is checked against per-crop accuracy on real scans, compare
+# both with scripts/benchmark_ocr_batching.py
+OCR_BATCH_MODE = os.getenv("OCR_BATCH_MODE", "off").lower()
+
+# White space around each crop, keeps Tesseract from merging neighbouring crops
+COMPOSITE_PADDING = 32
+
+# Tesseract rejects very large images, larger batches are split into several composites
+MAX_COMPOSITE_HEIGHT = int(os.getenv("OCR_MAX_COMPOSITE_HEIGHT", "12000"))
+
+Box = Tuple[int, int, int, int]
+
+
+def build_composites(
+    crops: List[Image.Image],
+) -> List[Tuple[Image.Image, List[int], List[Box]]]:
+    """
+    Stack crops vertically onto white composite images.
+
+    Args:
+        crops (List[Image.Image]): The crops in reading order.
+
+    Returns:
+        List[Tuple[Image.Image, List[int], List[Box]]]: Per composite the image, the
+            indices of the crops it contains and their (left, top, right, bottom) boxes
+            inside the composite.
+    """
+    groups: List[List[int]] = [[]]
+    height = COMPOSITE_PADDING
+    for index, crop in enumerate(crops):
+        crop_height = crop.height + COMPOSITE_PADDING
+        if groups[-1] and height + crop_height > MAX_COMPOSITE_HEIGHT:
+            groups.append([])
+            height = COMPOSITE_PADDING
+        groups[-1].append(index)
+        height += crop_height
+
+    composites = []
+    for indices in groups:
+        width = max(crops[i].width for i in indices) + 2 * COMPOSITE_PADDING
+        height = COMPOSITE_PADDING + sum(
+            crops[i].height + COMPOSITE_PADDING for i in indices
+        )
+        composite = Image.new("RGB", (width, height), "white")
+
+        boxes = []
+        top = COMPOSITE_PADDING
+        for i in indices:
+            crop = crops[i]
+            composite.paste(crop.convert("RGB"), (COMPOSITE_PADDING, top))
+            boxes.append(
+                (
+                    COMPOSITE_PADDING,
+                    top,
+                    COMPOSITE_PADDING + crop.width,
+                    top + crop.height,
+                )
+            )
+            top += crop.height + COMPOSITE_PADDING
+        composites.append((composite, indices, boxes))
+    return composites
+
+
+def split_words(words: List[Dict], boxes: List[Box]) -> List[List[Dict]]:
+    """
+    Assign the recognized words of a composite to the crops they lie in.
+
+    A word belongs to the crop containing its center. Word coordinates are
+    translated to be relative to that crop.
+
+    Args:
+        words (List[Dict]): Words with 'left', 'top', 'width', 'height' in composite pixels.
+        boxes (List[Box]): The crop boxes inside the composite.
+
+    Returns:
+        List[List[Dict]]: The words of each crop, in recognition order.
+    """
+    words_per_box: List[List[Dict]] = [[] for _ in boxes]
+    for word in words:
+        center_x = word["left"] + word["width"] / 2
+        center_y = word["top"] + word["height"] / 2
+        for index, (left, top, right, bottom) in enumerate(boxes):
+            if left <= center_x < right and top <= center_y < bottom:
+                words_per_box[index].append(
+                    {**word, "left": word["left"] - left, "top": word["top"] - top}
+                )
+                break
+    return words_per_box
+
+
+def words_to_text(words: List[Dict]) -> str:
+    """
+    Join recognized words into text, one line per recognized text line.
+
+    Args:
+        words (List[Dict]): Words in recognition order with a 'line' identifier.
+
+    Returns:
+        str: The text of the words.
+    """
+    lines: "OrderedDict[Tuple, List[str]]" = OrderedDict()
+    for word in words:
+        lines.setdefault(word["line"], []).append(word["text"])
+    return "\n".join(" ".join(line) for line in lines.values())
+
+
+def recognize_crops(
+    crops: List[Image.Image], batch: bool, pool: Optional[OcrEnginePool] = None
+) -> List[List[Dict]]:
+    """
+    Recognize the words of crops with the engine pool.
+
+    Crops are cleaned up by preprocess_crop first if OCR_PREPROCESS is set,
+    the word boxes are mapped back onto the original crops.
+
+    Args:
+        crops (List[Image.Image]): The crops in reading order.
+        batch (bool): Pack the crops into composite images. If a batched call fails,
+            the crops are recognized one by one.
+        pool (Optional[OcrEnginePool]): The engine pool to use. The process-wide pool
+            if not provided.
+
+    Returns:
+        List[List[Dict]]: The words of each crop, in the order of crops. Words have
+            'text', 'conf', 'line' and 'left', 'top', 'width', 'height' in pixels of the crop.
+    """
+    pool = pool or get_ocr_engine_pool()
+    transforms = None
+    if OCR_PREPROCESS:
+        crops, transforms = zip(*(preprocess_crop(crop) for crop in crops))
+
+    words_per_crop = None
+    if batch and len(crops) > 1:
+        try:
+            words_per_crop = _recognize_batched(crops, pool)
+        except Exception as e:
+            logger.error(f"Batched OCR failed, recognizing crops one by one: {str(e)}")
+    if words_per_crop is None:
+        words_per_crop = [_recognize_crop(crop, pool) for crop in crops]
+
+    if transforms:
+        words_per_crop = [
+            _undo_preprocess(words, transform)
+            for words, transform in zip(words_per_crop, transforms)
+        ]
+    return words_per_crop
+
+
+def _recognize_batched(
+    crops: List[Image.Image], pool: OcrEnginePool
+) -> List[List[Dict]]:
+    words_per_crop: List[List[Dict]] = [[] for _ in crops]
+    for composite, indices, boxes in build_composites(crops):
+        words = pool.image_to_data(composite, boxes=len(indices))
+        for index, crop_words in zip(indices, split_words(words, boxes)):
+            words_per_crop[index] = crop_words
+    return words_per_crop
+
+
+def _recognize_crop(crop: Image.Image, pool: OcrEnginePool) -> List[Dict]:
+    try:
+        return pool.image_to_data(crop)
+    except Exception as e:
+        logger.error(f"Error processing selection: {str(e)}")
+        return []
+
+
+def _unrotate_box(word: Dict, transform: Dict) -> Tuple[float, float, float, float]:
+    """Return the box of a word in the crop before the deskew rotation, as (left, top, right, bottom)."""
+    left, top = word["left"], word["top"]
+    right, bottom = left + word["width"], top + word["height"]
+    angle = transform["angle"]
+    if not angle:
+        return left, top, right, bottom
+
+    # The deskew rotated the crop clockwise about its center, which became the
+    # center of the expanded result. Turn the corners back and take the box
+    # around them, so the whole word stays covered.
+    width, height = transform["size"]
+    rotated_width, rotated_height = transform["rotated_size"]
+    cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    xs, ys = [], []
+    for x, y in ((left, top), (right, top), (left, bottom), (right, bottom)):
+        dx, dy = x - rotated_width / 2, y - rotated_height / 2
+        xs.append(width / 2 + dx * cos + dy * sin)
+        ys.append(height / 2 - dx * sin + dy * cos)
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _undo_preprocess(words: List[Dict], transform: Dict) -> List[Dict]:
+    scale = transform["scale"]
+    offset_x, offset_y = transform["offset"]
+    undone = []
+    for word in words:
+        left, top, right, bottom = _unrotate_box(word, transform)
+        undone.append(
+            {
+                **word,
+                "left": (left + offset_x) / scale,
+                "top": (top + offset_y) / scale,
+                "width": (right - left) / scale,
+                "height": (bottom - top) / scale,
+            }
+        )
+    return undone
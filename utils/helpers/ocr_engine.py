@@ -0,0 +1,352 @@
+import ctypes
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Type
+
+from PIL import Image
+
+from utils.helpers.logger import logger
+from utils.helpers.ocr_scheduler import (
+    OCR_THREADS_PER_ENGINE,
+    default_ocr_workers,
+    tesseract_environ,
+)
+
+# OCR backend: "auto" uses tesserocr if it is installed, otherwise pytesseract
+OCR_BACKEND = os.getenv("OCR_BACKEND", "auto").lower()
+
+# Tesseract language of the documents
+OCR_LANG = os.getenv("OCR_LANG", "deu")
+
+# Maximum number of engines kept loaded, one per concurrent OCR worker. Defaults
+# to the CPUs available to the container divided by the threads per engine.
+OCR_ENGINE_POOL_SIZE = int(
+    os.getenv("OCR_ENGINE_POOL_SIZE", str(default_ocr_workers()))
+)
+
+# Number of recent per-box latencies kept for the percentiles
+LATENCY_WINDOW = 1000
+
+
+class OcrBackend(ABC):
+    """
+    Interface of an OCR engine.
+
+    An engine is used by one thread at a time. It may hold a loaded model
+    that is reused for every image it recognizes.
+    """
+
+    name = "base"
+
+    def __init__(self, lang: str):
+        self.lang = lang
+
+    @abstractmethod
+    def image_to_data(self, image: Image.Image) -> List[Dict]:
+        """
+        Recognize the words of an image with their positions.
+
+        Returns:
+            List[Dict]: Words in recognition order with 'text', 'left', 'top', 'width',
+                'height' (pixels), 'conf' (0-100) and 'line' (identifier of the text line).
+        """
+
+    def close(self) -> None:
+        """Release the resources held by the engine."""
+
+
+def _limit_pytesseract_threads() -> None:
+    """Start the tesseract CLI with the environment of tesseract_environ()."""
+    from pytesseract import pytesseract as cli
+
+    subprocess_args = cli.subprocess_args
+    if getattr(subprocess_args, "thread_limited", False):
+        return
+
+    def limited_subprocess_args(*args, **kwargs):
+        popen_kwargs = subprocess_args(*args, **kwargs)
+        popen_kwargs["env"] = tesseract_environ()
+        return popen_kwargs
+
+    limited_subprocess_args.thread_limited = True
+    cli.subprocess_args = limited_subprocess_args
+
+
+class PytesseractBackend(OcrBackend):
+    """Runs the tesseract CLI in a subprocess for every image."""
+
+    name = "pytesseract"
+
+    def __init__(self, lang: str):
+        super().__init__(lang)
+        _limit_pytesseract_threads()
+
+    def image_to_data(self, image: Image.Image) -> List[Dict]:
+        import pytesseract
+
+        data = pytesseract.image_to_data(
+            image, lang=self.lang, output_type=pytesseract.Output.DICT
+        )
+        return [
+            {
+                "text": data["text"][i],
+                "left": data["left"][i],
+                "top": data["top"][i],
+                "width": data["width"][i],
+                "height": data["height"][i],
+                "conf": float(data["conf"][i]),
+                "line": (data["block_num"][i], data["par_num"][i], data["line_num"][i]),
+            }
+            for i in range(len(data["text"]))
+            if data["text"][i].strip()
+        ]
+
+
+_openmp_limit = threading.local()
+
+
+def _limit_openmp_threads() -> None:
+    """
+    Cap the OpenMP threads Tesseract starts from the calling thread at OCR_THREADS_PER_ENGINE.
+
+    The limit is a setting of the calling thread in the OpenMP runtime linked
+    by Tesseract, threads running the NER model keep theirs. Does nothing if
+    Tesseract is built without OpenMP.
+    """
+    if getattr(_openmp_limit, "applied", False):
+        return
+    _openmp_limit.applied = True
+    try:
+        libgomp = ctypes.CDLL("libgomp.so.1", mode=os.RTLD_NOLOAD)
+    except (OSError, AttributeError):
+        return
+    libgomp.omp_set_num_threads(OCR_THREADS_PER_ENGINE)
+
+
+class TesserocrBackend(OcrBackend):
+    """Keeps a Tesseract API handle with the traineddata loaded in-process."""
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str):
+        super().__init__(lang)
+        import tesserocr
+
+        self._api = tesserocr.PyTessBaseAPI(lang=lang)
+
+    def image_to_data(self, image: Image.Image) -> List[Dict]:
+        from tesserocr import RIL, iterate_level
+
+        _limit_openmp_threads()
+        self._api.SetImage(image)
+        self._api.Recognize()
+        iterator = self._api.GetIterator()
+        if iterator is None:
+            return []
+
+        words = []
+        line = 0
+        for word in iterate_level(iterator, RIL.WORD):
+            if word.IsAtBeginningOf(RIL.TEXTLINE):
+                line += 1
+            text = word.GetUTF8Text(RIL.WORD)
+            bbox = word.BoundingBox(RIL.WORD)
+            if not text or not text.strip() or bbox is None:
+                continue
+            left, top, right, bottom = bbox
+            words.append(
+                {
+                    "text": text,
+                    "left": left,
+                    "top": top,
+                    "width": right - left,
+                    "height": bottom - top,
+                    "conf": word.Confidence(RIL.WORD),
+                    "line": line,
+                }
+            )
+        return words
+
+    def close(self) -> None:
+        self._api.End()
+
+
+_BACKENDS: Dict[str, Type[OcrBackend]] = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend,
+}
+
+
+def register_backend(backend_cls: Type[OcrBackend]) -> None:
+    """
+    Make an OCR backend selectable through OCR_BACKEND.
+
+    Args:
+        backend_cls (Type[OcrBackend]): The backend class, registered under its name.
+    """
+    _BACKENDS[backend_cls.name] = backend_cls
+
+
+def _resolve_backend(name: str) -> str:
+    if name != "auto":
+        return name
+    try:
+        import tesserocr  # noqa: F401
+
+        return TesserocrBackend.name
+    except ImportError:
+        return PytesseractBackend.name
+
+
+class OcrEnginePool:
+    """
+    Pool of OCR engines shared by all sessions of the process.
+
+    Engines are created lazily up to the pool size and handed out to one
+    worker at a time, so the language data is loaded once per engine and not
+    once per selection. If the configured backend cannot be loaded, the pool
+    falls back to pytesseract.
+    """
+
+    def __init__(self, backend: str, size: int, lang: str = OCR_LANG):
+        self.backend = _resolve_backend(backend)
+        self.size = max(1, size)
+        self.lang = lang
+        self._idle: "queue.LifoQueue[OcrBackend]" = queue.LifoQueue()
+        self._engines = []
+        self._lock = threading.Lock()
+        self._created_at = time.perf_counter()
+        self._in_use = 0
+        self._busy_seconds = 0.0
+        self._calls = 0
+        self._boxes = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def _create_engine(self) -> OcrBackend:
+        try:
+            engine = _BACKENDS[self.backend](self.lang)
+        except Exception as e:
+            if self.backend == PytesseractBackend.name:
+                raise
+            logger.warning(
+                f"OCR backend '{self.backend}' unavailable, falling back to pytesseract: {e}"
+            )
+            self.backend = PytesseractBackend.name
+            engine = PytesseractBackend(self.lang)
+
+        logger.info(f"Loaded OCR engine {len(self._engines) + 1} ({engine.name})")
+        return engine
+
+    def _acquire(self) -> OcrBackend:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._engines) < self.size:
+                engine = self._create_engine()
+                self._engines.append(engine)
+                return engine
+
+        # All engines are loaded, wait for one to become idle
+        return self._idle.get()
+
+    @contextmanager
+    def engine(self) -> Iterator[OcrBackend]:
+        """Borrow an engine for exclusive use by the current thread."""
+        engine = self._acquire()
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield engine
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(engine)
+
+    def _run(self, recognize: Callable[[OcrBackend], object], boxes: int):
+        with self.engine() as engine:
+            start = time.perf_counter()
+            try:
+                return recognize(engine)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self._calls += 1
+                    self._boxes += boxes
+                    self._busy_seconds += elapsed
+                    self._latencies.append(elapsed / boxes)
+
+    def image_to_data(self, image: Image.Image, boxes: int = 1) -> List[Dict]:
+        """
+        Recognize the words of an image with a pooled engine.
+
+        Args:
+            image (Image.Image): The image to recognize.
+            boxes (int): Number of selections packed into the image, for the metrics.
+
+        Returns:
+            List[Dict]: The recognized words, see OcrBackend.image_to_data.
+        """
+        return self._run(lambda engine: engine.image_to_data(image), boxes=boxes)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Return per-box latency and engine utilization of the pool.
+
+        Returns:
+            Dict[str, float]: OCR calls, boxes, per-box latency mean/p95/max in milliseconds, loaded
+                and busy engines, and the share of engine time spent recognizing.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            uptime = time.perf_counter() - self._created_at
+            stats = {
+                "calls": self._calls,
+                "boxes": self._boxes,
+                "engines_loaded": len(self._engines),
+                "engines_in_use": self._in_use,
+                "utilization": self._busy_seconds / (uptime * self.size),
+            }
+
+        if latencies:
+            stats["latency_mean_ms"] = 1000 * sum(latencies) / len(latencies)
+            stats["latency_p95_ms"] = 1000 * latencies[int(0.95 * (len(latencies) - 1))]
+            stats["latency_max_ms"] = 1000 * latencies[-1]
+        return stats
+
+    def shutdown(self) -> None:
+        """Release all loaded engines."""
+        with self._lock:
+            engines, self._engines = self._engines, []
+            self._idle = queue.LifoQueue()
+        for engine in engines:
+            engine.close()
+
+
+_pool: Optional[OcrEnginePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_ocr_engine_pool() -> OcrEnginePool:
+    """
+    Return the process-wide OCR engine pool, creating it on first use.
+
+    Returns:
+        OcrEnginePool: The shared engine pool.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = OcrEnginePool(OCR_BACKEND, OCR_ENGINE_POOL_SIZE)
+                logger.info(
+                    f"OCR engine pool: backend {_pool.backend}, up to {_pool.size} engines"
+                )
+    return _pool
@@ -0,0 +1,270 @@
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+from PIL import Image
+
+from utils.helpers.logger import logger
+
+# Clean up crops before OCR: grayscale, downscale, binarize, crop borders, deskew
+OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "false").lower() == "true"
+
+# Crops rendered or scanned at a higher resolution are downscaled to this DPI
+OCR_TARGET_DPI = int(os.getenv("OCR_TARGET_DPI", "300"))
+
+# Window of the adaptive threshold in pixels and how much darker than the local
+# mean a pixel has to be to count as ink
+BINARIZE_WINDOW = 31
+BINARIZE_SENSITIVITY = 0.15
+
+# Rows or columns at the edge with more ink than this are scan borders, not text
+BORDER_INK_RATIO = 0.9
+
+# White margin kept around the text, Tesseract needs some
+BORDER_PADDING = 10
+
+# Skew angles tried by the deskew estimation, in degrees
+MAX_SKEW_ANGLE = 5.0
+SKEW_ANGLE_STEP = 0.25
+MIN_SKEW_ANGLE = 0.3
+
+# Ink pixels sampled for the deskew estimation
+MAX_SKEW_SAMPLES = 20000
+
+STEPS = ("grayscale", "downscale", "binarize", "crop_border", "deskew")
+
+_stats_lock = threading.Lock()
+_step_seconds: Dict[str, float] = {step: 0.0 for step in STEPS}
+_crops = 0
+
+
+def to_grayscale(image: Image.Image) -> np.ndarray:
+    """Convert an image to an 8-bit luminance array (ITU-R 601-2 weights)."""
+    if image.mode == "L":
+        return np.asarray(image, dtype=np.uint8)
+    rgb = np.asarray(image.convert("RGB"), dtype=np.float32)
+    return (rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)).astype(np.uint8)
+
+
+def downscale(gray: np.ndarray, source_dpi: float) -> Tuple[np.ndarray, float]:
+    """
+    Downscale a crop that is larger than needed for OCR.
+
+    Args:
+        gray (np.ndarray): The grayscale crop.
+        source_dpi (float): The resolution of the crop.
+
+    Returns:
+        Tuple[np.ndarray, float]: The crop and the applied scale factor (<= 1).
+    """
+    if not source_dpi or source_dpi <= OCR_TARGET_DPI:
+        return gray, 1.0
+
+    scale = OCR_TARGET_DPI / source_dpi
+    height, width = gray.shape
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    resized = Image.fromarray(gray).resize(size, Image.Resampling.BOX)
+    return np.asarray(resized, dtype=np.uint8), scale
+
+
+def _window_sums(values: np.ndarray, half: int, axis: int) -> np.ndarray:
+    """Sum values over windows of 2 * half + 1 along an axis, clipped at the edges."""
+    length = values.shape[axis]
+    sums = np.cumsum(values, axis=axis, dtype=np.int32)
+    # Prefix sums with a leading zero, repeated at both ends so that every
+    # window is the difference of two slices
+    padding = [(0, 0), (0, 0)]
+    padding[axis] = (half + 1, half)
+    prefix = np.pad(sums, padding, mode="edge")
+    del sums
+    if axis == 0:
+        prefix[: half + 1] = 0
+        return prefix[2 * half + 1 :] - prefix[:length]
+    prefix[:, : half + 1] = 0
+    return prefix[:, 2 * half + 1 :] - prefix[:, :length]
+
+
+def _window_counts(length: int, half: int) -> np.ndarray:
+    """Number of pixels in each window of _window_sums along an axis of length."""
+    positions = np.arange(length)
+    return (
+        np.minimum(positions + half + 1, length) - np.maximum(positions - half, 0)
+    ).astype(np.float32)
+
+
+def binarize(gray: np.ndarray) -> np.ndarray:
+    """
+    Binarize with a local mean threshold, robust to grey and uneven backgrounds.
+
+    The local means are a separable box filter over int32 prefix sums, so a
+    crop needs a few int32 and float32 copies of itself at most.
+
+    Args:
+        gray (np.ndarray): The grayscale crop.
+
+    Returns:
+        np.ndarray: Boolean ink mask, True for dark pixels.
+    """
+    height, width = gray.shape
+    half = BINARIZE_WINDOW // 2
+
+    column_sums = _window_sums(gray, half, axis=0)
+    window_sums = _window_sums(column_sums, half, axis=1)
+    del column_sums
+
+    local_mean = window_sums.astype(np.float32)
+    del window_sums
+    local_mean /= _window_counts(height, half)[:, None]
+    local_mean /= _window_counts(width, half)[None, :]
+    local_mean *= 1 - BINARIZE_SENSITIVITY
+    return gray < local_mean
+
+
+def crop_border(ink: np.ndarray) -> Tuple[int, int, int, int]:
+    """
+    Find the text area, dropping white margins and dark scan borders.
+
+    Args:
+        ink (np.ndarray): Boolean ink mask.
+
+    Returns:
+        Tuple[int, int, int, int]: (left, top, right, bottom) of the text area. The whole
+            crop if it has no text.
+    """
+    height, width = ink.shape
+    row_ratio = ink.mean(axis=1)
+    col_ratio = ink.mean(axis=0)
+    rows = np.flatnonzero((row_ratio > 0) & (row_ratio < BORDER_INK_RATIO))
+    cols = np.flatnonzero((col_ratio > 0) & (col_ratio < BORDER_INK_RATIO))
+    if not rows.size or not cols.size:
+        return 0, 0, width, height
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def estimate_skew(ink: np.ndarray) -> float:
+    """
+    Estimate the skew of text lines with a projection profile.
+
+    Ink pixels are sheared by every candidate angle; the angle whose row
+    histogram has the sharpest peaks (largest variance) aligns the lines.
+
+    Args:
+        ink (np.ndarray): Boolean ink mask.
+
+    Returns:
+        float: The skew in degrees, counter-clockwise positive.
+    """
+    ys, xs = np.nonzero(ink)
+    if ys.size < 2:
+        return 0.0
+    if ys.size > MAX_SKEW_SAMPLES:
+        sample = np.random.default_rng(0).choice(
+            ys.size, MAX_SKEW_SAMPLES, replace=False
+        )
+        ys, xs = ys[sample], xs[sample]
+
+    angles = np.arange(
+        -MAX_SKEW_ANGLE, MAX_SKEW_ANGLE + SKEW_ANGLE_STEP / 2, SKEW_ANGLE_STEP
+    )
+    # Row index of every ink pixel for every angle, shape (angles, pixels)
+    sheared = ys[None, :] + xs[None, :] * np.tan(np.radians(angles))[:, None]
+    sheared = np.round(sheared - sheared.min()).astype(np.int64)
+
+    bins = int(sheared.max()) + 1
+    offsets = np.arange(len(angles))[:, None] * bins
+    histograms = np.bincount(
+        (sheared + offsets).ravel(), minlength=len(angles) * bins
+    ).reshape(len(angles), bins)
+    return float(angles[np.argmax(histograms.var(axis=1))])
+
+
+def preprocess_crop(image: Image.Image) -> Tuple[Image.Image, Dict]:
+    """
+    Clean up a crop for OCR.
+
+    Converts to grayscale, downscales crops above OCR_TARGET_DPI, binarizes
+    with an adaptive threshold, crops to the text area and deskews. Smaller,
+    cleaner bitmaps are recognized faster and more reliably.
+
+    Args:
+        image (Image.Image): The crop. Its resolution is read from image.info['dpi'].
+
+    Returns:
+        Tuple[Image.Image, Dict]: The binarized crop and the applied transform: 'scale',
+            'offset' (top-left of the result in the scaled crop, may be negative due to
+            padding), 'angle' (applied deskew in degrees, clockwise), 'size' (of the crop
+            before the deskew), 'rotated_size' (of the result, the canvas grows with the
+            rotation) and 'timings' (seconds per step).
+    """
+    global _crops
+    timings = {}
+
+    start = time.perf_counter()
+    gray = to_grayscale(image)
+    timings["grayscale"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    source_dpi = image.info.get("dpi", (0, 0))[0]
+    gray, scale = downscale(gray, source_dpi)
+    timings["downscale"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ink = binarize(gray)
+    timings["binarize"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    left, top, right, bottom = crop_border(ink)
+    ink = np.pad(ink[top:bottom, left:right], BORDER_PADDING, constant_values=False)
+    timings["crop_border"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    angle = estimate_skew(ink)
+    result = Image.fromarray(np.where(ink, 0, 255).astype(np.uint8))
+    size = result.size
+    if abs(angle) >= MIN_SKEW_ANGLE:
+        # Expanded, text near the corners would be rotated out of the crop otherwise
+        result = result.rotate(
+            -angle, resample=Image.Resampling.NEAREST, expand=True, fillcolor=255
+        )
+    else:
+        angle = 0.0
+    timings["deskew"] = time.perf_counter() - start
+
+    with _stats_lock:
+        _crops += 1
+        for step, seconds in timings.items():
+            _step_seconds[step] += seconds
+
+    logger.debug(
+        "Preprocessed crop "
+        + ", ".join(
+            f"{step} {1000 * seconds:.1f} ms" for step, seconds in timings.items()
+        )
+    )
+    info = {
+        "scale": scale,
+        "offset": (left - BORDER_PADDING, top - BORDER_PADDING),
+        "angle": angle,
+        "size": size,
+        "rotated_size": result.size,
+        "timings": timings,
+    }
+    return result, info
+
+
+def get_preprocess_stats() -> Dict[str, float]:
+    """
+    Return the number of preprocessed crops and the mean time per step.
+
+    Returns:
+        Dict[str, float]: 'crops' and the mean milliseconds per crop of every step.
+    """
+    with _stats_lock:
+        crops = _crops
+        seconds = dict(_step_seconds)
+    stats = {"crops": crops}
+    for step in STEPS:
+        stats[f"{step}_ms"] = 1000 * seconds[step] / crops if crops else 0.0
+    return stats
@@ -0,0 +1,162 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+from utils.helpers.logger import logger
+
+# "thread" runs OCR in the app process, "process" in separate worker processes
+OCR_WORKER_MODE = os.getenv("OCR_WORKER_MODE", "thread").lower()
+
+# OpenMP threads per Tesseract engine, workers are sized so that all of them fit the CPUs.
+# Applied to Tesseract only: through OMP_THREAD_LIMIT to the tesseract CLI and the
+# OCR worker processes, and per OCR thread to in-process tesserocr engines. The
+# NER model keeps its threads.
+OCR_THREADS_PER_ENGINE = max(1, int(os.getenv("OCR_THREADS_PER_ENGINE", "1")))
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """Return the CPU quota of the container, None if it is not limited."""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        # cgroup v1
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """
+    Return the number of CPUs the process may actually use.
+
+    Takes the CPU affinity and the cgroup quota of the container into account,
+    os.cpu_count() reports the CPUs of the host.
+
+    Returns:
+        int: The usable CPUs, at least 1.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_limit()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def default_ocr_workers() -> int:
+    """Return the number of OCR workers that fit the available CPUs."""
+    return max(1, available_cpus() // OCR_THREADS_PER_ENGINE)
+
+
+def tesseract_environ() -> Dict[str, str]:
+    """
+    Return the environment for a Tesseract process.
+
+    Returns:
+        Dict[str, str]: The environment of the app with OMP_THREAD_LIMIT set to
+            OCR_THREADS_PER_ENGINE.
+    """
+    env = dict(os.environ)
+    env["OMP_THREAD_LIMIT"] = str(OCR_THREADS_PER_ENGINE)
+    return env
+
+
+# Pool of one engine per worker process, created by _init_worker
+_worker_engine_pool = None
+
+
+def _init_worker() -> None:
+    global _worker_engine_pool
+    # The worker only runs OCR. Tesseract reads the limit when its OpenMP
+    # runtime starts, i.e. before the first engine is loaded.
+    os.environ["OMP_THREAD_LIMIT"] = str(OCR_THREADS_PER_ENGINE)
+    from utils.helpers.ocr_engine import OCR_BACKEND, OcrEnginePool
+
+    _worker_engine_pool = OcrEnginePool(OCR_BACKEND, 1)
+
+
+def _recognize_in_worker(crops: List[Image.Image], batch: bool) -> List[List[Dict]]:
+    from utils.helpers.ocr_batch import recognize_crops
+
+    return recognize_crops(crops, batch, pool=_worker_engine_pool)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_ocr_process_pool() -> ProcessPoolExecutor:
+    """
+    Return the process-wide pool of OCR worker processes, starting it on first use.
+
+    Workers are spawned, not forked, so they do not inherit the threads of the
+    Streamlit server.
+
+    Returns:
+        ProcessPoolExecutor: The shared worker pool.
+    """
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                from utils.helpers.ocr_engine import OCR_ENGINE_POOL_SIZE
+
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=OCR_ENGINE_POOL_SIZE,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                logger.info(
+                    f"Started {OCR_ENGINE_POOL_SIZE} OCR worker processes "
+                    f"({OCR_THREADS_PER_ENGINE} threads each, {available_cpus()} CPUs available)"
+                )
+    return _process_pool
+
+
+def recognize_crops_in_process(
+    crops: List[Image.Image], batch: bool
+) -> List[List[Dict]]:
+    """
+    Recognize crops in a worker process.
+
+    Args:
+        crops (List[Image.Image]): The crops in reading order.
+        batch (bool): Pack the crops into composite images.
+
+    Returns:
+        List[List[Dict]]: The words of each crop, in the order of crops.
+    """
+    global _process_pool
+    pool = get_ocr_process_pool()
+    try:
+        return pool.submit(_recognize_in_worker, crops, batch).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory), start a fresh pool on the next call
+        with _process_pool_lock:
+            if _process_pool is pool:
+                _process_pool = None
+        pool.shutdown(wait=False)
+        raise
@@ -1,9 +1,14 @@
 import logging
+import threading
 import time
-from typing import Tuple
+from typing import Dict, Tuple
 
 import requests
 
+# Results of check_otlp_connection per endpoint, logging and metrics share one check
+_connection_results: Dict[str, Tuple[bool, str]] = {}
+_connection_lock = threading.Lock()
+
 
 def check_otlp_connection(endpoint: str, max_retries: int = 3) -> Tuple[bool, str]:
     """
@@ -56,3 +61,16 @@ def check_otlp_connection(endpoint: str, max_retries: int = 3) -> Tuple[bool, st
                     exc_info=True,
                 )
                 return False, endpoint
+
+
+def get_otlp_connection(endpoint: str) -> Tuple[bool, str]:
+    """
+    Check OTLP endpoint connectivity once per process.
+
+    Concurrent callers wait for the same check, later callers get its result.
+    Returns (success: bool, formatted_endpoint: str)
+    """
+    with _connection_lock:
+        if endpoint not in _connection_results:
+            _connection_results[endpoint] = check_otlp_connection(endpoint)
+        return _connection_results[endpoint]
@@ -0,0 +1,94 @@
+import io
+import posixpath
+import zipfile
+from typing import Dict, Iterable, List, Optional
+
+
+class PadnextWorkspace:
+    """
+    In-memory file set of a PADnext job.
+
+    Replaces the shared extraction directory: every session works on its own
+    workspace, files are held as bytes and archives are read and written in
+    memory, so concurrent jobs never touch the same paths.
+    """
+
+    def __init__(self, files: Optional[Dict[str, bytes]] = None):
+        self.files: Dict[str, bytes] = dict(files or {})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.files
+
+    def copy(self) -> "PadnextWorkspace":
+        """Return a shallow copy, file contents are immutable bytes."""
+        return PadnextWorkspace(self.files)
+
+    def add_zip(self, zip_data: bytes) -> List[str]:
+        """
+        Extract a .zip archive into the workspace.
+
+        Files are stored under their base name, like the flat extraction
+        directory did before.
+
+        Args:
+            zip_data (bytes): The .zip archive.
+
+        Returns:
+            List[str]: The names of all files in the workspace after extraction.
+        """
+        with zipfile.ZipFile(io.BytesIO(zip_data), "r") as zip_ref:
+            for info in zip_ref.infolist():
+                if info.is_dir():
+                    continue
+                self.files[posixpath.basename(info.filename)] = zip_ref.read(info)
+        return self.names()
+
+    def names(self) -> List[str]:
+        return list(self.files)
+
+    def find(self, suffix: str) -> str:
+        """
+        Return the name of the first file ending with suffix.
+
+        Raises:
+            StopIteration: If no file ends with suffix.
+        """
+        return next(name for name in self.files if name.endswith(suffix))
+
+    def list_files_by_extension(self, extensions: Iterable[str]) -> List[str]:
+        return [name for name in self.files if name.endswith(tuple(extensions))]
+
+    def read(self, name: str) -> bytes:
+        return self.files[name]
+
+    def read_text(self, name: str, encoding: str = "ISO-8859-15") -> str:
+        return self.files[name].decode(encoding)
+
+    def write(self, name: str, data: bytes) -> None:
+        self.files[name] = data
+
+    def write_text(self, name: str, text: str, encoding: str = "ISO-8859-15") -> None:
+        self.files[name] = text.encode(encoding)
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        self.files[new_name] = self.files.pop(old_name)
+
+    def size(self, name: str) -> int:
+        return len(self.files[name])
+
+
+def zip_files(files: Dict[str, bytes]) -> bytes:
+    """
+    Create a .zip archive in memory.
+
+    Args:
+        files (Dict[str, bytes]): Archive member names and their contents.
+
+    Returns:
+        bytes: The .zip archive.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for name, data in files.items():
+            zipf.writestr(name, data)
+    return buffer.getvalue()
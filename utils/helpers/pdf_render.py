@@ -0,0 +1,370 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from utils.helpers.logger import logger
+
+# pdf2image renders at 200 DPI by default, keep the same resolution for the canvas
+DEFAULT_DPI = 200
+
+# Memory for rendered pages shared by all sessions, an A4 page at DEFAULT_DPI takes about 11 MB
+RENDER_CACHE_BYTES = int(float(os.getenv("PDF_RENDER_CACHE_MB", "64")) * 1024 * 1024)
+
+# OCR resolution of selections: small print needs more pixels than large blocks
+OCR_DPI_SMALL = int(os.getenv("OCR_DPI_SMALL", "300"))
+OCR_DPI_LARGE = int(os.getenv("OCR_DPI_LARGE", "150"))
+
+# Selections covering at least this share of the page are rendered at OCR_DPI_LARGE
+OCR_LARGE_REGION_AREA = float(os.getenv("OCR_LARGE_REGION_AREA", "0.2"))
+
+# Text layers with fewer characters in a region are ignored (e.g. stray page numbers on scans)
+MIN_TEXT_LAYER_CHARS = int(os.getenv("MIN_TEXT_LAYER_CHARS", "3"))
+
+# Text layers with a higher share of unmapped glyphs are ignored, OCR reads them better
+MAX_INVALID_CHAR_RATIO = 0.1
+
+# PyMuPDF is not thread-safe, all access to fitz documents goes through this lock
+_fitz_lock = threading.Lock()
+
+_cache_lock = threading.Lock()
+_page_count_cache: "OrderedDict[str, int]" = OrderedDict()
+_render_cache: "OrderedDict[Tuple[str, int, int], Image.Image]" = OrderedDict()
+_render_cache_bytes = 0
+
+
+def compute_file_hash(file_content: bytes) -> str:
+    """Return the hash used to identify a file in the render caches."""
+    return hashlib.md5(file_content).hexdigest()
+
+
+def _cache_get(cache: OrderedDict, key):
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    return None
+
+
+def _cache_put(cache: OrderedDict, key, value, max_size: int) -> None:
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+
+def _image_bytes(image: Image.Image) -> int:
+    return image.width * image.height * len(image.getbands())
+
+
+def _cache_put_page(key: Tuple[str, int, int], page_image: Image.Image) -> None:
+    """Cache a rendered page, evicting the least recently used ones beyond RENDER_CACHE_BYTES."""
+    global _render_cache_bytes
+    size = _image_bytes(page_image)
+    if size > RENDER_CACHE_BYTES:
+        return
+    with _cache_lock:
+        if key in _render_cache:
+            _render_cache_bytes -= _image_bytes(_render_cache.pop(key))
+        _render_cache[key] = page_image
+        _render_cache_bytes += size
+        while _render_cache_bytes > RENDER_CACHE_BYTES:
+            _, evicted = _render_cache.popitem(last=False)
+            _render_cache_bytes -= _image_bytes(evicted)
+
+
+def get_page_count(file_content: bytes, file_hash: Optional[str] = None) -> int:
+    """
+    Return the number of pages of a PDF without rasterizing it.
+
+    The page count is read from the PDF page tree and cached per file hash.
+
+    Args:
+        file_content (bytes): The raw PDF bytes.
+        file_hash (Optional[str]): Precomputed hash of the file. Computed if not provided.
+
+    Returns:
+        int: The number of pages in the PDF.
+    """
+    file_hash = file_hash or compute_file_hash(file_content)
+
+    page_count = _cache_get(_page_count_cache, file_hash)
+    if page_count is not None:
+        return page_count
+
+    import fitz
+
+    with _fitz_lock:
+        with fitz.open(stream=file_content, filetype="pdf") as document:
+            page_count = document.page_count
+
+    _cache_put(_page_count_cache, file_hash, page_count, max_size=128)
+    return page_count
+
+
+def render_page(
+    file_content: bytes,
+    page_num: int,
+    dpi: int = DEFAULT_DPI,
+    file_hash: Optional[str] = None,
+) -> Image.Image:
+    """
+    Render a single PDF page to an image.
+
+    Only the requested page is rasterized. Results are cached by
+    (file hash, page number, dpi), so repeated reruns do not render again.
+
+    Args:
+        file_content (bytes): The raw PDF bytes.
+        page_num (int): The 0-based page index.
+        dpi (int): The target resolution in dots per inch.
+        file_hash (Optional[str]): Precomputed hash of the file. Computed if not provided.
+
+    Returns:
+        Image.Image: The rendered page as RGB image.
+
+    Raises:
+        IndexError: If the page number is out of range.
+    """
+    file_hash = file_hash or compute_file_hash(file_content)
+    cache_key = (file_hash, page_num, dpi)
+
+    page_image = _cache_get(_render_cache, cache_key)
+    if page_image is not None:
+        return page_image
+
+    import fitz
+
+    with _fitz_lock:
+        with fitz.open(stream=file_content, filetype="pdf") as document:
+            if not 0 <= page_num < document.page_count:
+                raise IndexError(
+                    f"Page {page_num} out of range for document with {document.page_count} pages"
+                )
+            pixmap = document.load_page(page_num).get_pixmap(dpi=dpi, alpha=False)
+            page_image = Image.frombytes(
+                "RGB", (pixmap.width, pixmap.height), pixmap.samples
+            )
+
+    logger.info(f"Rendered page {page_num + 1} at {dpi} DPI")
+    _cache_put_page(cache_key, page_image)
+    return page_image
+
+
+def clear_render_cache(file_hash: Optional[str] = None) -> None:
+    """
+    Remove rendered pages from the cache.
+
+    Args:
+        file_hash (Optional[str]): Only remove entries of this file. Clears everything if None.
+    """
+    global _render_cache_bytes
+    with _cache_lock:
+        if file_hash is None:
+            _render_cache.clear()
+            _render_cache_bytes = 0
+            _page_count_cache.clear()
+            return
+
+        for key in [key for key in _render_cache if key[0] == file_hash]:
+            _render_cache_bytes -= _image_bytes(_render_cache.pop(key))
+        _page_count_cache.pop(file_hash, None)
+
+
+def select_region_dpi(selection: Dict[str, float]) -> int:
+    """
+    Return the OCR resolution for a selection.
+
+    Args:
+        selection (Dict[str, float]): Normalized coordinates ('left', 'top', 'width', 'height').
+
+    Returns:
+        int: OCR_DPI_LARGE for large blocks, OCR_DPI_SMALL otherwise.
+    """
+    area = selection["width"] * selection["height"]
+    return OCR_DPI_LARGE if area >= OCR_LARGE_REGION_AREA else OCR_DPI_SMALL
+
+
+def render_region(
+    file_content: bytes,
+    page_num: int,
+    selection: Dict[str, float],
+    dpi: Optional[int] = None,
+) -> Image.Image:
+    """
+    Render only the selected rectangle of a PDF page.
+
+    The clip is rasterized straight from the PDF, the whole page is never
+    allocated. Clips are not cached, the OCR region cache keeps their words.
+
+    Args:
+        file_content (bytes): The raw PDF bytes.
+        page_num (int): The 0-based page index.
+        selection (Dict[str, float]): Normalized coordinates ('left', 'top', 'width', 'height')
+            ranging from 0.0 to 1.0, relative to the rendered page.
+        dpi (Optional[int]): The target resolution. Chosen by select_region_dpi if not provided.
+
+    Returns:
+        Image.Image: The rendered selection as RGB image.
+
+    Raises:
+        IndexError: If the page number is out of range.
+        ValueError: If the selection does not overlap the page.
+    """
+    dpi = dpi or select_region_dpi(selection)
+
+    import fitz
+
+    with _fitz_lock:
+        with fitz.open(stream=file_content, filetype="pdf") as document:
+            if not 0 <= page_num < document.page_count:
+                raise IndexError(
+                    f"Page {page_num} out of range for document with {document.page_count} pages"
+                )
+            page = document.load_page(page_num)
+
+            # Unlike text extraction, the pixmap clip is given in rotated page coordinates
+            clip = _selection_rect(page, selection) & page.rect
+            if clip.is_empty:
+                raise ValueError("Invalid selection coordinates")
+
+            pixmap = page.get_pixmap(dpi=dpi, clip=clip, alpha=False)
+            region_image = Image.frombytes(
+                "RGB", (pixmap.width, pixmap.height), pixmap.samples
+            )
+            region_image.info["dpi"] = (dpi, dpi)
+
+    return region_image
+
+
+def _is_usable_text(text: str) -> bool:
+    """Check that an extracted text layer has enough readable characters."""
+    characters = "".join(text.split())
+    if len(characters) < MIN_TEXT_LAYER_CHARS:
+        return False
+    invalid = sum(
+        1 for char in characters if char == "\ufffd" or not char.isprintable()
+    )
+    return invalid / len(characters) <= MAX_INVALID_CHAR_RATIO
+
+
+def _selection_rect(page, selection: Dict[str, float]):
+    """Convert a normalized selection to a rect in rotated page coordinates."""
+    import fitz
+
+    width, height = page.rect.width, page.rect.height
+    return fitz.Rect(
+        selection["left"] * width,
+        selection["top"] * height,
+        (selection["left"] + selection["width"]) * width,
+        (selection["top"] + selection["height"]) * height,
+    )
+
+
+def extract_region_words(
+    file_content: bytes, page_num: int, selection: Dict[str, float]
+) -> Optional[List[Dict]]:
+    """
+    Read the words of the embedded text layer inside a selection of a PDF page.
+
+    Born-digital PDFs carry their text, reading it is much faster and more
+    accurate than OCR of the rendered page.
+
+    Args:
+        file_content (bytes): The raw PDF bytes.
+        page_num (int): The 0-based page index.
+        selection (Dict[str, float]): Normalized coordinates ('left', 'top', 'width', 'height')
+            ranging from 0.0 to 1.0, relative to the rendered page.
+
+    Returns:
+        Optional[List[Dict]]: The words inside the selection in reading order, each with
+            'text', 'bbox' (normalized (x0, y0, x1, y1) relative to the rendered page),
+            'conf' and 'line'. None if the region has no usable text layer (scanned or
+            image-only content).
+
+    Raises:
+        IndexError: If the page number is out of range.
+    """
+    import fitz
+
+    with _fitz_lock:
+        with fitz.open(stream=file_content, filetype="pdf") as document:
+            if not 0 <= page_num < document.page_count:
+                raise IndexError(
+                    f"Page {page_num} out of range for document with {document.page_count} pages"
+                )
+            page = document.load_page(page_num)
+
+            # Selections are relative to the rendered (rotated) page, text is
+            # extracted in unrotated page coordinates
+            clip = _selection_rect(page, selection)
+            entries = page.get_text(
+                "words", clip=clip * page.derotation_matrix, sort=True
+            )
+
+            width, height = page.rect.width, page.rect.height
+            words = []
+            for x0, y0, x1, y1, text, block, line, _ in entries:
+                rect = fitz.Rect(x0, y0, x1, y1) * page.rotation_matrix
+                words.append(
+                    {
+                        "text": text,
+                        "bbox": (
+                            rect.x0 / width,
+                            rect.y0 / height,
+                            rect.x1 / width,
+                            rect.y1 / height,
+                        ),
+                        "conf": 100.0,
+                        "line": (block, line),
+                    }
+                )
+
+    if not _is_usable_text(" ".join(word["text"] for word in words)):
+        return None
+    return words
+
+
+def redact_regions(
+    file_content: bytes,
+    boxes_per_page: Dict[int, List[Tuple[float, float, float, float]]],
+) -> bytes:
+    """
+    Black out boxes of PDF pages and remove everything underneath.
+
+    The redaction deletes the covered text from the text layer and blanks the
+    covered pixels of images, the boxes are not just painted over.
+
+    Args:
+        file_content (bytes): The raw PDF bytes.
+        boxes_per_page (Dict[int, List[Tuple[float, float, float, float]]]): Per 0-based page
+            index the normalized (x0, y0, x1, y1) boxes, relative to the rendered page.
+
+    Returns:
+        bytes: The redacted PDF.
+    """
+    import fitz
+
+    with _fitz_lock:
+        with fitz.open(stream=file_content, filetype="pdf") as document:
+            for page_num, boxes in boxes_per_page.items():
+                if not 0 <= page_num < document.page_count or not boxes:
+                    continue
+                page = document.load_page(page_num)
+                width, height = page.rect.width, page.rect.height
+                for x0, y0, x1, y1 in boxes:
+                    rect = fitz.Rect(x0 * width, y0 * height, x1 * width, y1 * height)
+                    # Redaction annotations are placed in unrotated page coordinates
+                    page.add_redact_annot(rect * page.derotation_matrix, fill=(0, 0, 0))
+                page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_PIXELS)
+            redacted = document.tobytes(garbage=3, deflate=True)
+
+    logger.info(
+        f"Redacted {sum(len(boxes) for boxes in boxes_per_page.values())} boxes "
+        f"on {sum(1 for boxes in boxes_per_page.values() if boxes)} pages"
+    )
+    return redacted
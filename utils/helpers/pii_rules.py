@@ -0,0 +1,161 @@
+import os
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+from utils.helpers.logger import logger
+
+# Punctuation allowed around dictionary words, it is part of the match
+WORD_PUNCTUATION = ",.!?;:"
+
+
+def build_trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Compile terms into a regex alternation shaped like a prefix tree.
+
+    Terms sharing a prefix share its branch, so the regex engine walks the
+    tree character by character instead of trying every term at every
+    position. Matching stays fast with thousands of terms.
+
+    Args:
+        terms (Iterable[str]): The terms, matched literally.
+
+    Returns:
+        str: The pattern, matching the longest term at a position first.
+    """
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        if not term:
+            continue
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a term
+
+    def compile_node(node: Dict[str, Any]) -> str:
+        ends_here = "" in node
+        branches = [
+            re.escape(char) + compile_node(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        pattern = "(?:" + "|".join(branches) + ")"
+        return pattern + "?" if ends_here else pattern
+
+    return compile_node(trie)
+
+
+def load_deny_lists(directory: str) -> Dict[str, List[str]]:
+    """
+    Read operator-supplied deny-lists, one file per entity type.
+
+    A file <ENTITY_TYPE>.txt (e.g. PERSON.txt for doctors, ORGANIZATION.txt for
+    practice names, LOCATION.txt for street names) holds one term per line.
+    Empty lines and lines starting with '#' are skipped.
+
+    Args:
+        directory (str): The directory with the deny-list files.
+
+    Returns:
+        Dict[str, List[str]]: The terms per entity type.
+    """
+    deny_lists: Dict[str, List[str]] = {}
+    if not directory or not os.path.isdir(directory):
+        return deny_lists
+
+    for name in sorted(os.listdir(directory)):
+        entity_type, extension = os.path.splitext(name)
+        if extension != ".txt":
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            terms = [
+                line.strip()
+                for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+        deny_lists.setdefault(entity_type.upper(), []).extend(terms)
+        logger.info(f"Loaded {len(terms)} {entity_type.upper()} deny-list terms")
+    return deny_lists
+
+
+class RuleEngine:
+    """
+    Finds rule-based PII in a single pass over the text.
+
+    All rules, i.e. regular expressions and word dictionaries, are compiled
+    into one pattern with a named group per rule. Dictionaries become prefix
+    trees inside that pattern. Matches do not overlap; at a position the
+    first rule that matches wins: deny-lists, then patterns, then words, each
+    in the order they were given.
+    """
+
+    def __init__(
+        self,
+        patterns: List[Tuple[str, str]],
+        words: List[Tuple[str, Iterable[str]]],
+        deny_lists: Dict[str, Iterable[str]],
+    ):
+        """
+        Compile the rules.
+
+        Args:
+            patterns (List[Tuple[str, str]]): (entity type, regex) rules. Use non-capturing
+                groups inside the regexes.
+            words (List[Tuple[str, Iterable[str]]]): (entity type, words) rules. A word
+                matches a whole whitespace-separated token, case-insensitively, with
+                surrounding WORD_PUNCTUATION.
+            deny_lists (Dict[str, Iterable[str]]): Terms per entity type. A term matches
+                case-insensitively when it is not part of a longer word.
+        """
+        self._group_types: Dict[str, str] = {}
+        alternatives = []
+
+        def add(entity_type: str, pattern: str) -> None:
+            group = f"rule{len(self._group_types)}"
+            self._group_types[group] = entity_type
+            alternatives.append(f"(?P<{group}>{pattern})")
+
+        # Deny-list terms go first, they may contain words matched by other rules
+        for entity_type, terms in deny_lists.items():
+            trie = build_trie_pattern({term.lower() for term in terms})
+            if trie:
+                add(entity_type, rf"(?<!\w){trie}(?!\w)")
+
+        for entity_type, pattern in patterns:
+            add(entity_type, pattern)
+
+        punctuation = f"[{re.escape(WORD_PUNCTUATION)}]*"
+        for entity_type, entries in words:
+            trie = build_trie_pattern({entry.lower() for entry in entries})
+            if trie:
+                add(entity_type, rf"(?<!\S){punctuation}{trie}{punctuation}(?!\S)")
+
+        self.rules = len(alternatives)
+        self._pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def find(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Find the PII of all rules in the text.
+
+        Args:
+            text (str): The text to search.
+
+        Returns:
+            List[Dict[str, Any]]: The matches in text order with 'original_word',
+                'entity_type', 'start', 'end' and 'score' (1.0).
+        """
+        if not self.rules:
+            return []
+        return [
+            {
+                "original_word": match.group(),
+                "entity_type": self._group_types[match.lastgroup],
+                "start": match.start(),
+                "end": match.end(),
+                "score": 1.0,  # Exact rule matches
+            }
+            for match in self._pattern.finditer(text)
+        ]
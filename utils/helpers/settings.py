@@ -6,6 +6,7 @@ import streamlit as st
 from streamlit_cookies_controller import CookieController
 
 from utils.helpers.api import get_workflows, test_api
+from utils.helpers.http_client import warm_up_connection
 
 # Initialize the cookie controller
 controller = CookieController()
@@ -121,4 +122,5 @@ def settings_sidebar() -> None:
             if st.button("Save Settings"):
                 with st.spinner("Speichern der Einstellungen..."):
                     save_settings_to_cookies()
+                    warm_up_connection(st.session_state.api_url)
                     st.success("Einstellungen erfolgreich gespeichert!")
@@ -1,24 +1,82 @@
 import os
+import sys
+import threading
+from collections import deque
 from datetime import datetime
+from typing import Dict, Iterable, Optional
 
 import streamlit as st
 from opentelemetry import metrics
 from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+from opentelemetry.metrics import CallbackOptions, Observation
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import Resource
 
-from utils.helpers.logger import logger
-from utils.helpers.otlp_connection import check_otlp_connection
+from utils.helpers.logger import OTLP_BUFFER_SIZE, logger
+from utils.helpers.otlp_connection import get_otlp_connection
+
+# Statistics of the processing pipeline exported through the pipeline_stats gauge:
+# component -> (module, function returning the stats). Components whose module was
+# not imported by the process are skipped.
+PIPELINE_STATS = {
+    "ner_service": ("utils.helpers.ner_service", "get_ner_service_stats"),
+    "xsd_validation": ("utils.helpers.xsd_cache", "get_validation_stats"),
+    "ocr_regions": ("utils.helpers.ocr", "get_region_source_stats"),
+    "ner_cache": ("utils.helpers.anonymization", "get_ner_cache_stats"),
+}
+
+
+def _observe_pipeline_stats(options: CallbackOptions) -> Iterable[Observation]:
+    """Read the statistics of every pipeline component, one observation per value."""
+    for component, (module_name, function_name) in PIPELINE_STATS.items():
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        try:
+            stats = getattr(module, function_name)()
+        except Exception as e:
+            logger.error(f"Failed to read {component} statistics: {e}")
+            continue
+        for name, value in stats.items():
+            if isinstance(value, dict):
+                # Statistics per item, e.g. per schema
+                for stat, number in value.items():
+                    yield Observation(
+                        number, {"component": component, "item": name, "stat": stat}
+                    )
+            else:
+                yield Observation(value, {"component": component, "stat": name})
 
 
 class StreamlitTelemetryManager:
     def __init__(self):
-        """Initialize telemetry manager."""
+        """
+        Initialize telemetry manager.
+
+        The meter provider is set up in a background thread. Feedback durations
+        recorded before it is ready are buffered and replayed once it is.
+        """
         self._telemetry_enabled = False
         self._meter_provider = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = deque(maxlen=OTLP_BUFFER_SIZE)
+        threading.Thread(
+            target=self._start, name="otlp-metrics-init", daemon=True
+        ).start()
+
+    def _start(self):
+        """Set up the meter provider and replay the buffered records."""
         self._initialize_telemetry()
         self._define_metrics()
+        with self._lock:
+            self._ready.set()
+            if not self._telemetry_enabled and self._pending:
+                logger.warning("Telemetry is disabled; buffered metrics dropped.")
+                self._pending.clear()
+            while self._pending:
+                self._record(*self._pending.popleft())
 
     def _initialize_telemetry(self):
         """Set up OTLP metrics exporter and meter provider."""
@@ -31,7 +89,7 @@ class StreamlitTelemetryManager:
 
             logger.info(f"Initializing telemetry for {service_name} in {environment}")
 
-            success, formatted_endpoint = check_otlp_connection(endpoint)
+            success, formatted_endpoint = get_otlp_connection(endpoint)
             if not success:
                 raise Exception("OTLP connection failed.")
 
@@ -75,9 +133,15 @@ class StreamlitTelemetryManager:
                 description="Total cumulative feedback time in seconds",
                 unit="seconds",
             )
+            meter.create_observable_gauge(
+                "pipeline_stats",
+                callbacks=[_observe_pipeline_stats],
+                description="Queue depth, batch sizes, latencies and cache hit rates of the processing pipeline",
+            )
             logger.info("Metrics defined successfully.")
         except Exception as e:
             logger.error(f"Failed to define metrics: {e}", exc_info=True)
+            self._telemetry_enabled = False
 
     def record_feedback_duration(self, feedback_start_time):
         """
@@ -85,7 +149,7 @@ class StreamlitTelemetryManager:
         :param feedback_start_time: The start time of the feedback session.
         """
         try:
-            if not self._telemetry_enabled:
+            if self._ready.is_set() and not self._telemetry_enabled:
                 logger.warning("Telemetry is disabled; feedback not recorded.")
                 return
             if not feedback_start_time:
@@ -98,13 +162,24 @@ class StreamlitTelemetryManager:
             # Record metrics with API key from Streamlit session state
             api_key = getattr(st.session_state, "api_key", "unknown")
             attributes = {"api_key": api_key}
-            self.feedback_duration_histogram.record(duration, attributes)
-            self.feedback_time_total.add(duration, attributes)
+            with self._lock:
+                if self._ready.is_set():
+                    self._record(duration, attributes)
+                else:
+                    # Exporter not ready yet, replayed by _start
+                    self._pending.append((duration, attributes))
 
             logger.info(f"Feedback recorded: {duration} seconds for API key: {api_key}")
         except Exception as e:
             logger.error(f"Failed to record feedback duration: {e}", exc_info=True)
 
+    def _record(self, duration: float, attributes: Dict[str, str]):
+        """Record a feedback duration if telemetry is enabled."""
+        if not self._telemetry_enabled:
+            return
+        self.feedback_duration_histogram.record(duration, attributes)
+        self.feedback_time_total.add(duration, attributes)
+
     def shutdown(self):
         """Shut down the telemetry resources."""
         if self._meter_provider:
@@ -113,6 +188,25 @@ class StreamlitTelemetryManager:
             logger.info("Telemetry meter provider shut down successfully.")
 
 
+_manager: Optional[StreamlitTelemetryManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_telemetry_manager() -> StreamlitTelemetryManager:
+    """
+    Return the process-wide telemetry manager, starting it on first use.
+
+    Returns:
+        StreamlitTelemetryManager: The shared telemetry manager.
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = StreamlitTelemetryManager()
+    return _manager
+
+
 def track_api_response():
     """
     Call this function when API results are received.
@@ -139,7 +233,7 @@ def track_user_feedback(feedback_start_time):
     """
     try:
         logger.info("Tracking user feedback.")
-        manager = StreamlitTelemetryManager()
+        manager = get_telemetry_manager()
         manager.record_feedback_duration(feedback_start_time)
         logger.info("User feedback tracked successfully.")
     except Exception as e:
@@ -1,16 +1,18 @@
 from datetime import date, datetime
 from decimal import ROUND_HALF_UP, Decimal
-from typing import Any, Dict, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
 import pandas as pd
 import streamlit as st
-from xsdata.models.datatype import XmlDateTime  # Import the XmlDateTime class
 
-from schemas.padnext_v2_py.padx_basis_v2_12 import GozifferTyp, LeistungspositionTyp
-from utils.helpers.db import read_in_goa
+from utils.helpers.db import get_goa_catalog
 from utils.helpers.logger import logger
 from utils.utils import find_zitat_in_text
 
+# The PADnext dataclass modules are large, they are imported when a PADnext file is built
+if TYPE_CHECKING:
+    from schemas.padnext_v2_py.padx_basis_v2_12 import GozifferTyp
+
 
 def annotate_text_update() -> None:
     """
@@ -136,54 +138,27 @@ def df_to_items(df: pd.DataFrame) -> List[Dict[str, Any]]:
         List[Dict[str, Any]]: A list of dictionaries, each representing a billing item.
     """
     items = []
-    goa = read_in_goa(fully=True)
-
-    for _, row in df.iterrows():
-        goa_item = goa[goa["GOÄZiffer"] == row["ziffer"]]
-        analog_ziffer = False
-
-        if goa_item.empty:
-            goa_analog_ziffer = row["ziffer"].replace(" A", "")
-            goa_item = goa[goa["GOÄZiffer"] == goa_analog_ziffer]
-            if goa_item.empty:
-                logger.error(
-                    f"No matching GOÄZiffer for analog Ziffer {goa_analog_ziffer}"
-                )
-                continue
-            analog_ziffer = True
-
-        intensity = row["faktor"]
-        intensity_str_period = f"{intensity:.1f}"
-        intensity_str_comma = intensity_str_period.replace(".", ",")
-
-        matching_columns = goa_item.columns[
-            goa_item.apply(
-                lambda col: col.astype(str).str.contains(
-                    f"(?:{intensity_str_period}|{intensity_str_comma})"
-                )
-            ).any()
-        ]
-
-        if matching_columns.empty:
-            matching_columns = ["Regelhöchstfaktor"]
-
-        column_name = matching_columns[0]
-        faktor = intensity
+    prices = get_goa_catalog().price_table(df)
 
-        preis = _calculate_price(goa_item, column_name, faktor)
+    for (_, row), price in zip(df.iterrows(), prices.itertuples(index=False)):
+        if not price.found:
+            logger.error(
+                f"No matching GOÄZiffer for analog Ziffer {row['ziffer'].replace(' A', '')}"
+            )
+            continue
 
         item = {
             "ziffer": row["ziffer"],
             "anzahl": row["anzahl"],
-            "intensitat": intensity,
+            "intensitat": row["faktor"],
             "beschreibung": row["text"],
-            "Punktzahl": goa_item["Punktzahl"].values[0],
-            "preis": preis,
-            "faktor": faktor,
-            "total": preis * int(row["anzahl"]),
+            "Punktzahl": price.Punktzahl,
+            "preis": price.preis,
+            "faktor": row["faktor"],
+            "total": price.total,
             "auslagen": "",
             "date": "",
-            "analog_ziffer": analog_ziffer,
+            "analog_ziffer": price.analog_ziffer,
         }
 
         items.append(item)
@@ -197,32 +172,6 @@ def df_to_items(df: pd.DataFrame) -> List[Dict[str, Any]]:
     return items
 
 
-def _calculate_price(goa_item: pd.DataFrame, column_name: str, faktor: float) -> float:
-    """
-    Calculate the price based on the GOÄ item and factor.
-
-    Args:
-        goa_item (pd.DataFrame): The GOÄ item DataFrame.
-        column_name (str): The name of the column to use for price calculation.
-        faktor (float): The intensity factor.
-
-    Returns:
-        float: The calculated price.
-    """
-    if column_name == "Einfachfaktor":
-        return float(goa_item["Einfachsatz"].values[0].replace(",", "."))
-    elif column_name == "Regelhöchstfaktor":
-        return float(goa_item["Regelhöchstsatz"].values[0].replace(",", "."))
-    elif column_name == "Höchstfaktor":
-        return float(goa_item["Höchstsatz"].values[0].replace(",", "."))
-    elif faktor < 2:
-        return float(goa_item["Einfachsatz"].values[0].replace(",", "."))
-    elif faktor < 3:
-        return float(goa_item["Regelhöchstsatz"].values[0].replace(",", "."))
-    else:
-        return float(goa_item["Höchstsatz"].values[0].replace(",", "."))
-
-
 def format_euro(value):
     """
     Manually formats a float value as a Euro string in German format.
@@ -247,7 +196,7 @@ def format_euro(value):
     return f"{formatted_value} €"
 
 
-def transform_df_to_goziffertyp(df: pd.DataFrame) -> List[GozifferTyp]:
+def transform_df_to_goziffertyp(df: pd.DataFrame) -> List["GozifferTyp"]:
     """
     Transforms a pandas DataFrame into a list of GozifferTyp objects.
 
@@ -262,6 +211,11 @@ def transform_df_to_goziffertyp(df: pd.DataFrame) -> List[GozifferTyp]:
     Returns:
         List[GozifferTyp]: A list of successfully created GozifferTyp objects.
     """
+    from schemas.padnext_v2_py.padx_basis_v2_12 import (
+        GozifferTyp,
+        LeistungspositionTyp,
+    )
+
     today = date.today().strftime("%Y-%m-%d")  # Format today's date as 'YYYY-MM-DD'
     goziffer_objects = []
 
@@ -368,6 +322,8 @@ def format_erstellungsdatum(erstellungsdatum):
     Converts the erstellungsdatum to the JJJJMMTT (YYYYMMDD) format.
     Handles both datetime objects and strings in ISO format.
     """
+    from xsdata.models.datatype import XmlDateTime
+
     try:
         # If erstellungsdatum is already a datetime object, format it
         if isinstance(erstellungsdatum, datetime):
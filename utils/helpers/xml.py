@@ -1,55 +1,31 @@
-from pathlib import Path
-
 from xsdata.formats.dataclass.parsers import XmlParser
 from xsdata.formats.dataclass.serializers import XmlSerializer
 from xsdata.formats.dataclass.serializers.config import SerializerConfig
 
 
-def read_xml_file(filepath: str, encoding: str = "ISO-8859-15") -> str:
+def parse_xml_string(xml_content: str, dataclass_type):
     """
-    Reads an XML file using the specified encoding.
+    Parses XML content and converts it into a Python object of the specified dataclass type.
 
     Args:
-        filepath (str): Path to the XML file.
-        encoding (str): The encoding of the XML file (default is 'ISO-8859-15').
-
-    Returns:
-        str: The XML content as a string.
-    """
-    with open(filepath, "r", encoding=encoding) as file:
-        return file.read()
-
-
-def read_xml_to_object(file_path: str, dataclass_type):
-    """
-    Parses an XML file and converts it into a Python object of the specified dataclass type.
-
-    Args:
-        file_path (str): Path to the XML file.
+        xml_content (str): The XML content as a string.
         dataclass_type: The dataclass type to which the XML should be converted.
 
     Returns:
-        object: An instance of the specified dataclass type populated with data from the XML file.
+        object: An instance of the specified dataclass type populated with data from the XML.
     """
-    parser = XmlParser()
-
-    # Read XML into a Python object
-    with open(file_path, "r", encoding="iso-8859-15") as f:
-        xml_object = parser.from_string(f.read(), dataclass_type)
-
-    return xml_object
+    return XmlParser().from_string(xml_content, dataclass_type)
 
 
-def write_object_to_xml(obj, output_path: str):
+def serialize_object_to_xml(obj) -> str:
     """
-    Serializes a Python object to an XML file with pre-processing to replace non-encodable characters.
+    Serializes a Python object to an XML string with pre-processing to replace non-encodable characters.
 
     Args:
         obj: The Python object to serialize.
-        output_path (str): Path where the XML file will be written.
 
     Returns:
-        str: The path to the written XML file.
+        str: The XML string, restricted to characters encodable in iso-8859-15.
     """
     # Create a serializer configuration for pretty printing
     config = SerializerConfig(pretty_print=True)
@@ -65,33 +41,4 @@ def write_object_to_xml(obj, output_path: str):
     # Add more replacements as needed
 
     # Encode to iso-8859-15 with 'replace' to substitute unencodable characters
-    encoded_xml_str = xml_str.encode("iso-8859-15", errors="replace").decode(
-        "iso-8859-15"
-    )
-
-    # Write the processed XML to file
-    with open(output_path, "w", encoding="iso-8859-15") as f:
-        f.write(encoded_xml_str)
-
-    return output_path
-
-
-def process_xml(xml_path: Path, validator_func, error_message: str):
-    """
-    Processes an XML file by reading its content and validating it using a provided function.
-
-    Args:
-        xml_path (Path): Path to the XML file.
-        validator_func (function): A function that takes the XML content as input and returns a boolean indicating its validity.
-        error_message (str): The error message to raise if validation fails.
-
-    Returns:
-        str: The XML content as a string.
-
-    Raises:
-        ValueError: If the XML content does not pass validation.
-    """
-    xml_content = read_xml_file(xml_path)
-    if not validator_func(xml_content):
-        raise ValueError(error_message)
-    return xml_content
+    return xml_str.encode("iso-8859-15", errors="replace").decode("iso-8859-15")
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from io import StringIO
+from typing import Dict, List, Optional
+
+import xmlschema
+
+from utils.helpers.logger import logger
+
+# Pickled schemas are written here at build time, see scripts/compile_padnext_schemas.py
+SCHEMA_CACHE_DIR = os.getenv("SCHEMA_CACHE_DIR", "schemas/padnext_v2/compiled")
+
+_schemas: Dict[str, xmlschema.XMLSchema] = {}
+_schemas_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_validation_stats: Dict[str, Dict[str, float]] = {}
+
+
+def _source_hash(xsd_path: str) -> str:
+    """Hash all XSD files next to the schema and the xmlschema version."""
+    sha256 = hashlib.sha256(xmlschema.__version__.encode("utf-8"))
+    schema_dir = os.path.dirname(xsd_path) or "."
+    for name in sorted(os.listdir(schema_dir)):
+        if name.endswith(".xsd"):
+            with open(os.path.join(schema_dir, name), "rb") as f:
+                sha256.update(name.encode("utf-8"))
+                sha256.update(f.read())
+    return sha256.hexdigest()
+
+
+def _pickle_path(xsd_path: str) -> str:
+    return os.path.join(SCHEMA_CACHE_DIR, f"{os.path.basename(xsd_path)}.pickle")
+
+
+def _load_pickled_schema(xsd_path: str) -> Optional[xmlschema.XMLSchema]:
+    """Load a pickled schema if it exists and matches the current XSD files."""
+    pickle_path = _pickle_path(xsd_path)
+    if not os.path.exists(pickle_path):
+        return None
+
+    try:
+        with open(pickle_path, "rb") as f:
+            cached = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load pickled schema {pickle_path}: {e}")
+        return None
+
+    if cached.get("source_hash") != _source_hash(xsd_path):
+        logger.warning(f"Pickled schema {pickle_path} is outdated, recompiling")
+        return None
+
+    return cached["schema"]
+
+
+def get_schema(xsd_path: str) -> xmlschema.XMLSchema:
+    """
+    Return the compiled schema for an XSD file.
+
+    The schema is compiled (or loaded from its pickle) once per process and
+    shared by all validations.
+
+    Args:
+        xsd_path (str): Path to the XSD file.
+
+    Returns:
+        xmlschema.XMLSchema: The compiled schema.
+    """
+    schema = _schemas.get(xsd_path)
+    if schema is not None:
+        return schema
+
+    with _schemas_lock:
+        schema = _schemas.get(xsd_path)
+        if schema is None:
+            start_time = time.perf_counter()
+            schema = _load_pickled_schema(xsd_path)
+            source = "pickle"
+            if schema is None:
+                schema = xmlschema.XMLSchema(xsd_path)
+                source = "XSD"
+            logger.info(
+                f"Loaded schema {xsd_path} from {source} in "
+                f"{(time.perf_counter() - start_time) * 1000:.0f} ms"
+            )
+            _schemas[xsd_path] = schema
+    return schema
+
+
+def build_schema_cache(xsd_paths: List[str]) -> None:
+    """
+    Compile the given XSD files and pickle them to SCHEMA_CACHE_DIR.
+
+    Args:
+        xsd_paths (List[str]): Paths to the XSD files.
+    """
+    os.makedirs(SCHEMA_CACHE_DIR, exist_ok=True)
+    for xsd_path in xsd_paths:
+        schema = xmlschema.XMLSchema(xsd_path)
+        with open(_pickle_path(xsd_path), "wb") as f:
+            pickle.dump(
+                {"source_hash": _source_hash(xsd_path), "schema": schema},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        logger.info(f"Pickled schema {xsd_path} to {_pickle_path(xsd_path)}")
+
+
+def _record_validation(name: str, duration_ms: float, valid: bool) -> None:
+    with _stats_lock:
+        stats = _validation_stats.setdefault(
+            name, {"count": 0, "invalid": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        stats["count"] += 1
+        stats["invalid"] += 0 if valid else 1
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
+
+def validate_xml(xsd_path: str, xml_content: str, name: str) -> None:
+    """
+    Validate XML content against a cached schema and record the validation time.
+
+    Args:
+        xsd_path (str): Path to the XSD file.
+        xml_content (str): The XML content as a string.
+        name (str): Name used for the timing metrics, e.g. "auf" or "padx".
+
+    Raises:
+        xmlschema.XMLSchemaValidationError: If the XML is not valid.
+    """
+    schema = get_schema(xsd_path)
+    start_time = time.perf_counter()
+    valid = False
+    try:
+        schema.validate(StringIO(xml_content))
+        valid = True
+    finally:
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        _record_validation(name, duration_ms, valid)
+        logger.info(f"Validated {name} XML in {duration_ms:.1f} ms (valid: {valid})")
+
+
+def get_validation_stats() -> Dict[str, Dict[str, float]]:
+    """Return validation counts and timings per schema name."""
+    with _stats_lock:
+        return {
+            name: {
+                **stats,
+                "avg_ms": stats["total_ms"] / stats["count"] if stats["count"] else 0.0,
+            }
+            for name, stats in _validation_stats.items()
+        }
@@ -14,9 +14,10 @@ def reset() -> None:
     st.session_state.annotated_text_object = []
     st.session_state.df = pd.DataFrame()
     st.session_state.analyze_api_response = None
+    st.session_state.analyze_request_id = None
     st.session_state.ocr_api_response = None
     st.session_state.pad_ready = False
-    st.session_state.pad_data_path = None
+    st.session_state.pad_workspace = None
     st.session_state.pad_data_ready = False
     st.session_state.ziffer_to_edit = None
     st.session_state.pdf_ready = False
@@ -64,10 +65,11 @@ def initialize_session_state(settings: Optional[Dict[str, Any]] = None) -> None:
     st.session_state.setdefault("pdf_data", None)
     st.session_state.setdefault("pdf_report_data", None)
     st.session_state.setdefault("analyze_api_response", None)
+    st.session_state.setdefault("analyze_request_id", None)
     st.session_state.setdefault("ocr_api_response", None)
     st.session_state.setdefault("user_comment", None)
     st.session_state.setdefault("pad_ready", False)
-    st.session_state.setdefault("pad_data_path", None)
+    st.session_state.setdefault("pad_workspace", None)
     st.session_state.setdefault("pad_data_ready", False)
     st.session_state.setdefault("arzt_hash", None)
     st.session_state.setdefault("kassenname_hash", None)
@@ -13,12 +13,8 @@ from utils.helpers.api import (
     check_if_default_credentials,
     ocr_pdf_to_text_api,
 )
-from utils.helpers.files import (
-    create_uploaded_file_from_binary,
-    list_files_by_extension,
-)
+from utils.helpers.files import create_uploaded_file_from_binary
 from utils.helpers.logger import logger
-from utils.helpers.padnext import handle_padnext_upload
 from utils.helpers.telemetry import track_api_response
 from utils.helpers.transform import annotate_text_update
 from utils.stages.pad_modal import pad_file_modal
@@ -250,10 +246,12 @@ def analyze_stage() -> None:
         and not st.session_state.uploaded_file
     ):
         try:
-            padx_folder_path = handle_padnext_upload(uploaded_file)
-            st.session_state.pad_data_path = padx_folder_path
-            all_files = list_files_by_extension(padx_folder_path, ["pdf", "png", "jpg"])
-            pad_file_modal(all_files)
+            from utils.helpers.padnext import handle_padnext_upload
+
+            pad_workspace = handle_padnext_upload(uploaded_file)
+            st.session_state.pad_workspace = pad_workspace
+            all_files = pad_workspace.list_files_by_extension(["pdf", "png", "jpg"])
+            pad_file_modal(pad_workspace, all_files)
         except Exception as e:
             logger.error(f"Error handling PADnext file: {e}")
             st.error(f"Fehler beim Verarbeiten der PADnext-Datei: {e}")
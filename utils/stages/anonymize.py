@@ -1,18 +1,40 @@
+import os
 from typing import Dict, List, Optional, Tuple
 
 import streamlit as st
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
-from utils.helpers.anonymization import anonymize_text
+from utils.helpers.anonymization import (
+    NER_MODEL_TIERS,
+    anonymize_text,
+    automatic_model_tiers,
+    is_model_ready,
+)
 from utils.helpers.canvas import (
     base_display_file_selection_interface,
     cleanup_session_state,
     sort_selections,
 )
 from utils.helpers.logger import logger
-from utils.helpers.ocr import perform_ocr_on_file
+from utils.helpers.ocr import (
+    find_entity_boxes,
+    perform_ocr_on_file,
+    perform_ocr_with_layout,
+)
+from utils.helpers.pdf_render import redact_regions
 from utils.stages.rechnung_anonymize import process_selected_areas
 
+# Black out detected entities in the PDF before it is combined with the invoice. Adds
+# an OCR and NER pass to the PDF button, off unless enabled.
+AUTO_REDACT_PDF = os.getenv("AUTO_REDACT_PDF", "false").lower() == "true"
+
+MODEL_TIER_LABELS = {
+    "auto": "Automatisch",
+    "fast": "Schnell",
+    "balanced": "Ausgewogen",
+    "accurate": "Genau",
+}
+
 
 def _display_instructions(column: st.delta_generator.DeltaGenerator) -> None:
     """Display instructions for using the file selection interface."""
@@ -59,11 +81,23 @@ def display_file_selection_interface(
 
 
 def process_pdf_selections(
-    uploaded_file: UploadedFile, selections: List[List[Dict[str, float]]]
+    uploaded_file: UploadedFile,
+    selections: List[List[Dict[str, float]]],
+    tier: Optional[str] = None,
 ) -> bytes:
-    """Process the selected areas from the PDF and create bericht.pdf."""
+    """
+    Process the selected areas from the PDF and create bericht.pdf.
+
+    With AUTO_REDACT_PDF the selections are extracted and anonymized first and
+    the detected entities are redacted in the PDF, located through the word
+    boxes of the same extraction pass.
+    """
     try:
         file_content = uploaded_file.getvalue()
+        if AUTO_REDACT_PDF:
+            file_content = redact_entities(
+                uploaded_file, file_content, selections, tier
+            )
         processed_pdf = process_selected_areas(file_content, selections)
         return processed_pdf
     except Exception as e:
@@ -71,6 +105,35 @@ def process_pdf_selections(
         raise e
 
 
+def redact_entities(
+    uploaded_file: UploadedFile,
+    file_content: bytes,
+    selections: List[List[Dict[str, float]]],
+    tier: Optional[str] = None,
+) -> bytes:
+    """
+    Redact the entities detected in the selections of a PDF.
+
+    Args:
+        uploaded_file (UploadedFile): The uploaded PDF.
+        file_content (bytes): The raw bytes of the uploaded PDF.
+        selections (List[List[Dict[str, float]]]): Selections with normalized coordinates per page.
+        tier (Optional[str]): The NER model tier. Chosen by the length of the text if not provided.
+
+    Returns:
+        bytes: The PDF with every word of a detected entity blacked out.
+    """
+    text, words = perform_ocr_with_layout(uploaded_file, selections=selections)
+    if not text.strip():
+        return file_content
+    entities = anonymize_text(text, tier=tier)["detected_entities"]
+    boxes = find_entity_boxes(words, entities)
+    logger.info(
+        f"Redacting {len(entities)} entities in {sum(map(len, boxes.values()))} word boxes"
+    )
+    return redact_regions(file_content, boxes)
+
+
 def anonymize_stage() -> None:
     """Display the anonymize stage and handle the anonymization process."""
     if "uploaded_file" not in st.session_state:
@@ -79,10 +142,30 @@ def anonymize_stage() -> None:
 
     left_column, right_column = st.columns([1, 1])
 
+    # The tier chosen below on the previous run, "auto" may use any automatic tier
+    model_tier = st.session_state.get("ner_model_tier", "auto")
+    tiers = automatic_model_tiers() if model_tier == "auto" else [model_tier]
+    if not all(map(is_model_ready, tiers)):
+        left_column.info(
+            "Das Anonymisierungsmodell wird im Hintergrund geladen. "
+            "Die erste Anonymisierung kann daher etwas länger dauern.",
+            icon="⏳",
+        )
+
     selections, has_selections = display_file_selection_interface(
         st.session_state.uploaded_file, left_column, right_column
     )
 
+    model_tier = st.selectbox(
+        "Erkennungsmodell",
+        options=["auto"]
+        + [tier for tier in NER_MODEL_TIERS if tier in MODEL_TIER_LABELS],
+        format_func=MODEL_TIER_LABELS.get,
+        help="Schnellere Modelle erkennen weniger Namen und Orte zuverlässig.",
+        key="ner_model_tier",
+    )
+    tier = None if model_tier == "auto" else model_tier
+
     # Create two columns for the buttons
     col1, col2 = st.columns(2)
 
@@ -98,7 +181,7 @@ def anonymize_stage() -> None:
                     extracted_text = perform_ocr_on_file(
                         st.session_state.uploaded_file, selections=sorted_selections
                     )
-                    anonymize_result = anonymize_text(extracted_text)
+                    anonymize_result = anonymize_text(extracted_text, tier=tier)
 
                     st.session_state.anonymized_text = anonymize_result[
                         "anonymized_text"
@@ -128,7 +211,7 @@ def anonymize_stage() -> None:
                 try:
                     sorted_selections = sort_selections(selections)
                     processed_pdf = process_pdf_selections(
-                        st.session_state.uploaded_file, sorted_selections
+                        st.session_state.uploaded_file, sorted_selections, tier
                     )
 
                     # Store the processed PDF in session state
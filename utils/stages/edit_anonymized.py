@@ -2,7 +2,6 @@ import io
 from typing import List, Tuple, Union
 
 import streamlit as st
-from pdf2image import convert_from_bytes
 from PIL import Image
 from streamlit.delta_generator import DeltaGenerator
 from streamlit.runtime.uploaded_file_manager import UploadedFile
@@ -50,6 +49,8 @@ def display_uploaded_file(
         if isinstance(uploaded_file, Image.Image):
             column.image(uploaded_file, use_column_width=True)
         elif uploaded_file.type == "application/pdf":
+            from pdf2image import convert_from_bytes
+
             pdf_pages = convert_from_bytes(uploaded_file.getvalue())
             if pdf_pages:
                 for pdf_image in pdf_pages:
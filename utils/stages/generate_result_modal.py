@@ -4,7 +4,6 @@ import pandas as pd
 import streamlit as st
 
 from utils.helpers.api import generate_pdf
-from utils.helpers.padnext import generate_pad, generate_padnext
 from utils.stages.feedback_modal import feedback_form, process_and_send_feedback
 
 # Define options for 'Minderung Prozentsatz'
@@ -67,9 +66,13 @@ def rechnung_erstellen_modal(df: pd.DataFrame, generate: Optional[str] = None) -
                 except Exception as e:
                     st.error(f"Failed to generate PDF : {str(e)}")
             elif generate == "pad_positionen":
+                from utils.helpers.padnext import generate_pad
+
                 st.session_state.pad_data = generate_pad(df)
                 st.session_state.pad_ready = True
             elif generate == "pad_next":
+                from utils.helpers.padnext import generate_padnext
+
                 pad_data_ready = generate_padnext(df)
                 st.session_state.pad_data_ready = pad_data_ready
 
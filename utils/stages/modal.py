@@ -4,7 +4,7 @@ import pandas as pd
 import streamlit as st
 from streamlit_annotation_tools import text_labeler
 
-from utils.helpers.db import read_in_goa
+from utils.helpers.db import get_goa_catalog, read_in_goa
 from utils.helpers.logger import logger
 from utils.helpers.transform import (
     annotate_text_update,
@@ -58,20 +58,15 @@ def determine_additional_fields(
 
     Args:
         ziffer_data (Dict[str, Union[str, int, float, None]]): The current ziffer data.
-        ziffer_dataframe (pd.DataFrame): The DataFrame with GOÄ data for ziffer calculations.
 
     Returns:
         Dict[str, Union[float, str, None]]: A dictionary containing the additional field values.
     """
-    ziffer_dataframe: pd.DataFrame = read_in_goa()  # Load ziffer data
-
     analog = ziffer_data.get("analog", None)
     # ziffer_selected = analog if analog else ziffer_data["ziffer"]
     ziffer_selected = ziffer_data["ziffer"]
 
-    einzelbetrag = calculate_einzelbetrag(
-        ziffer_data["faktor"], ziffer_selected, ziffer_dataframe
-    )
+    einzelbetrag = calculate_einzelbetrag(ziffer_data["faktor"], ziffer_selected)
     gesamtbetrag = calculate_gesamtbetrag(einzelbetrag, ziffer_data["anzahl"])
 
     return {
@@ -184,7 +179,7 @@ def modal_dialog() -> None:
 
         # Get row of ziffer_dataframe for selected ziffer
         try:
-            goa_item = ziffer_dataframe[ziffer_dataframe["ziffer"] == ziffer]
+            goa_item = get_goa_catalog().get_item(ziffer)
         except Exception:
             st.error(
                 "Die ausgewählte Ziffer ist nicht gültig. Bitte wählen Sie eine andere Ziffer aus."
@@ -216,7 +211,7 @@ def modal_dialog() -> None:
         # ziffer_selected = analog if analog else ziffer
         ziffer_selected = ziffer
         einzelbetrag = (
-            calculate_einzelbetrag(intensitat, ziffer_selected, ziffer_dataframe)
+            calculate_einzelbetrag(intensitat, ziffer_selected)
             if ziffer_selected
             else 0.0
         )
@@ -289,27 +284,18 @@ def check_faktorability(goa_item: pd.DataFrame) -> bool:
     return True
 
 
-def calculate_einzelbetrag(
-    faktor: float, ziffer_selected: str, ziffer_dataframe: pd.DataFrame
-) -> float:
+def calculate_einzelbetrag(faktor: float, ziffer_selected: str) -> float:
     """
-    Calculate the einzelbetrag based on intensität and häufigkeit.
+    Calculate the einzelbetrag based on intensität and the Einfachsatz of the ziffer.
 
     Args:
         faktor (float): The current intensität value.
-        anzahl (int): The current häufigkeit value.
+        ziffer_selected (str): The selected GOÄZiffer.
 
     Returns:
         float: The calculated einzelbetrag.
     """
-
-    # get the row of the selected ziffer
-    goa_item = ziffer_dataframe[ziffer_dataframe["GOÄZiffer"] == ziffer_selected]
-
-    if goa_item.empty:
-        return 0.0
-    else:
-        return goa_item["Einfachsatz"].values[0] * faktor
+    return get_goa_catalog().einzelbetrag(ziffer_selected, faktor)
 
 
 def calculate_gesamtbetrag(einzelbetrag: float, anzahl: int) -> float:
@@ -1,19 +1,18 @@
-from pathlib import Path
-
 import streamlit as st
 
-from utils.helpers.files import load_file_from_path
+from utils.helpers.files import load_file_from_bytes
+from utils.helpers.padnext_workspace import PadnextWorkspace
 
 
 @st.dialog("PADnext Anhang auswählen", width="large")
-def pad_file_modal(files: list[Path]) -> Path:
+def pad_file_modal(workspace: PadnextWorkspace, files: list[str]) -> None:
     st.markdown(
         "Bitte wählen Sie den Anhang der PADnext Datei aus, der für die Analyse verwendet werden soll:"
     )
     for file in files:
-        if st.button(file.name):
+        if st.button(file):
             try:
-                uploaded_file = load_file_from_path(file)
+                uploaded_file = load_file_from_bytes(workspace.read(file), file)
                 st.session_state.uploaded_file = uploaded_file
                 st.session_state.file_selected = True
                 st.rerun()
@@ -2,7 +2,6 @@ import io
 import zipfile
 from typing import Dict, List, Optional, Tuple
 
-import fitz
 import streamlit as st
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
@@ -61,6 +60,8 @@ def process_selected_areas(
     pdf_data: bytes, selections: List[List[Dict[str, float]]]
 ) -> bytes:
     """Process the selected areas from the PDF and create a new PDF with only those areas."""
+    import fitz
+
     if not selections:
         raise ValueError("No selections provided")
 
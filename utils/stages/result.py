@@ -338,21 +338,19 @@ def result_stage():
                 "PADnext Datei generieren",
                 type="primary",
                 use_container_width=True,
-                disabled=(st.session_state.pad_data_path is None),
+                disabled=(st.session_state.pad_workspace is None),
                 help="PADnext Datei kann nur generiert werden, wenn eine PADnext Datei hochgeladen wurde.",
             ):
                 handle_feedback_submission(df=recognized_df, generate="pad_next")
 
             if st.session_state.pad_data_ready:
-                # Read the .zip file as binary data
-                with open(st.session_state.pad_data_ready, "rb") as f:
-                    padnext_file_data = f.read()
+                # The generated .zip file is kept in memory as (file name, binary data)
+                padnext_file_name, padnext_file_data = st.session_state.pad_data_ready
 
-                # Now, pass the binary data to the download button
                 st.download_button(
                     label="Download PADnext Datei",
                     data=padnext_file_data,  # Binary data
-                    file_name=st.session_state.pad_data_ready.name,  # Extract the filename from the Path object
+                    file_name=padnext_file_name,
                     mime="application/zip",  # Adjust MIME type for a .zip file
                     use_container_width=True,
                 )
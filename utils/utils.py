@@ -7,11 +7,8 @@ from typing import Any, List, Tuple, Union
 
 import pandas as pd
 import streamlit as st
-from Levenshtein import distance as levenshtein_distance
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import cm
-from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer
+
+from utils.helpers.alignment import align_zitate
 
 
 def flatten(lst: Union[List[Any], str]) -> List[Any]:
@@ -71,7 +68,7 @@ def find_zitat_in_text(
     Args:
         zitate_to_find (List[Tuple[str, str]]): List of tuples containing zitate and their associated labels.
         annotated_text (List[Union[Tuple[str, str], str]]): The original annotated text with zitate in it.
-        window_size (int): The size of the sliding window in characters for potential matches.
+        window_size (int): Unused, kept for backwards compatibility. Windows always have the length of the zitat.
         distance_threshold (int): Maximum Levenshtein distance to consider a match.
 
     Returns:
@@ -95,45 +92,18 @@ def find_zitat_in_text(
         for z in zitate
     ]
 
-    list_of_indices = []
-
-    # Sliding window with Levenshtein distance for approximate matching
-    for zitat, zitat_label in list_of_zitate_to_find:
-        cleaned_zitat = zitat.replace("\n", " ").replace("  ", " ")
-
-        # Set up sliding window mechanism
-        zitat_len = len(cleaned_zitat)
-        best_match = None
-        best_distance = float("inf")
-        best_match_indices = None
-
-        # Slide over the text in windows of size 'window_size'
-        for i in range(len(cleaned_text) - zitat_len + 1):
-            window_text = cleaned_text[i : i + zitat_len]
-
-            # Calculate Levenshtein distance between the quote and the window text
-            current_distance = levenshtein_distance(cleaned_zitat, window_text)
-
-            if (
-                current_distance < best_distance
-                and current_distance <= distance_threshold
-            ):
-                best_distance = current_distance
-                best_match = window_text
-                best_match_indices = (i, i + zitat_len)
-
-        if best_match:
-            start_idx, end_idx = best_match_indices
-
-            # Extend the match to the next blank space if it ends in the middle of a word
-            while end_idx < len(cleaned_text) and cleaned_text[end_idx] != " ":
-                end_idx += 1
+    cleaned_zitate = [
+        (zitat.replace("\n", " ").replace("  ", " "), zitat_label)
+        for zitat, zitat_label in list_of_zitate_to_find
+    ]
 
-            # Add the match to the list with the adjusted end index
-            adjusted_match_text = cleaned_text[start_idx:end_idx]
-            list_of_indices.append(
-                ((start_idx, end_idx), zitat_label, adjusted_match_text)
-            )
+    # Approximate matching with seed anchoring, all zitate are located in one pass
+    list_of_indices = [
+        ((start_idx, end_idx), zitat_label, cleaned_text[start_idx:end_idx])
+        for start_idx, end_idx, zitat_label in align_zitate(
+            cleaned_text, cleaned_zitate, distance_threshold=distance_threshold
+        )
+    ]
 
     # Sort list of indices by the starting position in the text
     list_of_indices.sort(key=lambda x: x[0][0])
@@ -214,6 +184,12 @@ def create_tooltip(confidence, confidence_reason):
 
 
 def generate_report_files_as_zip(df: pd.DataFrame):
+    # reportlab is only needed for the report export
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer
+
     # Create a temporary directory for file storage
     with tempfile.TemporaryDirectory() as temp_dir:
         # 1. Generate Rechnung.pdf (Use existing or generate if missing)